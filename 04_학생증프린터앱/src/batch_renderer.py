@@ -0,0 +1,341 @@
+"""
+병렬 학생증 일괄 생성기 (헤드리스)
+- 프로세스 풀로 여러 CPU 코어에서 동시에 학생증 렌더링
+- 워커마다 제작기/템플릿/폰트를 시작 시 한 번만 로드
+- 카드별 결과와 실패를 진행률과 함께 스트리밍
+- 카드마다 직렬 경로와 같은 함수를 호출하므로 결과 파일은 바이트 단위로 동일
+- 입력이 바뀌지 않은 카드는 렌더 캐시(cache/renders)에서 복사 (재시도/재인쇄)
+- --trace 지정 시 워커들이 단계별 소요 시간을 JSON lines로 기록하고 끝나면 히스토그램 요약 출력
+- 워커는 카드 캔버스를 재사용하고, --memory-limit을 넘으면 캐시를 비우며 새 카드 투입을 늦춤
+"""
+
+import os
+import io
+import signal
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from memory_budget import CanvasPool, MemoryGovernor, current_rss_mb
+
+MAKER_POINTMAN = 'pointman'   # PointmanCardPrinter.create_student_card
+MAKER_TEMPLATE = 'template'   # TemplateCardMaker.create_card_with_template
+
+# 워커 프로세스 상태 (프로세스마다 한 번 초기화)
+_worker = {}
+
+
+def get_maker_class(maker_kind):
+    """제작기 종류에 해당하는 클래스"""
+    if maker_kind == MAKER_POINTMAN:
+        from pointman_card_printer import PointmanCardPrinter
+        return PointmanCardPrinter
+    if maker_kind == MAKER_TEMPLATE:
+        from template_card_maker import TemplateCardMaker
+        return TemplateCardMaker
+    raise ValueError(f"알 수 없는 제작기 종류: {maker_kind}")
+
+
+def preload_maker(maker_kind, maker, template_path):
+    """제작기가 쓰는 템플릿/폰트/레이아웃 계획을 미리 로드 (워커 시작 시 한 번)"""
+    from font_registry import load_font
+    from card_render_engine import load_template_image
+    from layout_plan import load_layout_plan
+
+    if maker_kind == MAKER_POINTMAN:
+        for size in (36, 28, 24):
+            load_font(size)
+        if os.path.exists(template_path):
+            # 일괄 생성은 세로 방향 기본값 사용
+            load_template_image(template_path, size=(maker.CARD_HEIGHT_PX, maker.CARD_WIDTH_PX))
+    else:
+        # 레이아웃 계획 컴파일 (폰트 로드 포함)
+        load_layout_plan(maker.config_path)
+        if os.path.exists(template_path):
+            load_template_image(template_path, mode='RGBA')
+
+
+def init_worker(maker_kind, template_path, quiet, use_cache=True, trace_path=None, memory_limit_mb=None):
+    """워커 초기화: 제작기 생성 + 템플릿/폰트 미리 로드"""
+    from render_trace import enable_tracing
+
+    # Ctrl+C는 같은 프로세스 그룹의 워커에도 전달됨 → 종료는 부모 프로세스만 처리 (워커마다 트레이스백 방지)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if trace_path:
+        # 워커 기록은 파일 하나에 모으고 요약은 부모 프로세스가 출력
+        enable_tracing(trace_path, histogram=False)
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        maker = get_maker_class(maker_kind)()
+        if not use_cache:
+            maker.render_cache = None
+
+        # 카드 캔버스 재사용 (세로 638x1016 / 가로 1016x638은 미리 할당)
+        maker.canvas_pool = CanvasPool()
+        if maker_kind == MAKER_POINTMAN:
+            maker.canvas_pool.preallocate()
+        preload_maker(maker_kind, maker, template_path)
+
+    if not quiet:
+        print(log.getvalue(), end='')
+
+    _worker['kind'] = maker_kind
+    _worker['maker'] = maker
+    _worker['template_path'] = template_path
+    _worker['quiet'] = quiet
+    _worker['governor'] = MemoryGovernor(memory_limit_mb, canvas_pool=maker.canvas_pool)
+
+
+def render_one(index, student, output_path):
+    """워커에서 학생증 한 장 생성 후 결과 반환"""
+    maker = _worker['maker']
+    template_path = _worker['template_path']
+    log = io.StringIO()
+
+    # 캐시를 비워도 워커 몫의 상한을 넘으면 부모에게 알려 새 카드 투입을 늦추게 함
+    over_limit = False
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            over_limit = not _worker['governor'].admit()
+            if _worker['kind'] == MAKER_POINTMAN:
+                success = maker.create_student_card(template_path, student, output_path)
+            else:
+                success = maker.create_card_with_template(
+                    template_path=template_path,
+                    photo_path=student['photo_path'],
+                    student_data=student,
+                    output_path=output_path
+                )
+        error = None if success else last_error_line(log.getvalue())
+    except Exception as e:
+        success = False
+        error = f"❌ {e}"
+
+    if not _worker['quiet']:
+        print(log.getvalue(), end='')
+
+    return {
+        'index': index,
+        'name': student.get('name', ''),
+        'output_path': output_path,
+        'success': success,
+        'error': error,
+        'cached': success and maker.last_from_cache,
+        'pid': os.getpid(),
+        'rss_mb': current_rss_mb(),
+        'over_limit': over_limit,
+    }
+
+
+def last_error_line(log_text):
+    """제작기 로그에서 마지막 오류 메시지 추출"""
+    for line in reversed(log_text.splitlines()):
+        if line.startswith(('❌', '✗', '⚠')):
+            return line
+    lines = log_text.strip().splitlines()
+    return f"❌ {lines[-1]}" if lines else "❌ 알 수 없는 오류"
+
+
+def iter_batch(maker_kind, template_path, students, output_folder, workers=None, max_pending=None, quiet=True,
+               use_cache=True, trace_path=None, memory_limit_mb=None):
+    """
+    학생증을 병렬로 생성하며 완료되는 순서대로 결과를 내보내는 제너레이터
+
+    Args:
+        maker_kind: 'pointman' 또는 'template'
+        template_path: 템플릿(배경 프레임) 파일
+        students: 학생 정보 딕셔너리들 (리스트 또는 지연 로딩 이터레이터)
+        output_folder: 출력 폴더
+        workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+        max_pending: 동시에 대기시킬 최대 작업 수 (기본: 워커 수 x 4)
+        quiet: True면 워커의 카드별 로그를 숨김
+        use_cache: False면 렌더 캐시를 쓰지 않고 모든 카드를 새로 렌더링
+        trace_path: 지정하면 워커들이 단계별 소요 시간을 이 파일에 JSON lines로 기록
+        memory_limit_mb: 전체(부모 + 워커) 메모리 상한 (MB) - 넘는 동안은 진행 중인 카드가 끝나기를 기다림
+
+    Yields:
+        {'index', 'name', 'output_path', 'success', 'error', 'cached', 'memory_mb'} 딕셔너리
+    """
+    maker_class = get_maker_class(maker_kind)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+
+    if output_folder and not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    if trace_path:
+        # 이전 실행 기록과 섞이지 않도록 비우고 시작
+        open(trace_path, 'w', encoding='utf-8').close()
+
+    # 워커마다 상한을 나눠 갖고, 부모는 전체 합계로 투입 속도 조절
+    governor = MemoryGovernor(memory_limit_mb) if memory_limit_mb else None
+    worker_limit = memory_limit_mb / workers if memory_limit_mb else None
+    worker_rss = {}
+    workers_over = set()     # 캐시를 비워도 상한을 넘었다고 알려 온 워커 pid
+
+    def memory_total():
+        return (current_rss_mb() or 0) + sum(worker_rss.values())
+
+    def over_limit():
+        return governor is not None and (bool(workers_over) or governor.over_limit(memory_total()))
+
+    def collect(done):
+        for future in done:
+            result = future.result()
+            if result['rss_mb'] is not None:
+                worker_rss[result['pid']] = result['rss_mb']
+            if result['over_limit']:
+                workers_over.add(result['pid'])
+            else:
+                workers_over.discard(result['pid'])
+            result['memory_mb'] = memory_total()
+            yield result
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(maker_kind, template_path, quiet, use_cache, trace_path, worker_limit)) as pool:
+        pending = set()
+        throttled = False
+        for index, student in enumerate(students, 1):
+            output_path = maker_class.batch_output_path(output_folder, student)
+            pending.add(pool.submit(render_one, index, student, output_path))
+
+            # 로스터를 한꺼번에 큐에 올리지 않도록 대기 작업 수 제한
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+
+            # 메모리 상한을 넘은 동안(전체 합계 또는 워커 보고)은 진행 중인 카드가 끝나기를 기다림
+            over = over_limit()
+            if over and not throttled:
+                print(f"⏸️ 메모리 상한 초과 ({memory_total():.0f}MB, 상한 {memory_limit_mb}MB) - 새 카드 투입 대기")
+            throttled = over
+            while over and pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+                over = over_limit()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+
+
+def run_batch(maker_kind, template_path, students, output_folder, workers=None, progress=None, total=None,
+              use_cache=True, trace_path=None, memory_limit_mb=None, memory_log_every=0):
+    """
+    병렬 일괄 생성 실행
+
+    Args:
+        progress: progress(완료 수, 전체 수, 결과) 콜백 (None이면 콘솔 출력)
+        total: 전체 학생 수 (students가 이터레이터일 때 진행률 표시용)
+        use_cache: False면 렌더 캐시를 쓰지 않음
+        trace_path: 지정하면 단계별 소요 시간을 기록하고 끝난 뒤 히스토그램 요약 출력
+        memory_limit_mb: 전체 메모리 상한 (MB)
+        memory_log_every: N장마다 최대 메모리 로그 (0이면 기록하지 않음)
+
+    Returns:
+        (성공 개수, 실패 결과 리스트)
+    """
+    if total is None and hasattr(students, '__len__'):
+        total = len(students)
+
+    success_count = 0
+    cached_count = 0
+    failures = []
+    done_count = 0
+    memory_log = MemoryGovernor(log_every=memory_log_every)
+
+    for result in iter_batch(maker_kind, template_path, students, output_folder, workers=workers,
+                             use_cache=use_cache, trace_path=trace_path, memory_limit_mb=memory_limit_mb):
+        done_count += 1
+        if result['success']:
+            success_count += 1
+            cached_count += result['cached']
+        else:
+            failures.append(result)
+
+        if progress:
+            progress(done_count, total, result)
+        else:
+            mark = "✅" if result['success'] else result['error']
+            print(f"[{done_count}/{total or '?'}] {result['name']} {mark}")
+        memory_log.card_done(done_count, total, result['memory_mb'])
+
+    cached_text = f" (캐시 {cached_count}개)" if cached_count else ""
+    print(f"\n📊 완료: {success_count}/{done_count} 개 성공{cached_text}")
+
+    if trace_path:
+        from render_trace import load_jsonl, summarize
+        print(summarize(load_jsonl(trace_path)))
+    return success_count, failures
+
+
+def run_roster(maker_kind, template_path, roster_path, output_folder, workers=None,
+               sheet_output=None, sheet_page='A4', use_cache=True, trace_path=None,
+               memory_limit_mb=None, memory_log_every=0):
+    """
+    명단 파일(CSV/XLSX/JSONL)로 병렬 일괄 생성
+
+    렌더링 전에 명단 전체를 검증하고, 잘못된 행이 있으면 아무것도 만들지 않습니다.
+
+    Args:
+        sheet_output: 지정하면 완성된 카드를 명단 순서대로 N-up 시트(.pdf/.tif)로도 저장
+        sheet_page: 시트 용지 크기 ('A4' / 'Letter')
+        use_cache: False면 렌더 캐시를 쓰지 않음
+        trace_path: 지정하면 단계별 소요 시간을 JSON lines로 기록
+        memory_limit_mb: 전체 메모리 상한 (MB)
+        memory_log_every: N장마다 최대 메모리 로그
+
+    Returns:
+        (성공 개수, 실패 결과 리스트) - 검증 실패 시 None
+    """
+    from roster_reader import REQUIRED_FIELDS, RosterValidationError, iter_roster, read_roster, print_roster_errors
+
+    maker_class = get_maker_class(maker_kind)
+
+    def output_name(student):
+        return os.path.basename(maker_class.batch_output_path(output_folder, student))
+
+    print(f"📋 명단 검증 중: {roster_path}")
+    try:
+        total, students = read_roster(roster_path, REQUIRED_FIELDS[maker_kind], output_name=output_name)
+    except RosterValidationError as e:
+        print(f"❌ 명단에 잘못된 행이 있습니다 ({len(e.errors)}개) - 렌더링을 시작하지 않습니다")
+        print_roster_errors(e.errors)
+        return None
+
+    print(f"✓ 명단 검증 완료: {total}명")
+    result = run_batch(maker_kind, template_path, students, output_folder, workers=workers, total=total,
+                       use_cache=use_cache, trace_path=trace_path, memory_limit_mb=memory_limit_mb,
+                       memory_log_every=memory_log_every)
+
+    if sheet_output:
+        from sheet_imposition import write_sheets
+
+        # 카드 경로만 명단에서 다시 읽음 (카드 이미지는 시트에 배치할 때 한 장씩 엶)
+        failed = {failure['output_path'] for failure in result[1]}
+        card_paths = (maker_class.batch_output_path(output_folder, student) for _, student in iter_roster(roster_path))
+        write_sheets((path for path in card_paths if path not in failed and os.path.exists(path)),
+                     sheet_output, page=sheet_page)
+
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="명단 파일로 학생증 일괄 생성 (병렬)")
+    parser.add_argument('roster', help="명단 파일 (CSV / XLSX / JSONL)")
+    parser.add_argument('--maker', choices=[MAKER_POINTMAN, MAKER_TEMPLATE], default=MAKER_TEMPLATE)
+    parser.add_argument('--template', default='card_template.png', help="템플릿(배경 프레임) 파일")
+    parser.add_argument('--output', default='student_cards', help="출력 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="워커 수 (기본: CPU 코어 수)")
+    parser.add_argument('--sheet', default=None, help="N-up 시트 출력 파일 (.pdf / .tif)")
+    parser.add_argument('--sheet-page', choices=['A4', 'Letter'], default='A4', help="시트 용지 크기")
+    parser.add_argument('--no-cache', action='store_true', help="렌더 캐시를 쓰지 않고 모두 새로 렌더링")
+    parser.add_argument('--trace', default=None, help="단계별 소요 시간 기록 파일 (.jsonl)")
+    parser.add_argument('--memory-limit', type=float, default=None, help="전체 메모리 상한 (MB, 넘으면 투입을 늦춤)")
+    parser.add_argument('--memory-log-every', type=int, default=0, help="N장마다 최대 메모리 로그")
+    args = parser.parse_args()
+
+    run_roster(args.maker, args.template, args.roster, args.output, workers=args.workers,
+               sheet_output=args.sheet, sheet_page=args.sheet_page, use_cache=not args.no_cache,
+               trace_path=args.trace, memory_limit_mb=args.memory_limit, memory_log_every=args.memory_log_every)
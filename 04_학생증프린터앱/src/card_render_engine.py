@@ -0,0 +1,408 @@
+"""
+세로형 학생증 렌더 엔진
+- 학생증 생성 / 미리보기 / 인쇄가 모두 같은 엔진으로 카드를 그림
+- 101% 확대 후 중앙 크롭한 배경 프레임을 메모리에 캐시
+- 미리보기는 축소된 레이아웃으로 바로 렌더링 (JPEG draft / Image.reduce 디코딩)
+- 실시간 편집은 배경+사진 / 필드별 텍스트 레이어를 나눠 바뀐 레이어만 다시 합성
+- 학생 사진은 photo_normalizer로 정규화 (EXIF 방향, ICC, 모드, 크기 - 디스크 캐시)
+"""
+
+from PIL import Image, ImageDraw
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from font_registry import NEODGM_FONT, font_signature, load_font
+from text_tiles import get_text_tile_cache
+from photo_normalizer import MODE_AUTO, normalize_photo, open_image_scaled
+from render_trace import current_span, traced
+
+# 배경 프레임 캐시: (경로, 수정시각, 카드 크기, 배율) → 크롭이 끝난 RGB 프레임
+_frame_cache = {}
+_frame_cache_lock = threading.Lock()
+
+# 템플릿 캐시: (경로, 수정시각, 크기, 모드) → 리사이즈/모드 변환이 끝난 템플릿
+_template_cache = OrderedDict()
+_TEMPLATE_CACHE_SIZE = 8
+
+# 텍스트 레이어: 글자 영역 (left, top, right, bottom) + 알파 마스크
+TextLayer = namedtuple('TextLayer', 'text box mask')
+
+
+class PhotoCardLayout:
+    """세로형 학생증 레이아웃 상수 (학생증 생성과 인쇄에서 동일하게 사용)"""
+
+    def __init__(self, scale=1.0):
+        """
+        Args:
+            scale: 픽셀 값 배율 (1.0 = 인쇄용 300 DPI, 미리보기는 1보다 작게)
+        """
+        self.SCALE = scale
+
+        # 카드 크기 설정 (300 DPI 기준)
+        self.CARD_WIDTH_MM = 54   # 세로형이므로 폭이 54mm
+        self.CARD_HEIGHT_MM = 86  # 세로형이므로 높이가 86mm
+        self.DPI = 300
+
+        # 픽셀 계산
+        self.CARD_WIDTH_PX = int((self.CARD_WIDTH_MM / 25.4) * self.DPI * scale)   # 638px
+        self.CARD_HEIGHT_PX = int((self.CARD_HEIGHT_MM / 25.4) * self.DPI * scale) # 1016px
+
+        # 배경 프레임 설정
+        self.FRAME_SCALE = 1.01      # 프레임 크기 101%
+
+        # 사진 설정
+        self.PHOTO_WIDTH_PX = int(324 * scale)    # 고정 사진 폭 (픽셀)
+        self.PHOTO_HEIGHT_PX = int(380 * scale)   # 고정 사진 높이 (픽셀)
+        self.PHOTO_TOP_MM = 24       # 사진 상단 여백 (mm)
+
+        # 텍스트 설정
+        self.NAME_FONT_SIZE = max(1, round(48 * scale))   # 이름 폰트 크기
+        self.BIRTH_FONT_SIZE = max(1, round(46 * scale))  # 생년월일 폰트 크기
+        self.NAME_BOTTOM_MM = 28     # 이름 하단 여백 (mm)
+        self.BIRTH_BOTTOM_MM = 22.5  # 생년월일 하단 여백 (mm)
+
+        # 색상 설정 (CMYK C20 M76 Y0 K50을 RGB로 변환)
+        c, m, y, k = 0.20, 0.76, 0.00, 0.50
+        r = int(255 * (1 - c) * (1 - k))
+        g = int(255 * (1 - m) * (1 - k))
+        b = int(255 * (1 - y) * (1 - k))
+        self.TEXT_COLOR = (r, g, b)
+
+        # 픽셀 변환된 값들
+        self.photo_top_px = int((self.PHOTO_TOP_MM / 25.4) * self.DPI * scale)
+        self.photo_left_px = (self.CARD_WIDTH_PX - self.PHOTO_WIDTH_PX) // 2
+        self.name_bottom_px = int((self.NAME_BOTTOM_MM / 25.4) * self.DPI * scale)
+        self.birth_bottom_px = int((self.BIRTH_BOTTOM_MM / 25.4) * self.DPI * scale)
+
+    @classmethod
+    def for_preview(cls, preview_width):
+        """카드 폭이 preview_width 픽셀이 되도록 축소한 미리보기용 레이아웃"""
+        return cls(scale=preview_width / cls().CARD_WIDTH_PX)
+
+
+def load_background_frame(background_path, card_width, card_height, frame_scale, fast_decode=False):
+    """
+    배경 프레임을 카드 크기의 frame_scale 배로 리사이즈한 뒤 중앙 크롭하여 반환
+
+    결과는 (경로, 수정시각, 카드 크기, 배율) 단위로 캐시되며,
+    호출자는 항상 자신만의 복사본을 받으므로 그 위에 바로 그려도 됩니다.
+    프레임 파일이 없으면 흰색 배경을 반환합니다.
+    fast_decode=True면 원본을 축소 디코딩합니다 (미리보기용).
+    """
+    if not os.path.exists(background_path):
+        return Image.new('RGB', (card_width, card_height), 'white')
+
+    key = (os.path.abspath(background_path), os.path.getmtime(background_path),
+           card_width, card_height, frame_scale, fast_decode)
+
+    with _frame_cache_lock:
+        frame = _frame_cache.get(key)
+
+    if frame is None:
+        # 카드 크기의 101%로 리사이즈
+        scaled_width = int(card_width * frame_scale)
+        scaled_height = int(card_height * frame_scale)
+        if fast_decode:
+            source = open_image_scaled(background_path, (scaled_width, scaled_height))
+            frame = source.resize((scaled_width, scaled_height), Image.Resampling.LANCZOS)
+        else:
+            with Image.open(background_path) as source:
+                frame = source.resize((scaled_width, scaled_height), Image.Resampling.LANCZOS)
+
+        # 중앙에서 원래 카드 크기만큼 크롭
+        left = (scaled_width - card_width) // 2
+        top = (scaled_height - card_height) // 2
+        frame = frame.crop((left, top, left + card_width, top + card_height))
+        if frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+
+        with _frame_cache_lock:
+            # 같은 경로의 오래된 프레임은 버림 (파일이 수정된 경우)
+            for old_key in [k for k in _frame_cache if k[0] == key[0] and k[1] != key[1]]:
+                del _frame_cache[old_key]
+            _frame_cache[key] = frame
+        if not fast_decode:
+            print(f"✓ 배경 프레임 로드 ({int(frame_scale * 100)}% 크기): {background_path}")
+
+    return frame.copy()
+
+
+def load_template_image(template_path, size=None, mode=None, fast_decode=False, canvas_pool=None):
+    """
+    템플릿 이미지를 (선택) 리사이즈/모드 변환하여 반환
+
+    Args:
+        template_path: 템플릿 이미지 파일
+        size: (폭, 높이) - 지정하면 LANCZOS로 리사이즈
+        mode: 지정하면 해당 모드로 변환 (예: 'RGBA')
+        fast_decode: True면 size에 맞춰 축소 디코딩 (미리보기용)
+        canvas_pool: 지정하면 새로 할당하지 않고 풀의 캔버스에 복사 (일괄 생성용)
+
+    결과는 최근 사용한 몇 개만 메모리에 캐시되며 항상 복사본을 반환합니다.
+    """
+    key = (os.path.abspath(template_path), os.path.getmtime(template_path), size, mode, fast_decode)
+
+    with _frame_cache_lock:
+        template = _template_cache.get(key)
+        if template is not None:
+            _template_cache.move_to_end(key)
+
+    if template is None:
+        if fast_decode and size:
+            template = open_image_scaled(template_path, size).resize(size, Image.Resampling.LANCZOS)
+        else:
+            with Image.open(template_path) as source:
+                template = source.resize(size, Image.Resampling.LANCZOS) if size else source.copy()
+        if mode and template.mode != mode:
+            template = template.convert(mode)
+
+        with _frame_cache_lock:
+            _template_cache[key] = template
+            while len(_template_cache) > _TEMPLATE_CACHE_SIZE:
+                _template_cache.popitem(last=False)
+
+    if canvas_pool is not None:
+        return copy_to_canvas(template, canvas_pool)
+    return template.copy()
+
+
+def copy_to_canvas(image, canvas_pool):
+    """image.copy()와 같은 결과를 풀에서 재사용한 캔버스에 만들기 (팔레트 모드는 그냥 복사)"""
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        return image.copy()
+    canvas = canvas_pool.acquire(image.size, image.mode)
+    canvas.paste(image, (0, 0))
+    canvas.info = image.info.copy()
+    return canvas
+
+
+def clear_frame_cache():
+    """배경 프레임 / 템플릿 캐시 비우기"""
+    with _frame_cache_lock:
+        _frame_cache.clear()
+        _template_cache.clear()
+
+
+class CardRenderEngine:
+    """배경 프레임 + 학생 사진 + 이름/생년월일을 합성하는 세로형 학생증 렌더 엔진"""
+
+    def __init__(self, layout=None, background_path="background_frame.jpg", font_path=NEODGM_FONT, fast_decode=False):
+        """
+        Args:
+            layout: PhotoCardLayout (미리보기는 PhotoCardLayout.for_preview 사용)
+            fast_decode: True면 사진/프레임을 필요한 크기만큼만 디코딩 (미리보기용)
+        """
+        self.layout = layout or PhotoCardLayout()
+        self.background_path = background_path
+        self.font_path = font_path
+        self.fast_decode = fast_decode
+
+    @classmethod
+    def for_preview(cls, preview_width, background_path="background_frame.jpg", font_path=NEODGM_FONT):
+        """미리보기 해상도로 바로 렌더링하는 엔진"""
+        return cls(PhotoCardLayout.for_preview(preview_width), background_path, font_path, fast_decode=True)
+
+    def render_signature(self):
+        """렌더 캐시 키에 들어가는 레이아웃 값"""
+        return {
+            'layout': vars(self.layout),
+            'font': font_signature((self.font_path,)),
+            'fast_decode': self.fast_decode,
+        }
+
+    def load_background(self):
+        """캐시된 배경 프레임의 복사본 반환"""
+        layout = self.layout
+        return load_background_frame(self.background_path, layout.CARD_WIDTH_PX,
+                                     layout.CARD_HEIGHT_PX, layout.FRAME_SCALE, self.fast_decode)
+
+    def load_font(self, size):
+        """neodgm.ttf 폰트 로드 (없으면 기본 폰트, 프로세스 전역 캐시)"""
+        return load_font(size, (self.font_path,))
+
+    def paste_photo(self, background, photo_path):
+        """학생 사진을 고정 크기로 정규화하여 배경에 합성 (EXIF 방향 적용, PNG 투명도 유지)"""
+        layout = self.layout
+        photo_size = (layout.PHOTO_WIDTH_PX, layout.PHOTO_HEIGHT_PX)
+        # 투명도가 있는 사진만 RGBA로 유지 (통일된 상수 크기, 정규화 캐시 사용)
+        photo = normalize_photo(photo_path, photo_size, MODE_AUTO, self.fast_decode)
+
+        position = (layout.photo_left_px, layout.photo_top_px)
+        if photo.mode == 'RGBA':
+            # 투명도가 있는 경우 알파 채널 사용
+            background.paste(photo, position, photo)
+        else:
+            background.paste(photo, position)
+
+    def draw_centered_text(self, draw, text, font, text_y):
+        """카드 폭 기준 가운데 정렬로 텍스트 그리기"""
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_x = (self.layout.CARD_WIDTH_PX - text_width) // 2
+        draw.text((text_x, text_y), text, fill=self.layout.TEXT_COLOR, font=font)
+        return text_x
+
+    @traced('engine.render')
+    def render(self, photo_path, student_name, birth_date):
+        """
+        학생증 이미지 렌더링
+
+        Args:
+            photo_path: 학생 사진 파일
+            student_name: 카드 하단에 표시할 이름 (비어 있으면 생략)
+            birth_date: YYYY.MM.DD 형식 생년월일 (비어 있으면 생략)
+
+        Returns:
+            RGB 모드의 카드 이미지 (CARD_WIDTH_PX x CARD_HEIGHT_PX)
+        """
+        layout = self.layout
+        stage = current_span()
+        background = self.load_background()
+        stage.lap('background')
+        self.paste_photo(background, photo_path)
+        stage.lap('photo')
+
+        draw = ImageDraw.Draw(background)
+        if student_name:
+            font = self.load_font(layout.NAME_FONT_SIZE)
+            self.draw_centered_text(draw, student_name, font,
+                                    layout.CARD_HEIGHT_PX - layout.name_bottom_px)
+        if birth_date:
+            font_birth = self.load_font(layout.BIRTH_FONT_SIZE)
+            self.draw_centered_text(draw, birth_date, font_birth,
+                                    layout.CARD_HEIGHT_PX - layout.birth_bottom_px)
+        stage.lap('text')
+
+        return background
+
+    def save(self, card_image, output_path):
+        """JPG로 저장 (RGB, 300 DPI)"""
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        card_image.save(output_path, 'JPEG', quality=95, dpi=(self.layout.DPI, self.layout.DPI))
+
+
+class LayeredCardRenderer:
+    """
+    실시간 편집용 레이어 렌더러
+
+    - 배경+사진 레이어: 사진(또는 배경 프레임) 파일이 바뀔 때만 다시 만듦
+    - 텍스트 레이어: 이름/생년월일 필드마다 글자 마스크를 따로 보관
+    - 한 필드만 바뀌면 이전/새 글자 영역만 배경+사진 레이어에서 복원한 뒤
+      그 영역에 걸친 텍스트 레이어를 다시 올림 → 키 입력마다 미리보기 갱신 가능
+
+    결과는 CardRenderEngine.render와 같은 카드입니다.
+    """
+
+    FIELDS = ('name', 'birth')
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine: CardRenderEngine (미리보기는 CardRenderEngine.for_preview 사용)
+        """
+        self.engine = engine
+        self._base_key = None
+        self._base = None        # 배경 + 사진 (텍스트 없음)
+        self._canvas = None      # 마지막 합성 결과
+        self._layers = {}        # 필드 → TextLayer (빈 값이면 없음)
+        self._lock = threading.Lock()
+        self.stats = {'base': 0, 'text': 0, 'unchanged': 0}
+
+    def _base_stamp(self, photo_path):
+        background_path = self.engine.background_path
+        background_mtime = os.path.getmtime(background_path) if os.path.exists(background_path) else None
+        return (os.path.abspath(photo_path), os.path.getmtime(photo_path), background_mtime)
+
+    def _text_layer(self, field, text):
+        """필드 값 → TextLayer (draw_centered_text와 같은 위치)"""
+        if not text:
+            return None
+        layout = self.engine.layout
+        if field == 'name':
+            font = self.engine.load_font(layout.NAME_FONT_SIZE)
+            text_y = layout.CARD_HEIGHT_PX - layout.name_bottom_px
+        else:
+            font = self.engine.load_font(layout.BIRTH_FONT_SIZE)
+            text_y = layout.CARD_HEIGHT_PX - layout.birth_bottom_px
+
+        tile = get_text_tile_cache().get(text, font, layout.TEXT_COLOR)
+        text_x = (layout.CARD_WIDTH_PX - tile.mask.width) // 2 - tile.offset[0]
+        left, top = text_x + tile.offset[0], text_y + tile.offset[1]
+        return TextLayer(text, (left, top, left + tile.mask.width, top + tile.mask.height), tile.mask)
+
+    def _paste_text(self, canvas, layer):
+        canvas.paste(self.engine.layout.TEXT_COLOR, layer.box[:2], layer.mask)
+
+    def _rebuild(self, photo_path, key):
+        """배경+사진 레이어부터 다시 합성"""
+        base = self.engine.load_background()
+        self.engine.paste_photo(base, photo_path)
+        self._base, self._base_key = base, key
+        self.stats['base'] += 1
+
+        canvas = base.copy()
+        for field in self.FIELDS:
+            layer = self._layers.get(field)
+            if layer is not None:
+                self._paste_text(canvas, layer)
+        self._canvas = canvas
+
+    def _update_text(self, dirty_fields, old_layers):
+        """바뀐 필드의 이전/새 글자 영역만 복원 후 다시 합성"""
+        boxes = []
+        for field in dirty_fields:
+            for layer in (old_layers.get(field), self._layers.get(field)):
+                if layer is not None:
+                    boxes.append(layer.box)
+        if not boxes:
+            return
+        dirty = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                 max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+        self._canvas.paste(self._base.crop(dirty), dirty[:2])
+        for field in self.FIELDS:
+            layer = self._layers.get(field)
+            if layer is None:
+                continue
+            box = layer.box
+            if box[0] < dirty[2] and dirty[0] < box[2] and box[1] < dirty[3] and dirty[1] < box[3]:
+                self._paste_text(self._canvas, layer)
+        self.stats['text'] += 1
+
+    @traced('live.render')
+    def render(self, photo_path, student_name, birth_date):
+        """
+        학생증 이미지 렌더링 (바뀐 레이어만 다시 합성)
+
+        Returns:
+            RGB 모드의 카드 이미지 복사본
+        """
+        with self._lock:
+            values = {'name': student_name, 'birth': birth_date}
+            old_layers = dict(self._layers)
+            dirty_fields = []
+            for field in self.FIELDS:
+                layer = old_layers.get(field)
+                if (layer.text if layer else '') != (values[field] or ''):
+                    self._layers[field] = self._text_layer(field, values[field])
+                    dirty_fields.append(field)
+
+            stage = current_span()
+            key = self._base_stamp(photo_path)
+            if key != self._base_key or self._canvas is None:
+                self._rebuild(photo_path, key)
+                stage.lap('base')
+            elif dirty_fields:
+                self._update_text(dirty_fields, old_layers)
+                stage.lap('text', dirty=len(dirty_fields))
+            else:
+                self.stats['unchanged'] += 1
+            return self._canvas.copy()
+
+    def invalidate(self):
+        """모든 레이어 버리기 (다음 render에서 처음부터 합성)"""
+        with self._lock:
+            self._base_key = self._base = self._canvas = None
+            self._layers = {}
@@ -0,0 +1,44 @@
+"""
+파일 내용 해시 (렌더 캐시, 사진 정규화 캐시, 썸네일 캐시 공통)
+- 큰 사진도 조각 단위로 읽어 SHA-1 계산
+- 경로별로 (수정시각, 파일 크기, 해시)를 기억하여 바뀌지 않은 파일은 다시 읽지 않음
+"""
+
+import os
+import hashlib
+import threading
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-1 해시 (큰 사진도 조각 단위로 읽음)"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileHashMemo:
+    """경로 → 내용 해시 기억 (여러 스레드에서 함께 사용 가능)"""
+
+    def __init__(self):
+        self._hashes = {}    # 절대 경로 → (수정시각, 파일 크기, 내용 해시)
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        """파일 내용 해시 (수정시각/크기가 같으면 다시 읽지 않음, 파일이 없으면 OSError)"""
+        stat = os.stat(file_path)
+        path = os.path.abspath(file_path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        content_hash = hash_file(file_path)
+        with self._lock:
+            self._hashes[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    def clear(self):
+        with self._lock:
+            self._hashes.clear()
@@ -0,0 +1,118 @@
+"""
+프로세스 전역 폰트 레지스트리
+- (경로, 크기) 단위로 FreeTypeFont 객체를 캐시하여 모든 제작기가 공유
+- 폰트 후보 목록(폴백 체인)은 프로세스당 한 번만 확인
+"""
+
+from PIL import ImageFont
+import os
+import threading
+
+# 픽셀 폰트 (세로형 학생증 이름/생년월일)
+NEODGM_FONT = "neodgm.ttf"
+
+# Windows 한글 폰트들
+KOREAN_SYSTEM_FONTS = (
+    "C:/Windows/Fonts/malgun.ttf",    # 맑은 고딕
+    "C:/Windows/Fonts/gulim.ttc",     # 굴림
+    "C:/Windows/Fonts/batang.ttc",    # 바탕
+)
+
+_fonts = {}            # (경로, 크기) → FreeTypeFont
+_resolved_chains = {}  # 후보 목록 → 실제 사용할 경로 (없으면 None)
+_default_font = None
+_lock = threading.RLock()
+
+
+def get_font(font_path, size):
+    """
+    (경로, 크기)에 해당하는 폰트 반환 (최초 1회만 TTF 파싱)
+
+    폰트를 열 수 없으면 ImageFont.truetype과 같은 OSError가 발생합니다.
+    """
+    key = (font_path, size)
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(font_path, size)
+            _fonts[key] = font
+        return font
+
+
+def get_default_font():
+    """Pillow 기본 폰트 (캐시)"""
+    global _default_font
+    with _lock:
+        if _default_font is None:
+            _default_font = ImageFont.load_default()
+        return _default_font
+
+
+def resolve_font_path(candidates):
+    """
+    폴백 체인에서 처음으로 열 수 있는 폰트 경로 반환 (없으면 None)
+
+    결과는 프로세스 동안 유지되므로 경로 탐색은 체인마다 한 번만 일어납니다.
+    """
+    chain = tuple(candidates)
+    with _lock:
+        if chain in _resolved_chains:
+            return _resolved_chains[chain]
+
+        resolved = None
+        for font_path in chain:
+            try:
+                ImageFont.truetype(font_path, 10)
+            except OSError:
+                continue
+            resolved = font_path
+            break
+
+        _resolved_chains[chain] = resolved
+        if resolved:
+            print(f"✓ 폰트 로드: {resolved}")
+        else:
+            print(f"⚠️ 폰트를 찾을 수 없어 기본 폰트를 사용합니다: {', '.join(chain)}")
+        return resolved
+
+
+def font_signature(candidates):
+    """
+    렌더 캐시 키용 실제 사용 폰트: (경로, 수정 시각, 크기) - 기본 폰트로 대체되면 None
+
+    폴백 폰트로 만든 카드가 폰트를 설치한 뒤에도 캐시에서 나오지 않도록 경로 대신 이 값을 키에 넣습니다.
+    """
+    font_path = resolve_font_path(candidates)
+    if font_path is None:
+        return None
+    try:
+        stat = os.stat(font_path)
+    except OSError:   # 파일 이름만으로 찾은 시스템 폰트
+        return (font_path, None, None)
+    return (font_path, stat.st_mtime_ns, stat.st_size)
+
+
+def load_font(size, candidates=KOREAN_SYSTEM_FONTS):
+    """
+    후보 폰트 중 사용 가능한 첫 폰트를 지정 크기로 반환
+
+    Args:
+        size: 폰트 크기 (픽셀)
+        candidates: 폰트 경로 후보 목록 (앞에서부터 우선)
+
+    Returns:
+        캐시된 FreeTypeFont, 후보가 모두 없으면 Pillow 기본 폰트
+    """
+    font_path = resolve_font_path(candidates)
+    if font_path is None:
+        return get_default_font()
+    return get_font(font_path, size)
+
+
+def clear_font_cache():
+    """캐시된 폰트와 폴백 체인 결과 비우기 (폰트 파일 교체 후 사용)"""
+    global _default_font
+    with _lock:
+        _fonts.clear()
+        _resolved_chains.clear()
+        _default_font = None
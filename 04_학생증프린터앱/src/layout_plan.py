@@ -0,0 +1,160 @@
+"""
+템플릿 레이아웃 계획 (template_config.json 컴파일 결과)
+- 설정 파일을 한 번 읽어 사진 영역/폰트/색상/정렬 계산을 미리 끝낸 불변 계획으로 변환
+- 파일 수정 시각이 바뀔 때만 다시 읽고, 배율(원본/미리보기)별 계획을 캐시
+- 렌더러는 계획대로 붙여넣고 그리기만 함
+"""
+
+import os
+import json
+import threading
+from collections import namedtuple, OrderedDict
+from font_registry import load_font
+
+TEMPLATE_CONFIG_PATH = "template_config.json"
+
+# 설정 파일이 없거나 읽을 수 없을 때
+DEFAULT_TEMPLATE_CONFIG = {
+    "photo_area": {
+        "x": 50,
+        "y": 80,
+        "width": 120,
+        "height": 150
+    },
+    "name_area": {
+        "x": 200,
+        "y": 100,
+        "font_size": 24,
+        "color": [0, 0, 0],
+        "align": "left"
+    }
+}
+
+# 텍스트를 그리는 순서 (설정에 있는 영역만 사용)
+TEXT_AREAS = ("school_name_area", "grade_class_area", "name_area")
+
+# 사진 영역 (배율 적용된 픽셀)
+PhotoBox = namedtuple('PhotoBox', 'x y width height')
+
+# 텍스트 영역: 폰트/색상은 미리 로드·변환해 둠
+TextSlot = namedtuple('TextSlot', 'key x y font color align')
+
+
+class LayoutPlan:
+    """배율 하나에 대한 불변 레이아웃 계획"""
+
+    MEASURE_CACHE_SIZE = 256
+
+    def __init__(self, config, scale=1.0):
+        self.scale = scale
+        photo = config["photo_area"]
+        self.photo_box = PhotoBox(
+            int(photo["x"] * scale),
+            int(photo["y"] * scale),
+            max(1, int(photo["width"] * scale)),
+            max(1, int(photo["height"] * scale)),
+        )
+
+        slots = []
+        for key in TEXT_AREAS:
+            area = config.get(key)
+            if not area:
+                continue
+            slots.append(TextSlot(
+                key,
+                int(area["x"] * scale),
+                int(area["y"] * scale),
+                load_font(max(1, round(area["font_size"] * scale))),
+                tuple(area["color"]),
+                area.get("align", "left"),
+            ))
+        self.text_slots = tuple(slots)
+
+        # 같은 학교명/학년반은 카드마다 다시 재지 않음
+        self._measured = OrderedDict()
+        self._lock = threading.Lock()
+
+    def text_origin(self, slot, text):
+        """정렬을 반영한 텍스트 시작 좌표"""
+        if slot.align != "center":
+            return slot.x, slot.y
+
+        key = (slot.key, text)
+        with self._lock:
+            width = self._measured.get(key)
+            if width is not None:
+                self._measured.move_to_end(key)
+        if width is None:
+            bbox = slot.font.getbbox(text)
+            width = bbox[2] - bbox[0]
+            with self._lock:
+                self._measured[key] = width
+                if len(self._measured) > self.MEASURE_CACHE_SIZE:
+                    self._measured.popitem(last=False)
+        return slot.x - (width // 2), slot.y
+
+
+class CompiledConfig:
+    """설정 파일 한 번 읽은 결과 + 배율별 계획"""
+
+    def __init__(self, config, stamp):
+        self.config = config
+        self.stamp = stamp
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def plan(self, scale=1.0):
+        with self._lock:
+            plan = self._plans.get(scale)
+            if plan is None:
+                plan = self._plans[scale] = LayoutPlan(self.config, scale)
+            return plan
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _file_stamp(config_path):
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_config(config_path):
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            print("⚠️ 설정 파일 로드 실패, 기본 설정 사용")
+    return DEFAULT_TEMPLATE_CONFIG
+
+
+def compile_config(config_path=TEMPLATE_CONFIG_PATH):
+    """
+    설정 파일 → CompiledConfig (수정 시각/크기가 같으면 캐시 사용)
+    """
+    path = os.path.abspath(config_path)
+    stamp = _file_stamp(path)
+    with _compiled_lock:
+        compiled = _compiled.get(path)
+        if compiled is not None and compiled.stamp == stamp:
+            return compiled
+
+    compiled = CompiledConfig(_read_config(path), stamp)
+    with _compiled_lock:
+        _compiled[path] = compiled
+    return compiled
+
+
+def load_layout_plan(config_path=TEMPLATE_CONFIG_PATH, scale=1.0):
+    """설정 파일의 배율별 레이아웃 계획"""
+    return compile_config(config_path).plan(scale)
+
+
+def clear_layout_cache():
+    with _compiled_lock:
+        _compiled.clear()
@@ -0,0 +1,213 @@
+"""
+일괄 생성 메모리 관리
+- 카드 크기(638x1016 / 1016x638 등) 캔버스를 미리 할당해 두고 카드마다 재사용 (CanvasPool)
+- 프로세스 메모리(RSS) 측정과 상한 관리: 상한을 넘으면 캐시를 비우고 새 카드 투입을 늦춤 (MemoryGovernor)
+- N장마다 최대 메모리 기록
+"""
+
+import gc
+import os
+import sys
+import ctypes
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성: 없으면 Windows에서는 메모리를 측정하지 않음
+    psutil = None
+
+# 카드 캔버스 크기 (300 DPI): 세로 / 가로
+CARD_CANVAS_SIZES = ((638, 1016), (1016, 638))
+
+# (크기, 모드)마다 보관할 최대 캔버스 수
+DEFAULT_POOL_DEPTH = 2
+
+# 캐시를 비워도 상한 아래로 내려가지 않았을 때, 이만큼(상한 대비 비율) 더 늘어나기 전에는 다시 비우지 않음
+TRIM_RETRY_MARGIN = 0.1
+
+
+def current_rss_mb(pid=None):
+    """프로세스의 현재 RSS (MB, 측정할 수 없으면 None)"""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    return None
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB, 측정할 수 없으면 None)"""
+    # Linux: ru_maxrss는 fork한 부모의 값을 exec 뒤에도 이어받으므로 VmHWM을 우선 사용
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if psutil is not None and hasattr(psutil.Process().memory_info(), 'peak_wset'):
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class CanvasPool:
+    """크기/모드별 카드 캔버스 재사용 풀 (스레드 안전)"""
+
+    def __init__(self, depth=DEFAULT_POOL_DEPTH):
+        """
+        Args:
+            depth: (크기, 모드)마다 보관할 최대 캔버스 수 (넘치는 캔버스는 버림)
+        """
+        self.depth = depth
+        self.reused = 0
+        self.allocated = 0
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def preallocate(self, sizes=CARD_CANVAS_SIZES, mode='RGB'):
+        """카드 크기 캔버스를 미리 하나씩 할당"""
+        from PIL import Image
+        for size in sizes:
+            self.release(Image.new(mode, tuple(size)))
+
+    def acquire(self, size, mode='RGB'):
+        """
+        (크기, 모드) 캔버스 하나 (내용은 이전 카드가 남아 있으므로 호출자가 전부 덮어써야 함)
+        """
+        key = (tuple(size), mode)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reused += 1
+                canvas = free.pop()
+                canvas.info = {}
+                return canvas
+            self.allocated += 1
+        from PIL import Image
+        return Image.new(mode, key[0])
+
+    def release(self, image):
+        """다 쓴 캔버스 반납 (다른 곳에서 더 이상 쓰지 않을 때만)"""
+        if image is None:
+            return
+        key = (image.size, image.mode)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.depth:
+                free.append(image)
+                return
+        image.close()
+
+    def clear(self):
+        with self._lock:
+            free_lists = list(self._free.values())
+            self._free.clear()
+        for free in free_lists:
+            for image in free:
+                image.close()
+
+    def describe(self):
+        """풀 상태 문구"""
+        return f"캔버스 재사용 {self.reused}회, 새 할당 {self.allocated}회"
+
+
+def _release_free_memory():
+    """해제된 메모리를 운영체제에 돌려주기 (Pillow 블록 캐시, glibc 힙)"""
+    from PIL import Image
+    Image.core.clear_cache()
+    if sys.platform.startswith('linux'):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):  # musl 등 glibc가 아닌 환경
+            pass
+
+
+def trim_caches(canvas_pool=None):
+    """메모리 캐시(템플릿/배경 프레임, 텍스트 타일, 캔버스)를 비우고 GC 실행"""
+    from card_render_engine import clear_frame_cache
+    from text_tiles import get_text_tile_cache
+
+    clear_frame_cache()
+    get_text_tile_cache().clear()
+    if canvas_pool is not None:
+        canvas_pool.clear()
+    gc.collect()
+    _release_free_memory()
+
+
+class MemoryGovernor:
+    """메모리 상한 관리 + N장마다 최대 메모리 기록"""
+
+    def __init__(self, limit_mb=None, log_every=0, canvas_pool=None, log=print):
+        """
+        Args:
+            limit_mb: 메모리 상한 (MB, None이면 상한 없음)
+            log_every: N장마다 최대 메모리 로그 (0이면 기록하지 않음)
+            canvas_pool: 상한을 넘었을 때 함께 비울 캔버스 풀
+        """
+        self.limit_mb = limit_mb
+        self.log_every = log_every
+        self.canvas_pool = canvas_pool
+        self.log = log
+        self.trims = 0
+        self.peak_mb = 0.0
+        self._trim_floor = None   # 직전 정리 후에도 상한을 넘었을 때의 메모리
+        if limit_mb and current_rss_mb() is None:
+            self.log("⚠️ 이 환경에서는 메모리를 측정할 수 없어 메모리 상한을 적용하지 않습니다 (pip install psutil)")
+            self.limit_mb = None
+
+    def over_limit(self, rss_mb):
+        return bool(self.limit_mb) and rss_mb is not None and rss_mb > self.limit_mb
+
+    def admit(self):
+        """
+        새 카드 투입 전 호출: 상한을 넘었으면 캐시를 비워 메모리 확보
+
+        Returns:
+            확보 후에도 상한을 넘으면 False (호출자가 투입을 늦춤)
+        """
+        rss = current_rss_mb()
+        self._track(rss)
+        if not self.over_limit(rss):
+            self._trim_floor = None
+            return True
+        if self._trim_floor is not None and rss < self._trim_floor + self.limit_mb * TRIM_RETRY_MARGIN:
+            # 방금 비웠는데도 줄지 않은 상태: 매 카드마다 캐시를 다시 비우지 않음
+            return False
+
+        trim_caches(self.canvas_pool)
+        self.trims += 1
+        after = current_rss_mb()
+        self.log(f"⚠️ 메모리 상한 초과 ({rss:.0f}MB > {self.limit_mb}MB) → 캐시 정리 후 {after:.0f}MB")
+        if self.over_limit(after):
+            self._trim_floor = after
+            return False
+        self._trim_floor = None
+        return True
+
+    def _track(self, rss):
+        if rss is not None:
+            self.peak_mb = max(self.peak_mb, rss)
+
+    def card_done(self, done_count, total=None, rss_mb=None):
+        """카드 한 장 완료 후 호출 (log_every장마다 최대 메모리 로그)"""
+        self._track(rss_mb if rss_mb is not None else current_rss_mb())
+        if self.log_every and done_count % self.log_every == 0:
+            self.log(f"📈 [{done_count}/{total or '?'}] 최대 메모리 {self.peak_mb:.0f}MB"
+                     + (f" (상한 {self.limit_mb}MB, 캐시 정리 {self.trims}회)" if self.limit_mb else ""))
@@ -0,0 +1,194 @@
+"""
+프린터 패널 압축 (인코더 계층)
+- RLE: PackBits 방식 (같은 바이트 반복 → 2바이트, 나머지는 최대 128바이트 리터럴)
+- 델타 행: 바로 위 행과 XOR 후 RLE (위아래로 비슷한 행이 많은 카드 배경/글자에 유리)
+- 프린터가 지원하는 방식 중 패널마다 가장 작은 결과를 선택
+- 9600 baud 같은 느린 시리얼 링크의 예상 전송 시간 계산
+"""
+
+import re
+
+COMPRESSION_NONE = 0
+COMPRESSION_RLE = 1
+COMPRESSION_DELTA = 2
+
+# 설정/명령줄 이름 → 압축 방식 코드
+COMPRESSION_NAMES = {
+    'none': COMPRESSION_NONE,
+    'rle': COMPRESSION_RLE,
+    'delta': COMPRESSION_DELTA,
+}
+
+# 3바이트 이상 같은 값이 이어지는 구간 (정규식 엔진이 C 속도로 찾음)
+_RUN = re.compile(rb'(.)\1{2,}', re.S)
+
+
+def compression_codes(methods):
+    """'rle', 'delta' 같은 이름(또는 코드) 목록 → 압축 방식 코드 튜플"""
+    codes = []
+    for method in methods or ():
+        code = COMPRESSION_NAMES.get(method, method)
+        if code not in COMPRESSION_NAMES.values():
+            raise ValueError(f"알 수 없는 압축 방식: {method} ({', '.join(COMPRESSION_NAMES)})")
+        codes.append(code)
+    return tuple(codes)
+
+
+def compression_name(code):
+    for name, value in COMPRESSION_NAMES.items():
+        if value == code:
+            return name
+    return str(code)
+
+
+def _append_literal(out, data, start, end):
+    for pos in range(start, end, 128):
+        chunk = data[pos:min(pos + 128, end)]
+        out.append(len(chunk) - 1)
+        out += chunk
+
+
+def rle_encode(data):
+    """
+    PackBits 인코딩
+
+    헤더 0~127: 뒤따르는 (헤더+1)바이트를 그대로 복사
+    헤더 129~255: 다음 1바이트를 (257-헤더)번 반복
+    """
+    data = bytes(data)
+    out = bytearray()
+    pos = 0
+    for match in _RUN.finditer(data):
+        start, end = match.span()
+        _append_literal(out, data, pos, start)
+        value = data[start]
+        length = end - start
+        while length >= 3:
+            count = min(length, 128)
+            out.append(257 - count)
+            out.append(value)
+            length -= count
+        # 128개씩 끊고 남은 1~2바이트는 다음 리터럴에 포함
+        pos = end - length
+    _append_literal(out, data, pos, len(data))
+    return bytes(out)
+
+
+def rle_decode(data):
+    """PackBits 디코딩"""
+    out = bytearray()
+    pos = 0
+    length = len(data)
+    while pos < length:
+        header = data[pos]
+        pos += 1
+        if header < 128:
+            out += data[pos:pos + header + 1]
+            pos += header + 1
+        elif header > 128:
+            out += bytes([data[pos]]) * (257 - header)
+            pos += 1
+    return bytes(out)
+
+
+def delta_rows(data, row_bytes):
+    """각 행을 바로 위 행과 XOR (첫 행은 그대로) - 큰 정수 XOR 한 번으로 전체 처리"""
+    data = bytes(data)
+    previous = bytes(row_bytes) + data[:-row_bytes]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(previous, 'big')).to_bytes(len(data), 'big')
+
+
+def undelta_rows(data, row_bytes):
+    """delta_rows의 역변환"""
+    out = bytearray()
+    previous = 0
+    for start in range(0, len(data), row_bytes):
+        previous ^= int.from_bytes(data[start:start + row_bytes], 'big')
+        out += previous.to_bytes(row_bytes, 'big')
+    return bytes(out)
+
+
+def encode(data, method, row_bytes):
+    """패널 데이터를 지정한 방식으로 압축"""
+    if method == COMPRESSION_RLE:
+        return rle_encode(data)
+    if method == COMPRESSION_DELTA:
+        return rle_encode(delta_rows(data, row_bytes))
+    return bytes(data)
+
+
+def decode(data, method, row_bytes):
+    """encode의 역변환 (프린터 시뮬레이터/검증용)"""
+    if method == COMPRESSION_RLE:
+        return rle_decode(data)
+    if method == COMPRESSION_DELTA:
+        return undelta_rows(rle_decode(data), row_bytes)
+    return bytes(data)
+
+
+def encode_best(data, row_bytes, methods):
+    """
+    허용된 방식 중 가장 작은 결과 선택 (압축이 오히려 커지면 원본 그대로)
+
+    Returns:
+        (압축 방식 코드, 데이터)
+    """
+    best_method, best_data = COMPRESSION_NONE, data
+    for method in compression_codes(methods):
+        if method == COMPRESSION_NONE:
+            continue
+        encoded = encode(data, method, row_bytes)
+        if len(encoded) < len(best_data):
+            best_method, best_data = method, encoded
+    return best_method, best_data
+
+
+def estimate_transfer_seconds(byte_count, baud_rate, chunk_size=1024, frame_overhead=6):
+    """
+    시리얼 전송 예상 시간 (8N1: 1바이트 = 10비트, 조각마다 프레임 헤더/체크섬 포함)
+    """
+    frames = max(1, -(-byte_count // chunk_size))
+    return (byte_count + frames * frame_overhead) * 10.0 / baud_rate
+
+
+def format_seconds(seconds):
+    """전송 시간 표시용 (예: 3분 12초)"""
+    if seconds < 60:
+        return f"{seconds:.1f}초"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}분 {seconds}초"
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from pointman_protocol import pack_panels, compress_panels
+
+    parser = argparse.ArgumentParser(description="카드 패널 압축률과 예상 전송 시간 확인")
+    parser.add_argument('images', nargs='+', help="카드 이미지 파일")
+    parser.add_argument('--baud', type=int, default=9600, help="통신 속도")
+    parser.add_argument('--methods', default='rle,delta', help="프린터가 지원하는 압축 방식 (쉼표 구분)")
+    args = parser.parse_args()
+
+    methods = [m for m in args.methods.split(',') if m]
+    total_raw = total_encoded = 0
+    for image_path in args.images:
+        started = time.perf_counter()
+        panels = pack_panels(image_path)
+        encoded_panels, stats = compress_panels(panels, methods)
+        elapsed = time.perf_counter() - started
+
+        print(f"\n🖼️ {image_path} (변환+압축 {elapsed * 1000:.0f}ms)")
+        for panel in encoded_panels:
+            print(f"   {panel.code}: {compression_name(panel.compression):5s} "
+                  f"{panel.raw_length:>9,} → {len(panel.data):>9,} bytes")
+        print(f"   압축률 {stats['ratio']:.1f}:1, 예상 전송 시간 "
+              f"{format_seconds(estimate_transfer_seconds(stats['raw_bytes'], args.baud))} → "
+              f"{format_seconds(estimate_transfer_seconds(stats['encoded_bytes'], args.baud))} ({args.baud} baud)")
+        total_raw += stats['raw_bytes']
+        total_encoded += stats['encoded_bytes']
+
+    if len(args.images) > 1:
+        print(f"\n📊 전체 {len(args.images)}장: 예상 전송 시간 "
+              f"{format_seconds(estimate_transfer_seconds(total_raw, args.baud))} → "
+              f"{format_seconds(estimate_transfer_seconds(total_encoded, args.baud))}")
@@ -0,0 +1,294 @@
+"""
+학생 사진 정규화 (모든 제작기 공통 전처리)
+- EXIF 방향 적용 → ICC 프로파일을 sRGB로 변환 → 색상 모드 변환 → 사진 영역 크기로 LANCZOS 리샘플
+- 결과는 (사진 내용 해시, 크기, 모드) 단위로 cache/photos에 작은 PNG로 저장
+- 같은 사진을 다시 렌더링하거나 일괄 생성할 때 큰 원본을 다시 디코딩하지 않음
+- 캐시 폴더 크기가 상한을 넘으면 가장 오래 쓰지 않은 사진부터 삭제 (렌더 서버/폴더 감시처럼 오래 켜 두는 경우)
+- 큰 원본(휴대폰/DSLR 12~48MP)은 JPEG draft(DCT 축소)와 Image.reduce로 목표의 약 2배까지만 디코딩한 뒤
+  마지막에 LANCZOS로 리샘플 → 일괄 생성에서도 사진 한 장의 메모리가 원본 크기에 비례하지 않음
+"""
+
+import os
+import io
+import shutil
+import threading
+from PIL import Image
+from content_hash import FileHashMemo
+from render_cache import evict_lru
+
+try:
+    from PIL import ImageCms
+except ImportError:  # littlecms 없이 빌드된 Pillow
+    ImageCms = None
+
+PHOTO_CACHE_DIR = os.path.join("cache", "photos")
+DEFAULT_PHOTO_CACHE_BYTES = 256 * 1024 * 1024
+
+# 정규화 방식이 바뀌면 올릴 것 (이전 캐시 파일을 쓰지 않음)
+NORMALIZE_VERSION = 3
+
+# 인쇄용 디코딩 배율: 사진 영역의 2배 이상까지만 디코딩한 뒤 LANCZOS로 마무리
+DECODE_OVERSAMPLE = 2
+
+MODE_RGB = 'RGB'     # 투명도 버림 (PointmanCardPrinter)
+MODE_RGBA = 'RGBA'   # 항상 알파 채널 포함 (TemplateCardMaker)
+MODE_AUTO = 'auto'   # 투명도가 있는 사진만 RGBA (PhotoCardMaker)
+
+# MODE_RGB로 투명도를 버릴 때 투명 영역에 깔 배경색 (기존 출력과 같은 검정)
+ALPHA_MATTE = (0, 0, 0)
+
+# 학생 사진으로 받는 파일 확장자
+PHOTO_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tif', '.tiff')
+
+EXIF_ORIENTATION = 0x0112
+
+# EXIF 방향 값 → 똑바로 세우는 변환
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def read_orientation(image):
+    """EXIF 방향 값 (없거나 읽을 수 없으면 1)"""
+    try:
+        return image.getexif().get(EXIF_ORIENTATION, 1)
+    except Exception:
+        return 1
+
+
+def has_alpha(image):
+    return 'A' in image.getbands() or 'transparency' in image.info
+
+
+def flatten_alpha(image, matte=ALPHA_MATTE):
+    """
+    투명 영역을 고정 배경색 위에 합성한 RGB 이미지
+
+    convert('RGB')는 알파만 떼어내므로 투명 픽셀에 숨어 있던 색이 그대로 드러남
+    """
+    rgba = image if image.mode == 'RGBA' else image.convert('RGBA')
+    flat = Image.new('RGB', rgba.size, matte)
+    flat.paste(rgba, (0, 0), rgba)
+    if rgba is not image:
+        rgba.close()
+    return flat
+
+
+def convert_to_srgb(image, icc_profile):
+    """임베디드 ICC 프로파일 → sRGB (이미 sRGB이거나 변환할 수 없으면 그대로)"""
+    if not icc_profile or ImageCms is None or image.mode not in ('RGB', 'RGBA', 'CMYK'):
+        return image
+    try:
+        source = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+        if 'sRGB' in ImageCms.getProfileDescription(source):
+            return image
+        color_space = source.profile.xcolor_space.strip()
+        if color_space != ('CMYK' if image.mode == 'CMYK' else 'RGB'):
+            return image
+
+        alpha = image.getchannel('A') if image.mode == 'RGBA' else None
+        base = image.convert('RGB') if alpha is not None else image
+        converted = ImageCms.profileToProfile(base, source, ImageCms.createProfile('sRGB'), outputMode='RGB')
+        if alpha is not None:
+            converted.putalpha(alpha)
+        return converted
+    except Exception as e:
+        print(f"⚠️ ICC 프로파일 변환 실패 (원본 색상 사용): {e}")
+        return image
+
+
+def normalize_image(image, size, mode=MODE_RGB, orientation=1, icc_profile=None):
+    """
+    디코딩된 사진 → 방향/색공간/모드/크기 정규화
+
+    단계마다 생긴 중간 이미지는 바로 해제합니다 (입력 image는 호출자 소유).
+    """
+    original = image
+
+    def replace(old, new):
+        if new is not old and old is not original:
+            old.close()
+        return new
+
+    if orientation in ORIENTATION_TRANSPOSE:
+        image = replace(image, image.transpose(ORIENTATION_TRANSPOSE[orientation]))
+    image = replace(image, convert_to_srgb(image, icc_profile))
+
+    if mode == MODE_AUTO:
+        mode = 'RGBA' if has_alpha(image) else 'RGB'
+    if mode == MODE_RGB and has_alpha(image):
+        image = replace(image, flatten_alpha(image))
+    if image.mode != mode:
+        image = replace(image, image.convert(mode))
+
+    if image.size != tuple(size):
+        image = replace(image, image.resize(tuple(size), Image.Resampling.LANCZOS))
+    return image
+
+
+def open_image_scaled(image_path, size, oversample=1):
+    """
+    목표 크기에 필요한 만큼만 디코딩하여 이미지 열기
+
+    - JPEG는 draft 모드로 디코딩 단계에서 1/2, 1/4, 1/8로 축소
+    - 그래도 큰 이미지는 Image.reduce로 정수 배 축소
+    결과는 항상 size x oversample 이상이므로 마지막 LANCZOS 리사이즈만 남습니다.
+    디코딩한 이미지를 복사하지 않고 그대로 돌려주므로 원본 크기의 사본이 생기지 않습니다.
+    """
+    target_width = max(1, size[0] * oversample)
+    target_height = max(1, size[1] * oversample)
+
+    source = Image.open(image_path)
+    try:
+        if source.format == 'JPEG':
+            source.draft(None, (target_width, target_height))
+        source.load()
+    except Exception:
+        source.close()
+        raise
+
+    factor = min(source.width // target_width, source.height // target_height)
+    if factor >= 2 and source.mode in ('L', 'LA', 'RGB', 'RGBA'):
+        reduced = source.reduce(factor)
+        source.close()
+        return reduced
+    return source
+
+
+def decode_photo(photo_path, size, mode=MODE_RGB, fast_decode=False):
+    """
+    사진 파일 → 정규화된 이미지 (캐시 없이)
+
+    Args:
+        size: (폭, 높이) - 사진 영역 크기
+        mode: MODE_RGB / MODE_RGBA / MODE_AUTO
+        fast_decode: True면 목표 크기만큼만 축소 디코딩 (미리보기용),
+                     False면 목표의 DECODE_OVERSAMPLE배까지 축소 디코딩 (인쇄 품질)
+    """
+    with Image.open(photo_path) as source:
+        orientation = read_orientation(source)
+        icc_profile = source.info.get('icc_profile')
+
+    # 90도 회전되는 사진은 디코딩 목표 크기도 돌려서 계산
+    target = (size[1], size[0]) if orientation in (5, 6, 7, 8) else size
+    image = open_image_scaled(photo_path, target, 1 if fast_decode else DECODE_OVERSAMPLE)
+    normalized = normalize_image(image, size, mode, orientation, icc_profile)
+    if normalized is not image:
+        image.close()
+    return normalized
+
+
+class PhotoNormalizer:
+    """정규화된 사진 디스크 캐시 (여러 프로세스가 같은 폴더를 함께 써도 안전)"""
+
+    def __init__(self, cache_dir=PHOTO_CACHE_DIR, max_bytes=DEFAULT_PHOTO_CACHE_BYTES):
+        """
+        Args:
+            cache_dir: 정규화된 사진 PNG를 저장할 폴더
+            max_bytes: 캐시 폴더 크기 상한 (넘으면 오래 쓰지 않은 사진부터 삭제)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._file_hashes = FileHashMemo()
+        self._total = None       # 캐시 폴더 크기 추정값 (None: 아직 확인 전)
+        self._lock = threading.Lock()
+
+    def _cache_path(self, content_hash, size, mode, fast_decode):
+        decode = 'fast' if fast_decode else 'full'
+        name = f"{content_hash}_{size[0]}x{size[1]}_{mode}_{decode}_v{NORMALIZE_VERSION}.png"
+        return os.path.join(self.cache_dir, content_hash[:2], name)
+
+    def normalize(self, photo_path, size, mode=MODE_RGB, fast_decode=False):
+        """
+        (사진, 크기, 모드)에 해당하는 정규화된 사진 (캐시에 없으면 만들어 저장)
+
+        Returns:
+            크기가 정확히 size인 RGB/RGBA 이미지 (호출자 소유)
+        """
+        size = (int(size[0]), int(size[1]))
+        cache_path = self._cache_path(self._file_hashes.get(photo_path), size, mode, fast_decode)
+
+        try:
+            # 작은 PNG 한 장: load() 후 파일이 닫히므로 복사하지 않고 그대로 사용
+            image = Image.open(cache_path)
+            try:
+                image.load()
+            except Exception:
+                image.close()
+                raise
+        except (OSError, ValueError):
+            pass
+        else:
+            try:
+                os.utime(cache_path)   # 최근 사용 표시 (삭제 순서 기준)
+            except OSError:
+                pass
+            with self._lock:
+                self.hits += 1
+            return image
+
+        with self._lock:
+            self.misses += 1
+        image = decode_photo(photo_path, size, mode, fast_decode)
+
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            image.save(temp_path, 'PNG')
+            os.replace(temp_path, cache_path)
+            stored = os.path.getsize(cache_path)
+        except OSError as e:
+            print(f"⚠️ 정규화 사진 캐시 저장 실패: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return image
+
+        with self._lock:
+            if self._total is not None:
+                self._total += stored
+            need_scan = self._total is None or self._total > self.max_bytes
+        if need_scan:
+            self.evict()
+        return image
+
+    def evict(self):
+        """캐시 폴더가 상한을 넘으면 오래 쓰지 않은 사진부터 삭제"""
+        total, removed = evict_lru(self.cache_dir, self.max_bytes)
+        with self._lock:
+            self._total = total
+            self.evictions += removed
+
+    def clear(self):
+        """캐시 폴더 비우기"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        with self._lock:
+            self._total = 0
+
+
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def get_photo_normalizer():
+    """프로세스 전역 사진 정규화 캐시"""
+    global _normalizer
+    with _normalizer_lock:
+        if _normalizer is None:
+            _normalizer = PhotoNormalizer()
+        return _normalizer
+
+
+def normalize_photo(photo_path, size, mode=MODE_RGB, fast_decode=False):
+    """전역 캐시로 사진 정규화"""
+    return get_photo_normalizer().normalize(photo_path, size, mode, fast_decode)
@@ -0,0 +1,490 @@
+"""
+사진 폴더 감시 → 학생증 자동 생성
+- photos/ 폴더에 새 사진이 들어오면 명단에서 학생을 찾아 바로 카드를 만듦 (학생이 프린터에 오기 전에 준비)
+- 파일 이름 규칙: <학번>.jpg (synthetic_roster와 같은 규칙), <학번>_<이름>.jpg, 또는 명단 사진 열의 파일 이름
+- Linux는 inotify, 그 밖의 환경은 scandir 폴링으로 변경 감지
+- 복사 중인 파일은 크기/수정 시각이 settle 시간 동안 그대로일 때까지 기다렸다가 렌더링 (디바운스)
+- 렌더링은 batch_renderer와 같은 워커(제작기/템플릿/폰트 미리 로드)로, 대기 작업 수를 제한한 프로세스 풀에서
+
+    python src/photo_watcher.py roster.csv                        # photos/ 감시 → student_cards/
+    python src/photo_watcher.py roster.csv --maker pointman --template card_template.png
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from batch_renderer import MAKER_POINTMAN, MAKER_TEMPLATE, get_maker_class, init_worker, render_one
+from photo_normalizer import PHOTO_EXTENSIONS
+from roster_reader import REQUIRED_FIELDS, iter_roster, validate_student, print_roster_errors
+
+DEFAULT_SETTLE_SECONDS = 1.0     # 크기/수정 시각이 이 시간 동안 그대로면 다 쓴 파일로 판단
+DEFAULT_POLL_INTERVAL = 1.0      # 폴링 감시 주기 (초)
+
+# inotify 이벤트 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')   # wd, mask, cookie, len (+ 이름)
+
+
+def is_photo_file(name):
+    """감시 대상 사진 파일인지 (숨김/임시 파일 제외)"""
+    if name.startswith(('.', '~')):
+        return False
+    return os.path.splitext(name)[1].lower() in PHOTO_EXTENSIONS
+
+
+def _file_signature(path):
+    """(수정 시각, 크기) - 없거나 비어 있으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size) if stat.st_size else None
+
+
+class PollingSource:
+    """scandir 폴링 감시 (모든 운영체제)"""
+
+    name = "폴링"
+
+    def __init__(self, folder, interval=DEFAULT_POLL_INTERVAL):
+        self.folder = folder
+        self.interval = interval
+        self._seen = {}
+        self._last_scan = None
+
+    def changes(self, timeout):
+        """
+        timeout초 안에 새로 생기거나 바뀐 사진 경로들
+        """
+        if self._last_scan is not None:
+            delay = self._last_scan + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, timeout))
+                if time.monotonic() < self._last_scan + self.interval:
+                    return []
+        self._last_scan = time.monotonic()
+
+        changed = []
+        seen = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not is_photo_file(entry.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                seen[entry.path] = signature
+                if self._seen.get(entry.path) != signature:
+                    changed.append(entry.path)
+        self._seen = seen
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """inotify 감시 (Linux) - 파일을 쓰거나 옮겨 올 때만 깨어남"""
+
+    name = "inotify"
+
+    def __init__(self, folder):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or "libc.so.6", use_errno=True)
+        self.folder = folder
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        mask = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch 실패: {folder}")
+
+    def changes(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if name and is_photo_file(name):
+                path = os.path.join(self.folder, name)
+                if path not in changed:
+                    changed.append(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_source(folder, use_inotify=True, poll_interval=DEFAULT_POLL_INTERVAL):
+    """가능하면 inotify, 아니면 폴링 감시"""
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            return InotifySource(folder)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify를 쓸 수 없어 폴링으로 감시합니다: {e}")
+    return PollingSource(folder, poll_interval)
+
+
+class Debouncer:
+    """복사 중인 파일 거르기: (수정 시각, 크기)가 settle초 동안 그대로인 파일만 내보냄"""
+
+    def __init__(self, settle_seconds=DEFAULT_SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        self._files = {}   # 경로 → (서명, 마지막으로 바뀐 시각)
+
+    def touch(self, path):
+        """변경 이벤트가 온 파일 등록 (쓰는 중이면 대기 시간 다시 시작)"""
+        signature = _file_signature(path)
+        current = self._files.get(path)
+        if current is None or current[0] != signature:
+            self._files[path] = (signature, time.monotonic())
+
+    def pop_ready(self):
+        """다 쓴 것으로 보이는 파일들 (삭제된 파일은 버림)"""
+        now = time.monotonic()
+        ready = []
+        for path, (signature, changed_at) in list(self._files.items()):
+            current = _file_signature(path)
+            if current is None and not os.path.exists(path):
+                del self._files[path]
+            elif current != signature:
+                self._files[path] = (current, now)
+            elif current is not None and now - changed_at >= self.settle_seconds:
+                del self._files[path]
+                ready.append((path, current))
+        return ready
+
+    def next_deadline(self):
+        """가장 먼저 준비될 파일까지 남은 시간 (대기 중인 파일이 없으면 None)"""
+        if not self._files:
+            return None
+        oldest = min(changed_at for _, changed_at in self._files.values())
+        return max(0.0, oldest + self.settle_seconds - time.monotonic())
+
+    def __len__(self):
+        return len(self._files)
+
+
+class PhotoRoster:
+    """명단 파일 → 사진 파일 이름으로 학생 찾기 (명단 파일이 바뀌면 다시 읽음)"""
+
+    def __init__(self, roster_path, maker_kind=MAKER_TEMPLATE):
+        self.roster_path = roster_path
+        # 사진은 아직 없을 수 있으므로 사진 경로는 검사하지 않음
+        self.required_fields = tuple(field for field in REQUIRED_FIELDS[maker_kind] if field != 'photo_path')
+        self._index = {}
+        self._signature = None
+        self.reload()
+
+    def reload(self, force=False):
+        """
+        명단 파일이 바뀌었으면 다시 읽음
+
+        Returns:
+            다시 읽었으면 True
+        """
+        signature = _file_signature(self.roster_path)
+        if not force and signature == self._signature:
+            return False
+        self._signature = signature
+
+        index = {}
+        errors = []
+        for row_no, student in iter_roster(self.roster_path):
+            row_errors = validate_student(student, self.required_fields, check_photo=False)
+            if row_errors:
+                errors.extend((row_no, message) for message in row_errors)
+                continue
+            for key in self._keys(student):
+                index.setdefault(key, student)
+        self._index = index
+
+        print(f"📋 명단 로드: {self.roster_path} (사진 이름 {len(index)}개)")
+        if errors:
+            print(f"⚠️ 명단에서 건너뛴 행이 있습니다 ({len(errors)}개)")
+            print_roster_errors(errors, limit=10)
+        return True
+
+    @staticmethod
+    def _keys(student):
+        """학생을 찾을 때 쓰는 사진 파일 이름(확장자 제외) 후보"""
+        keys = []
+        if student.get('student_id'):
+            keys.append(student['student_id'].lower())
+        if student.get('photo_path'):
+            keys.append(os.path.splitext(os.path.basename(student['photo_path']))[0].lower())
+        return keys
+
+    def match(self, photo_path):
+        """
+        사진 파일에 해당하는 학생 정보 (photo_path는 이 사진으로 바꿈, 없으면 None)
+
+        <학번>.jpg / <학번>_<이름>.jpg / <학번>-<이름>.jpg / 명단 사진 열의 파일 이름 순서로 찾음
+        """
+        stem = os.path.splitext(os.path.basename(photo_path))[0].strip().lower()
+        candidates = [stem]
+        for separator in ('_', '-', ' '):
+            if separator in stem:
+                candidates.append(stem.split(separator, 1)[0])
+        for key in candidates:
+            student = self._index.get(key)
+            if student is not None:
+                return dict(student, photo_path=photo_path)
+        return None
+
+
+class PhotoWatcher:
+    """사진 폴더 감시 + 명단 매칭 + 워커 풀 렌더링"""
+
+    def __init__(self, photo_folder, roster_path, maker_kind=MAKER_TEMPLATE, template_path='card_template.png',
+                 output_folder='student_cards', workers=None, max_pending=None,
+                 settle_seconds=DEFAULT_SETTLE_SECONDS, poll_interval=DEFAULT_POLL_INTERVAL,
+                 use_inotify=True, skip_existing=False, use_cache=True):
+        """
+        Args:
+            photo_folder: 감시할 사진 폴더
+            roster_path: 명단 파일 (CSV/XLSX/JSONL, 실행 중에 바뀌면 다시 읽음)
+            maker_kind: 'pointman' 또는 'template'
+            workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+            max_pending: 워커에 동시에 올릴 최대 카드 수 (기본: 워커 수 x 2, 나머지는 대기열에서 기다림)
+            settle_seconds: 파일 크기/수정 시각이 이 시간 동안 그대로여야 렌더링
+            use_inotify: False면 항상 폴링
+            skip_existing: True면 시작할 때 이미 있던 사진은 건너뜀
+        """
+        self.photo_folder = photo_folder
+        self.maker_kind = maker_kind
+        self.maker_class = get_maker_class(maker_kind)
+        self.template_path = template_path
+        self.output_folder = output_folder
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.skip_existing = skip_existing
+        self.use_cache = use_cache
+
+        self.roster = PhotoRoster(roster_path, maker_kind)
+        self.debouncer = Debouncer(settle_seconds)
+        self.queue = deque()         # 렌더링을 기다리는 (사진 경로, 서명, 학생 정보)
+        self.pending = {}            # future → (사진 경로, 서명, 학생 정보)
+        self.suspects = set()        # 워커가 죽을 때 함께 렌더링 중이던 사진 (한 장씩 따로 다시 렌더링)
+        self.rendered = {}           # 사진 경로 → 마지막으로 렌더링한 서명 (같은 파일을 다시 만들지 않음)
+        self.unmatched = {}          # 명단에 없는 사진 경로 → 서명 (명단이 바뀌면 다시 찾음)
+        self.stats = {'rendered': 0, 'cached': 0, 'failed': 0, 'unmatched': 0}
+        self._count = 0
+        self._pool = None
+
+    def _start_pool(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                         initargs=(self.maker_kind, self.template_path, True, self.use_cache))
+
+    def _stop_pool(self, wait_pending=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait_pending, cancel_futures=not wait_pending)
+            self._pool = None
+
+    def _initial_scan(self):
+        """시작 시 폴더에 이미 있는 사진"""
+        with os.scandir(self.photo_folder) as entries:
+            paths = [entry.path for entry in entries if entry.is_file() and is_photo_file(entry.name)]
+        if self.skip_existing:
+            for path in paths:
+                self.rendered[path] = _file_signature(path)
+            print(f"⏭️ 기존 사진 {len(paths)}장은 건너뜀")
+        else:
+            for path in paths:
+                self.debouncer.touch(path)
+
+    def _enqueue_ready(self):
+        for path, signature in self.debouncer.pop_ready():
+            if self.rendered.get(path) == signature or any(path == queued[0] for queued in self.queue):
+                continue
+            student = self.roster.match(path)
+            if student is None:
+                if self.unmatched.get(path) != signature:
+                    self.unmatched[path] = signature
+                    self.stats['unmatched'] += 1
+                    print(f"⚠️ 명단에서 학생을 찾을 수 없습니다: {os.path.basename(path)} "
+                          f"(파일 이름을 <학번>.jpg 형식으로)")
+                continue
+            self.unmatched.pop(path, None)
+            self.queue.append((path, signature, student))
+
+    def _retry_unmatched(self):
+        """명단이 바뀌었으면 찾지 못했던 사진을 다시 매칭"""
+        if self.roster.reload() and self.unmatched:
+            for path in list(self.unmatched):
+                self.debouncer.touch(path)
+            self.unmatched.clear()
+
+    def _submit(self):
+        while self.queue and len(self.pending) < self.max_pending:
+            # 의심 사진은 혼자 렌더링 (그러다 워커가 죽으면 그 사진이 원인)
+            if self.pending and (self.queue[0][0] in self.suspects
+                                 or any(entry[0] in self.suspects for entry in self.pending.values())):
+                return
+            path, signature, student = self.queue.popleft()
+            self._count += 1
+            output_path = self.maker_class.batch_output_path(self.output_folder, student)
+            future = self._pool.submit(render_one, self._count, student, output_path)
+            self.pending[future] = (path, signature, student)
+
+    def _fail(self, path, signature, name, error):
+        # 실패한 사진도 파일이 다시 바뀌기(다시 복사하기) 전에는 재시도하지 않음
+        self.rendered[path] = signature
+        self.suspects.discard(path)
+        self.stats['failed'] += 1
+        print(f"❌ {name} ({os.path.basename(path)}) 생성 실패: {error}")
+
+    def _collect(self, timeout):
+        if not self.pending:
+            return
+        done, _ = wait(self.pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            path, signature, student = self.pending.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken = True
+                self.pending[future] = (path, signature, student)
+                continue
+            except Exception as e:
+                self._fail(path, signature, student.get('name', ''), f"❌ {e}")
+                continue
+
+            self.rendered[path] = signature
+            self.suspects.discard(path)
+            if result['success']:
+                self.stats['rendered'] += 1
+                self.stats['cached'] += result['cached']
+                print(f"✅ {result['name']} ({os.path.basename(path)}) → {result['output_path']}")
+            else:
+                self._fail(path, signature, result['name'], result['error'])
+
+        if broken:
+            self._recover_pool()
+
+    def _recover_pool(self):
+        """
+        워커가 죽어 풀이 깨졌을 때: 렌더링 중이던 사진을 실패 처리하거나 다시 대기열에 넣고 풀을 새로 만듦
+
+        혼자 렌더링 중이던 사진이면 그 사진이 원인이므로 실패 처리하고,
+        여러 장이었으면 어느 사진 때문인지 모르므로 모두 의심 사진으로 표시해 한 장씩 다시 렌더링
+        """
+        crashed = list(self.pending.values())
+        self.pending.clear()
+        print(f"⚠️ 워커 프로세스가 비정상 종료되었습니다 (렌더링 중이던 사진 {len(crashed)}장) - 워커 풀 재시작")
+        if len(crashed) == 1:
+            path, signature, student = crashed[0]
+            self.suspects.discard(path)
+            self._fail(path, signature, student.get('name', ''),
+                       "❌ 렌더링 중 워커 프로세스가 종료됨 (손상되었거나 너무 큰 사진)")
+        else:
+            for path, signature, student in reversed(crashed):
+                self.suspects.add(path)
+                self.queue.appendleft((path, signature, student))
+        self._stop_pool(wait_pending=False)
+        self._start_pool()
+
+    def run(self, duration=None):
+        """
+        감시 실행 (Ctrl+C 또는 duration초 후 종료)
+
+        Returns:
+            {'rendered', 'cached', 'failed', 'unmatched'} 통계
+        """
+        if not os.path.isdir(self.photo_folder):
+            os.makedirs(self.photo_folder)
+        if self.output_folder and not os.path.exists(self.output_folder):
+            os.makedirs(self.output_folder)
+
+        source = open_source(self.photo_folder, self.use_inotify, self.poll_interval)
+        self._initial_scan()
+        print(f"👀 사진 폴더 감시 중 ({source.name}): {self.photo_folder} → {self.output_folder} "
+              f"(워커 {self.workers}개, Ctrl+C로 종료)")
+
+        deadline = time.monotonic() + duration if duration else None
+        self._start_pool()
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                # 대기 시간: 렌더링 결과/디바운스가 있으면 짧게, 없으면 감시 주기만큼
+                timeout = self.poll_interval
+                settle = self.debouncer.next_deadline()
+                if settle is not None:
+                    timeout = min(timeout, settle)
+                if self.pending:
+                    timeout = min(timeout, 0.1)
+                if deadline is not None:
+                    timeout = max(0.0, min(timeout, deadline - time.monotonic()))
+
+                for path in source.changes(timeout):
+                    self.debouncer.touch(path)
+                self._retry_unmatched()
+                self._enqueue_ready()
+                self._submit()
+                self._collect(0)
+
+            # 종료 전 올려 둔 카드는 마무리
+            while self.pending or self.queue:
+                self._submit()
+                self._collect(None)
+        except KeyboardInterrupt:
+            print("\n🛑 감시 종료")
+        finally:
+            self._stop_pool()
+            source.close()
+
+        stats = self.stats
+        print(f"📊 생성 {stats['rendered']}장 (캐시 {stats['cached']}장), 실패 {stats['failed']}장, "
+              f"명단에 없음 {stats['unmatched']}장")
+        return dict(stats)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="사진 폴더를 감시해 새 사진이 들어오면 학생증 자동 생성")
+    parser.add_argument('roster', help="명단 파일 (CSV / XLSX / JSONL)")
+    parser.add_argument('--photos', default='photos', help="감시할 사진 폴더")
+    parser.add_argument('--maker', choices=[MAKER_POINTMAN, MAKER_TEMPLATE], default=MAKER_TEMPLATE)
+    parser.add_argument('--template', default='card_template.png', help="템플릿(배경 프레임) 파일")
+    parser.add_argument('--output', default='student_cards', help="출력 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="워커 수 (기본: CPU 코어 수)")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="파일이 이 시간(초) 동안 바뀌지 않아야 렌더링 (복사 중인 파일 대기)")
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help="폴링 감시 주기 (초)")
+    parser.add_argument('--poll', action='store_true', help="inotify 대신 항상 폴링으로 감시")
+    parser.add_argument('--skip-existing', action='store_true', help="시작할 때 이미 있던 사진은 건너뜀")
+    parser.add_argument('--no-cache', action='store_true', help="렌더 캐시를 쓰지 않음")
+    args = parser.parse_args()
+
+    watcher = PhotoWatcher(args.photos, args.roster, args.maker, args.template, args.output,
+                           workers=args.workers, settle_seconds=args.settle, poll_interval=args.poll_interval,
+                           use_inotify=not args.poll, skip_existing=args.skip_existing, use_cache=not args.no_cache)
+    watcher.run()
@@ -3,21 +3,39 @@ Pointman N20 학생증 제작 프로그램
 54mm x 86mm (CR80) 카드 사이즈 맞춤형
 """
 
-import serial
-import time
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 import math
+from font_registry import KOREAN_SYSTEM_FONTS, font_signature, load_font
+from card_render_engine import load_template_image
+from photo_normalizer import MODE_RGB, normalize_photo
+from pointman_protocol import DEFAULT_COMPRESSION, FLOW_SOFTWARE, TRANSFER_STATUS, send_card
+from printer_connection import PrinterConnectionError, get_connection
+from render_cache import get_render_cache
+from text_tiles import draw_text
+from render_trace import current_span, traced
+from memory_budget import CanvasPool, MemoryGovernor
 
 class PointmanCardPrinter:
-    def __init__(self, com_port='COM3', baud_rate=9600):
+    def __init__(self, com_port='COM3', baud_rate=9600, flow_control=FLOW_SOFTWARE,
+                 compression=DEFAULT_COMPRESSION, transfer_mode=TRANSFER_STATUS):
         """
         카드 사이즈: 54mm x 86mm (2.12" x 3.38")
         300 DPI 기준: 638 x 1016 픽셀
+        
+        flow_control: 'xonxoff' (소프트웨어) / 'rtscts' (하드웨어) / 'none'
+        compression: 프린터가 지원하는 패널 압축 방식 ('rle', 'delta' / 빈 튜플이면 압축 안 함)
+        transfer_mode: 'status' (초기화 + 상태 확인, 기본) / 'raster' (래스터 패널 전송 - 매뉴얼 확인 후 사용)
         """
         self.com_port = com_port
         self.baud_rate = baud_rate
-        self.serial_conn = None
+        self.flow_control = flow_control
+        self.compression = compression
+        self.transfer_mode = transfer_mode
+        self.connection = None   # 포트별 공유 연결 (printer_connection)
+        self.render_cache = get_render_cache()   # None이면 항상 새로 렌더링
+        self.last_from_cache = False
+        self.canvas_pool = None   # 지정하면 카드 캔버스 재사용 (memory_budget.CanvasPool, 일괄 생성용)
         
         # CR80 카드 사이즈 (300 DPI 기준)
         self.CARD_WIDTH_MM = 86  # 가로 86mm
@@ -31,9 +49,17 @@ class PointmanCardPrinter:
         print(f"카드 크기: {self.CARD_WIDTH_MM}mm x {self.CARD_HEIGHT_MM}mm")
         print(f"픽셀 크기: {self.CARD_WIDTH_PX}px x {self.CARD_HEIGHT_PX}px")
     
-    def mm_to_px(self, mm):
-        """밀리미터를 픽셀로 변환"""
-        return int((mm / 25.4) * self.DPI)
+    def render_signature(self):
+        """렌더 캐시 키에 들어가는 레이아웃 값"""
+        return {
+            'card_px': (self.CARD_WIDTH_PX, self.CARD_HEIGHT_PX),
+            'dpi': self.DPI,
+            'font': font_signature(KOREAN_SYSTEM_FONTS),
+        }
+    
+    def mm_to_px(self, mm, scale=1.0):
+        """밀리미터를 픽셀로 변환 (scale: 미리보기 배율)"""
+        return int((mm / 25.4) * self.DPI * scale)
     
     def find_available_ports(self):
         """사용 가능한 COM 포트 찾기"""
@@ -45,21 +71,23 @@ class PointmanCardPrinter:
             print("pyserial이 설치되지 않았습니다. pip install pyserial")
             return []
     
-    def connect_printer(self):
-        """프린터 연결"""
+    def connect_printer(self, timeout=2):
+        """
+        프린터 연결
+        
+        포트별 공유 연결을 사용하므로 다른 창/작업이 이미 연 포트면 바로 연결됩니다.
+        연결에 실패해도 공유 연결이 백그라운드에서 재연결을 계속 시도합니다.
+        """
         try:
-            self.serial_conn = serial.Serial(
-                port=self.com_port,
-                baudrate=self.baud_rate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=2
-            )
+            self.connection = get_connection(self.com_port, self.baud_rate, self.flow_control)
+        except PrinterConnectionError as e:
+            print(f"✗ 프린터 연결 실패: {e}")
+            return False
+        if self.connection.wait_connected(timeout):
             print(f"✓ 프린터 연결 성공: {self.com_port}")
             return True
-        except Exception as e:
-            print(f"✗ 프린터 연결 실패: {e}")
+        else:
+            print(f"✗ 프린터 연결 실패: {self.connection.last_error}")
             available = self.find_available_ports()
             if available:
                 print(f"사용 가능한 포트: {available}")
@@ -94,6 +122,7 @@ class PointmanCardPrinter:
         
         return template
     
+    @traced('pointman.card')
     def create_student_card(self, template_path, student_data, output_path, photo_position=None, orientation='portrait'):
         """
         포토샵 템플릿 기반 학생증 생성
@@ -104,184 +133,39 @@ class PointmanCardPrinter:
             output_path: 완성된 학생증 저장 경로
             photo_position: 사진 위치 (x, y, width, height) 튜플
             orientation: 'portrait' (세로) 또는 'landscape' (가로)
+        
+        입력(템플릿/사진 내용, 학생 정보, 레이아웃)이 같은 카드는 렌더 캐시에서 복사합니다.
         """
+        stage = current_span()
+        stage.set(orientation=orientation)
         try:
-            # 방향에 따른 카드 크기 설정
-            if orientation == 'portrait':
-                card_width = self.CARD_HEIGHT_PX  # 세로일 때는 높이가 폭
-                card_height = self.CARD_WIDTH_PX  # 세로일 때는 폭이 높이
-            else:  # landscape
-                card_width = self.CARD_WIDTH_PX
-                card_height = self.CARD_HEIGHT_PX
+            cache_key = None
+            self.last_from_cache = False
+            if self.render_cache is not None:
+                cache_key = self.render_cache.make_key(
+                    'pointman', template_path, student_data.get('photo_path'),
+                    dict(student_data, orientation=orientation), self.render_signature())
+                hit = self.render_cache.fetch(cache_key, output_path)
+                stage.lap('cache_lookup', hit=hit)
+                if hit:
+                    self.last_from_cache = True
+                    print(f"✅ 학생증 생성 완료 (캐시): {output_path}")
+                    return True
             
-            # 템플릿 로드 또는 기본 템플릿 생성
-            if os.path.exists(template_path):
-                template = Image.open(template_path)
-                # 카드 사이즈로 리사이즈
-                template = template.resize((card_width, card_height), 
-                                         Image.Resampling.LANCZOS)
-            else:
-                print("템플릿이 없어서 기본 템플릿을 생성합니다.")
-                template = self.create_vertical_template() if orientation == 'portrait' else self.create_card_template()
-            
-            # 학생 사진 처리
-            if 'photo_path' in student_data and os.path.exists(student_data['photo_path']):
-                photo = Image.open(student_data['photo_path'])
-                
-                # 방향에 따른 사진 크기 및 위치 설정
-                if orientation == 'portrait':
-                    # 세로 방향: 사진을 상단 중앙에 배치
-                    photo_width = self.mm_to_px(25)   # 25mm
-                    photo_height = self.mm_to_px(30)  # 30mm
-                    photo_x = (card_width - photo_width) // 2  # 중앙 정렬
-                    photo_y = self.mm_to_px(8)   # 상단에서 8mm
-                else:
-                    # 가로 방향: 기존 위치
-                    photo_width = self.mm_to_px(25)   # 25mm = ~295px
-                    photo_height = self.mm_to_px(30)  # 30mm = ~354px
-                    photo_x = self.mm_to_px(10)  # 10mm from left
-                    photo_y = self.mm_to_px(12)  # 12mm from top
-                
-                photo = photo.resize((photo_width, photo_height), Image.Resampling.LANCZOS)
-                
-                # 사진이 RGB가 아니면 변환
-                if photo.mode != 'RGB':
-                    photo = photo.convert('RGB')
-                
-                template.paste(photo, (photo_x, photo_y))
-                print(f"✓ 사진 추가: {photo_width}x{photo_height}px at ({photo_x}, {photo_y})")
-            else:
-                print(f"⚠ 사진 파일을 찾을 수 없습니다: {student_data.get('photo_path', 'None')}")
-            
-            # 텍스트 추가
-            draw = ImageDraw.Draw(template)
-            
-            # 폰트 설정
-            try:
-                # Windows 한글 폰트들
-                font_paths = [
-                    "C:/Windows/Fonts/malgun.ttf",    # 맑은 고딕
-                    "C:/Windows/Fonts/gulim.ttc",     # 굴림
-                    "C:/Windows/Fonts/batang.ttc",    # 바탕
-                ]
-                
-                font_large = None
-                font_medium = None
-                font_small = None
-                
-                for font_path in font_paths:
-                    if os.path.exists(font_path):
-                        font_large = ImageFont.truetype(font_path, 36)   # 큰 글씨 (이름)
-                        font_medium = ImageFont.truetype(font_path, 28)  # 중간 글씨 (학번)
-                        font_small = ImageFont.truetype(font_path, 24)   # 작은 글씨 (기타)
-                        print(f"✓ 폰트 로드: {font_path}")
-                        break
-                
-                if not font_large:
-                    print("⚠ 시스템 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-                    font_large = ImageFont.load_default()
-                    font_medium = ImageFont.load_default()
-                    font_small = ImageFont.load_default()
-                    
-            except Exception as e:
-                print(f"폰트 로드 실패: {e}")
-                font_large = ImageFont.load_default()
-                font_medium = ImageFont.load_default()
-                font_small = ImageFont.load_default()
-            
-            # 방향에 따른 텍스트 위치 계산
-            if orientation == 'portrait':
-                # 세로 방향: 사진 아래에 텍스트 배치
-                text_start_y = photo_y + photo_height + self.mm_to_px(5)  # 사진 아래 5mm
-                
-                # 이름 (중앙 정렬)
-                name_text = student_data['name']
-                bbox = draw.textbbox((0, 0), name_text, font=font_large)
-                name_width = bbox[2] - bbox[0]
-                name_x = (card_width - name_width) // 2
-                name_y = text_start_y
-                draw.text((name_x, name_y), name_text, font=font_large, fill=(0, 0, 0))
-                print(f"✓ 이름 추가: '{name_text}' at ({name_x}, {name_y})")
-                
-                # 학번 (중앙 정렬)
-                id_text = student_data['student_id']
-                bbox = draw.textbbox((0, 0), id_text, font=font_medium)
-                id_width = bbox[2] - bbox[0]
-                id_x = (card_width - id_width) // 2
-                id_y = name_y + self.mm_to_px(8)
-                draw.text((id_x, id_y), id_text, font=font_medium, fill=(0, 0, 0))
-                print(f"✓ 학번 추가: '{id_text}' at ({id_x}, {id_y})")
-                
-                # 학과 (중앙 정렬)
-                if 'department' in student_data:
-                    dept_text = student_data['department']
-                    bbox = draw.textbbox((0, 0), dept_text, font=font_small)
-                    dept_width = bbox[2] - bbox[0]
-                    dept_x = (card_width - dept_width) // 2
-                    dept_y = id_y + self.mm_to_px(6)
-                    draw.text((dept_x, dept_y), dept_text, font=font_small, fill=(0, 0, 0))
-                    print(f"✓ 학과 추가: '{dept_text}' at ({dept_x}, {dept_y})")
-                
-                # 학년 (중앙 정렬)
-                if 'grade' in student_data:
-                    grade_text = student_data['grade']
-                    bbox = draw.textbbox((0, 0), grade_text, font=font_small)
-                    grade_width = bbox[2] - bbox[0]
-                    grade_x = (card_width - grade_width) // 2
-                    grade_y = dept_y + self.mm_to_px(5) if 'department' in student_data else id_y + self.mm_to_px(6)
-                    draw.text((grade_x, grade_y), grade_text, font=font_small, fill=(0, 0, 0))
-                    print(f"✓ 학년 추가: '{grade_text}' at ({grade_x}, {grade_y})")
-                    
-            else:
-                # 가로 방향: 기존 레이아웃
-                text_start_x = self.mm_to_px(40)  # 사진 오른쪽 40mm 지점부터
-                
-                # 이름 (가장 크게, 위쪽)
-                name_x, name_y = text_start_x, self.mm_to_px(15)
-                draw.text((name_x, name_y), student_data['name'], 
-                         font=font_large, fill=(0, 0, 0))
-                print(f"✓ 이름 추가: '{student_data['name']}' at ({name_x}, {name_y})")
-                
-                # 학번
-                id_x, id_y = text_start_x, self.mm_to_px(25)
-                draw.text((id_x, id_y), student_data['student_id'], 
-                         font=font_medium, fill=(0, 0, 0))
-                print(f"✓ 학번 추가: '{student_data['student_id']}' at ({id_x}, {id_y})")
-                
-                # 학과
-                if 'department' in student_data:
-                    dept_x, dept_y = text_start_x, self.mm_to_px(33)
-                    draw.text((dept_x, dept_y), student_data['department'], 
-                             font=font_small, fill=(0, 0, 0))
-                    print(f"✓ 학과 추가: '{student_data['department']}' at ({dept_x}, {dept_y})")
-                
-                # 학년 (있는 경우)
-                if 'grade' in student_data:
-                    grade_x, grade_y = text_start_x, self.mm_to_px(40)
-                    draw.text((grade_x, grade_y), student_data['grade'], 
-                             font=font_small, fill=(0, 0, 0))
-                    print(f"✓ 학년 추가: '{student_data['grade']}' at ({grade_x}, {grade_y})")
-            
-            # 학교명 (하단 중앙)
-            if 'school_name' in student_data:
-                school_name = student_data['school_name']
-                # 텍스트 크기 측정
-                bbox = draw.textbbox((0, 0), school_name, font=font_medium)
-                text_width = bbox[2] - bbox[0]
-                school_x = (card_width - text_width) // 2  # 중앙 정렬
-                school_y = card_height - self.mm_to_px(8)  # 하단에서 8mm 위
-                
-                draw.text((school_x, school_y), school_name, 
-                         font=font_medium, fill=(0, 0, 100))  # 진한 파란색
-                print(f"✓ 학교명 추가: '{school_name}' at ({school_x}, {school_y})")
+            template = self.render_card(template_path, student_data, orientation)
             
             # 출력 폴더 생성
             output_dir = os.path.dirname(output_path)
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
             
-            # 이미지 저장
+            # 이미지 저장 후 카드 캔버스 반납 (일괄 생성 시 다음 카드에서 재사용)
             template.save(output_path, 'PNG', dpi=(self.DPI, self.DPI))
+            self.release_card(template)
+            stage.lap('save')
+            if cache_key:
+                self.render_cache.store(cache_key, output_path)
+                stage.lap('cache_store')
             print(f"✅ 학생증 생성 완료: {output_path}")
             print(f"   실제 크기: {self.CARD_WIDTH_MM}mm x {self.CARD_HEIGHT_MM}mm")
             
@@ -293,53 +177,236 @@ class PointmanCardPrinter:
             traceback.print_exc()
             return False
     
+    @traced('pointman.render')
+    def render_card(self, template_path, student_data, orientation='portrait', scale=1.0, verbose=True):
+        """
+        학생증 이미지 렌더링 (저장하지 않음)
+        
+        Args:
+            scale: 픽셀 배율 (1.0 = 300 DPI 인쇄용, 미리보기는 1보다 작게)
+            verbose: False면 진행 로그를 출력하지 않음
+        
+        Returns:
+            RGB 모드의 카드 이미지
+        """
+        log = print if verbose else (lambda *args: None)
+        fast_decode = scale < 1.0
+        stage = current_span()   # 단계별 시간 측정 (render_trace)
+        
+        # 방향에 따른 카드 크기 설정
+        if orientation == 'portrait':
+            card_width = int(self.CARD_HEIGHT_PX * scale)  # 세로일 때는 높이가 폭
+            card_height = int(self.CARD_WIDTH_PX * scale)  # 세로일 때는 폭이 높이
+        else:  # landscape
+            card_width = int(self.CARD_WIDTH_PX * scale)
+            card_height = int(self.CARD_HEIGHT_PX * scale)
+        
+        # 템플릿 로드 또는 기본 템플릿 생성
+        if os.path.exists(template_path):
+            # 카드 사이즈로 리사이즈 (캐시된 템플릿 사용)
+            template = load_template_image(template_path, size=(card_width, card_height), fast_decode=fast_decode,
+                                           canvas_pool=self.canvas_pool)
+        else:
+            log("템플릿이 없어서 기본 템플릿을 생성합니다.")
+            template = self.create_vertical_template() if orientation == 'portrait' else self.create_card_template()
+            if fast_decode:
+                template = template.resize((card_width, card_height), Image.Resampling.LANCZOS)
+        stage.lap('template')
+        
+        # 학생 사진 처리
+        if 'photo_path' in student_data and os.path.exists(student_data['photo_path']):
+            # 방향에 따른 사진 크기 및 위치 설정
+            if orientation == 'portrait':
+                # 세로 방향: 사진을 상단 중앙에 배치
+                photo_width = self.mm_to_px(25, scale)   # 25mm
+                photo_height = self.mm_to_px(30, scale)  # 30mm
+                photo_x = (card_width - photo_width) // 2  # 중앙 정렬
+                photo_y = self.mm_to_px(8, scale)   # 상단에서 8mm
+            else:
+                # 가로 방향: 기존 위치
+                photo_width = self.mm_to_px(25, scale)   # 25mm = ~295px
+                photo_height = self.mm_to_px(30, scale)  # 30mm = ~354px
+                photo_x = self.mm_to_px(10, scale)  # 10mm from left
+                photo_y = self.mm_to_px(12, scale)  # 12mm from top
+            
+            # EXIF 방향/ICC 적용 후 RGB로 사진 영역 크기에 맞춤 (정규화 캐시 사용)
+            photo = normalize_photo(student_data['photo_path'], (photo_width, photo_height), MODE_RGB, fast_decode)
+            
+            template.paste(photo, (photo_x, photo_y))
+            photo.close()
+            stage.lap('photo', box=(photo_x, photo_y, photo_width, photo_height))
+        else:
+            log(f"⚠ 사진 파일을 찾을 수 없습니다: {student_data.get('photo_path', 'None')}")
+        
+        # 텍스트 추가 (학교명/학과/학년처럼 반복되는 글자는 캐시된 타일 사용)
+        draw = ImageDraw.Draw(template)
+        
+        # 폰트 설정 (Windows 한글 폰트, 프로세스 전역 캐시)
+        font_large = load_font(max(1, round(36 * scale)))   # 큰 글씨 (이름)
+        font_medium = load_font(max(1, round(28 * scale)))  # 중간 글씨 (학번)
+        font_small = load_font(max(1, round(24 * scale)))   # 작은 글씨 (기타)
+        
+        # 방향에 따른 텍스트 위치 계산
+        if orientation == 'portrait':
+            # 세로 방향: 사진 아래에 텍스트 배치
+            text_start_y = photo_y + photo_height + self.mm_to_px(5, scale)  # 사진 아래 5mm
+            
+            # 이름 (중앙 정렬)
+            name_text = student_data['name']
+            bbox = draw.textbbox((0, 0), name_text, font=font_large)
+            name_width = bbox[2] - bbox[0]
+            name_x = (card_width - name_width) // 2
+            name_y = text_start_y
+            draw_text(template, (name_x, name_y), name_text, font_large, (0, 0, 0))
+            
+            # 학번 (중앙 정렬)
+            id_text = student_data['student_id']
+            bbox = draw.textbbox((0, 0), id_text, font=font_medium)
+            id_width = bbox[2] - bbox[0]
+            id_x = (card_width - id_width) // 2
+            id_y = name_y + self.mm_to_px(8, scale)
+            draw_text(template, (id_x, id_y), id_text, font_medium, (0, 0, 0))
+            
+            # 학과 (중앙 정렬)
+            if 'department' in student_data:
+                dept_text = student_data['department']
+                bbox = draw.textbbox((0, 0), dept_text, font=font_small)
+                dept_width = bbox[2] - bbox[0]
+                dept_x = (card_width - dept_width) // 2
+                dept_y = id_y + self.mm_to_px(6, scale)
+                draw_text(template, (dept_x, dept_y), dept_text, font_small, (0, 0, 0))
+            
+            # 학년 (중앙 정렬)
+            if 'grade' in student_data:
+                grade_text = student_data['grade']
+                bbox = draw.textbbox((0, 0), grade_text, font=font_small)
+                grade_width = bbox[2] - bbox[0]
+                grade_x = (card_width - grade_width) // 2
+                grade_y = dept_y + self.mm_to_px(5, scale) if 'department' in student_data else id_y + self.mm_to_px(6, scale)
+                draw_text(template, (grade_x, grade_y), grade_text, font_small, (0, 0, 0))
+                
+        else:
+            # 가로 방향: 기존 레이아웃
+            text_start_x = self.mm_to_px(40, scale)  # 사진 오른쪽 40mm 지점부터
+            
+            # 이름 (가장 크게, 위쪽)
+            name_x, name_y = text_start_x, self.mm_to_px(15, scale)
+            draw_text(template, (name_x, name_y), student_data['name'], font_large, (0, 0, 0))
+            
+            # 학번
+            id_x, id_y = text_start_x, self.mm_to_px(25, scale)
+            draw_text(template, (id_x, id_y), student_data['student_id'], font_medium, (0, 0, 0))
+            
+            # 학과
+            if 'department' in student_data:
+                dept_x, dept_y = text_start_x, self.mm_to_px(33, scale)
+                draw_text(template, (dept_x, dept_y), student_data['department'], font_small, (0, 0, 0))
+            
+            # 학년 (있는 경우)
+            if 'grade' in student_data:
+                grade_x, grade_y = text_start_x, self.mm_to_px(40, scale)
+                draw_text(template, (grade_x, grade_y), student_data['grade'], font_small, (0, 0, 0))
+        
+        # 학교명 (하단 중앙)
+        if 'school_name' in student_data:
+            school_name = student_data['school_name']
+            # 텍스트 크기 측정
+            bbox = draw.textbbox((0, 0), school_name, font=font_medium)
+            text_width = bbox[2] - bbox[0]
+            school_x = (card_width - text_width) // 2  # 중앙 정렬
+            school_y = card_height - self.mm_to_px(8, scale)  # 하단에서 8mm 위
+            
+            draw_text(template, (school_x, school_y), school_name, font_medium, (0, 0, 100))  # 진한 파란색
+        
+        stage.lap('text')
+        return template
+    
+    def release_card(self, card):
+        """다 쓴 카드 이미지 정리 (캔버스 풀이 있으면 반납, 없으면 바로 해제)"""
+        if self.canvas_pool is not None:
+            self.canvas_pool.release(card)
+        else:
+            card.close()
+    
+    def render_preview(self, template_path, student_data, orientation='portrait', max_size=300):
+        """
+        미리보기 해상도로 바로 렌더링 (300 DPI 카드를 만든 뒤 축소하지 않음)
+        
+        Args:
+            max_size: 카드 긴 변의 픽셀 크기
+        """
+        scale = min(max_size / self.CARD_WIDTH_PX, 1.0)
+        return self.render_card(template_path, student_data, orientation, scale=scale, verbose=False)
+    
     def print_card(self, image_path):
         """카드 프린터로 출력"""
-        if not self.serial_conn:
+        if not self.connection:
             print("프린터가 연결되지 않았습니다.")
             return False
         
         try:
             print("🖨️ 프린터로 전송 중...")
-            
-            # 프린터 초기화
-            self.serial_conn.write(b'\x1B\x40')  # ESC @
-            time.sleep(0.5)
-            
-            # 프린터 상태 확인
-            self.serial_conn.write(b'\x1B\x76')  # 상태 확인
-            response = self.serial_conn.read(10)
-            print(f"프린터 응답: {response.hex() if response else 'No response'}")
-            
-            # 실제 이미지 전송 로직은 프린터 매뉴얼에 따라 구현 필요
-            # 여기서는 기본적인 명령어만 예시
-            
-            print("✅ 프린터 전송 완료")
-            return True
+            # 기본: 초기화 + 상태 확인 / raster: 패널 변환 → 조각 전송(ACK 확인) → 인쇄 완료까지 상태 확인
+            with self.connection.acquire() as conn:
+                return send_card(conn, image_path, self.transfer_mode, flow_control=self.flow_control,
+                                 compression=self.compression)
             
         except Exception as e:
             print(f"❌ 프린터 전송 실패: {e}")
             return False
     
-    def batch_create_cards(self, template_path, students_data, output_folder):
-        """여러 학생증 일괄 생성"""
+    @staticmethod
+    def batch_output_path(output_folder, student):
+        """일괄 생성 시 학생별 출력 파일 경로"""
+        return os.path.join(output_folder, f"{student['student_id']}_학생증.png")
+    
+    def batch_create_cards(self, template_path, students_data, output_folder, workers=1,
+                           memory_limit_mb=None, memory_log_every=0):
+        """
+        여러 학생증 일괄 생성
+        
+        Args:
+            workers: 2 이상이면 프로세스 풀로 병렬 생성 (None이면 CPU 코어 수)
+            memory_limit_mb: 메모리 상한 (MB) - 넘으면 캐시를 비우고, 병렬 생성에서는 새 카드 투입을 늦춤
+            memory_log_every: N장마다 최대 메모리 로그 (0이면 기록하지 않음)
+        """
+        if workers != 1:
+            from batch_renderer import run_batch
+            success_count, _ = run_batch('pointman', template_path, students_data, output_folder, workers=workers,
+                                         memory_limit_mb=memory_limit_mb, memory_log_every=memory_log_every)
+            return success_count
+        
+        # 카드 캔버스를 재사용하며 한 장씩 생성 (메모리 상한을 넘으면 캐시 정리)
+        canvas_pool = CanvasPool()
+        canvas_pool.preallocate()   # 세로 638x1016 / 가로 1016x638
+        governor = MemoryGovernor(memory_limit_mb, memory_log_every, canvas_pool)
+        previous_pool, self.canvas_pool = self.canvas_pool, canvas_pool
         success_count = 0
         
-        for i, student in enumerate(students_data, 1):
-            print(f"\n[{i}/{len(students_data)}] {student['name']} 학생증 생성 중...")
-            
-            output_path = os.path.join(output_folder, f"{student['student_id']}_학생증.png")
-            
-            if self.create_student_card(template_path, student, output_path):
-                success_count += 1
+        try:
+            for i, student in enumerate(students_data, 1):
+                if not governor.admit() and self.canvas_pool is not None:
+                    # 캐시를 비워도 상한 초과: 한 장씩 생성하므로 투입을 더 늦출 수 없어 캔버스 보관을 멈춤
+                    print("⚠️ 캐시 정리 후에도 메모리 상한 초과 - 남은 카드는 캔버스를 재사용하지 않고 생성")
+                    self.canvas_pool = None
+                print(f"\n[{i}/{len(students_data)}] {student['name']} 학생증 생성 중...")
+                
+                output_path = self.batch_output_path(output_folder, student)
+                
+                if self.create_student_card(template_path, student, output_path):
+                    success_count += 1
+                governor.card_done(i, len(students_data))
+        finally:
+            self.canvas_pool = previous_pool
+            canvas_pool.clear()
             
         print(f"\n📊 완료: {success_count}/{len(students_data)} 개 성공")
         return success_count
     
     def disconnect(self):
-        """프린터 연결 해제"""
-        if self.serial_conn and self.serial_conn.is_open:
-            self.serial_conn.close()
+        """프린터 연결 해제 (공유 포트는 다른 창/작업을 위해 열어 둠 - 종료 시 close_all_connections)"""
+        if self.connection:
+            self.connection = None
             print("🔌 프린터 연결 해제")
 
 # 사용 예시 및 테스트
@@ -394,7 +461,7 @@ if __name__ == "__main__":
             print(f"\n🖨️ 프린터 연결 시도: {available_ports[0]}")
             printer.com_port = available_ports[0]
             if printer.connect_printer():
-                # 실제 출력 (프로토콜 구현 필요)
+                # 실제 출력 (주석 해제해서 사용)
                 # printer.print_card(os.path.join(output_folder, 'sample_card.png'))
                 pass
     
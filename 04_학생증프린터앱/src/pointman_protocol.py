@@ -0,0 +1,630 @@
+"""
+Pointman N20 래스터 전송 프로토콜
+- 카드 이미지를 프린터 패널 데이터(Y/M/C 8비트 + K 1비트)로 변환
+- 프린터가 지원하면 패널을 RLE/델타 행 방식으로 압축 (panel_codec)
+- 패널 데이터를 일정 크기 조각(프레임)으로 나눠 순번/체크섬과 함께 전송
+- 프린터의 ACK/NAK 응답으로 슬라이딩 윈도우 재전송 (go-back-N)
+- XON/XOFF(소프트웨어) 또는 RTS/CTS(하드웨어) 흐름 제어
+- 고정 sleep 대신 상태 명령(ESC v) 응답을 보고 준비될 때까지 대기
+
+※ 프레임 형식과 ESC @ / ESC v 이외의 명령은 N20 매뉴얼로 확인하지 않은 것이므로 래스터 전송은
+  transfer_mode='raster'로 명시적으로 켤 때만 사용 (기본은 초기화 + 상태 확인만 하는 'status')
+
+프레임 형식: ESC, 종류(1), 순번(1, 0~127), 길이(2, 빅엔디언), 데이터, 체크섬(데이터 합 & 0xFF)
+프린터 응답: ACK (0x80|순번) / NAK (0x80|순번) / 상태 바이트(ESC v에 대한 응답)
+(응답 순번에 최상위 비트를 켜서 XON/XOFF 문자와 겹치지 않게 함)
+"""
+
+import os
+import sys
+import time
+import threading
+from PIL import Image, ImageChops
+from panel_codec import COMPRESSION_NONE, compression_codes, decode, encode_best, estimate_transfer_seconds, format_seconds
+
+ESC = 0x1B
+ACK = 0x06
+NAK = 0x15
+XON = 0x11
+XOFF = 0x13
+
+CMD_INIT = b'\x1B\x40'     # ESC @ - 프린터 초기화
+CMD_STATUS = b'\x1B\x76'   # ESC v - 상태 확인
+
+TRANSFER_STATUS = 'status'   # ESC @ 초기화 + ESC v 상태 확인만 (기본값, 매뉴얼로 확인된 명령)
+TRANSFER_RASTER = 'raster'   # 패널 프레임 전송 (N20 매뉴얼로 확인하기 전까지는 명시적으로 켤 때만)
+TRANSFER_MODES = (TRANSFER_STATUS, TRANSFER_RASTER)
+
+FRAME_PANEL = b'H'   # 패널 헤더: 코드(1), 폭(2), 높이(2), 비트 수(1), 압축 방식(1), 데이터 길이(4)
+FRAME_DATA = b'D'    # 패널 데이터 조각
+FRAME_PRINT = b'E'   # 카드 한 장 전송 끝 → 인쇄/배출
+
+# 상태 바이트 비트
+STATUS_BUSY = 0x01
+STATUS_NO_CARD = 0x02
+STATUS_NO_RIBBON = 0x04
+STATUS_ERROR = 0x08
+
+STATUS_MESSAGES = {
+    STATUS_NO_CARD: "카드가 없습니다",
+    STATUS_NO_RIBBON: "리본이 없습니다",
+    STATUS_ERROR: "프린터 오류",
+}
+
+# 인쇄 헤드 기준 카드 크기 (300 DPI, 가로 방향)
+PRINT_WIDTH_PX = 1016
+PRINT_HEIGHT_PX = 638
+
+# 이보다 어두운 픽셀은 K(레진 검정) 패널로 인쇄
+K_THRESHOLD = 40
+
+FLOW_NONE = 'none'
+FLOW_SOFTWARE = 'xonxoff'   # 프린터가 보내는 XOFF/XON을 프로토콜에서 처리
+FLOW_HARDWARE = 'rtscts'    # 시리얼 드라이버의 RTS/CTS
+
+SEQ_MASK = 0x7F
+REPLY_SEQ_BIT = 0x80
+
+DEFAULT_CHUNK_SIZE = 1024
+DEFAULT_WINDOW = 4
+DEFAULT_COMPRESSION = ('rle', 'delta')   # 프린터가 지원하는 압축 방식
+
+
+class PrinterProtocolError(Exception):
+    """프린터 전송 실패 (응답 없음, 재전송 초과, 프린터 오류 상태)"""
+
+
+def status_text(status):
+    """상태 바이트 → 사람이 읽을 수 있는 문구"""
+    if status is None:
+        return "응답 없음"
+    messages = [message for bit, message in STATUS_MESSAGES.items() if status & bit]
+    if messages:
+        return ", ".join(messages)
+    return "인쇄 중" if status & STATUS_BUSY else "준비됨"
+
+
+class RasterPanel:
+    """프린터 패널 하나 (Y/M/C/K)"""
+
+    def __init__(self, code, width, height, bits, data, compression=COMPRESSION_NONE):
+        self.code = code
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.data = data
+        self.compression = compression
+
+    @property
+    def row_bytes(self):
+        return (self.width * self.bits + 7) // 8
+
+    @property
+    def raw_length(self):
+        """압축 전 데이터 크기"""
+        return self.row_bytes * self.height
+
+    def header(self):
+        return (self.code.encode('ascii')
+                + self.width.to_bytes(2, 'big') + self.height.to_bytes(2, 'big')
+                + bytes([self.bits, self.compression])
+                + len(self.data).to_bytes(4, 'big'))
+
+    def __repr__(self):
+        return f"RasterPanel({self.code}, {self.width}x{self.height}, {self.bits}bit, {len(self.data):,} bytes)"
+
+
+def pack_panels(image_or_path):
+    """
+    카드 이미지를 프린터 패널로 변환
+
+    세로 카드는 인쇄 헤드 방향(가로)으로 돌리고, 크기가 다르면 인쇄 크기로 맞춥니다.
+
+    Returns:
+        [RasterPanel Y, M, C, K]
+    """
+    if isinstance(image_or_path, Image.Image):
+        image = image_or_path
+    else:
+        with Image.open(image_or_path) as opened:
+            image = opened.copy()
+
+    if image.mode != 'RGB':
+        if 'A' in image.getbands() or 'transparency' in image.info:
+            # 투명 부분은 인쇄하지 않음(흰색)
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, 'white')
+            image.paste(rgba, mask=rgba.getchannel('A'))
+        else:
+            image = image.convert('RGB')
+
+    if image.height > image.width:
+        image = image.transpose(Image.Transpose.ROTATE_90)
+    if image.size != (PRINT_WIDTH_PX, PRINT_HEIGHT_PX):
+        image = image.resize((PRINT_WIDTH_PX, PRINT_HEIGHT_PX), Image.Resampling.LANCZOS)
+
+    # 잉크 농도 = 255 - RGB (C = 255 - R, M = 255 - G, Y = 255 - B)
+    cyan, magenta, yellow = ImageChops.invert(image).split()
+    black = image.convert('L').point(lambda v: 255 if v < K_THRESHOLD else 0).convert('1')
+
+    width, height = image.size
+    return [
+        RasterPanel('Y', width, height, 8, yellow.tobytes()),
+        RasterPanel('M', width, height, 8, magenta.tobytes()),
+        RasterPanel('C', width, height, 8, cyan.tobytes()),
+        RasterPanel('K', width, height, 1, black.tobytes()),
+    ]
+
+
+def compress_panels(panels, methods):
+    """
+    패널마다 허용된 압축 방식 중 가장 작은 결과로 변환
+
+    Args:
+        methods: 프린터가 지원하는 압축 방식 ('rle', 'delta' 또는 코드) - 비어 있으면 압축하지 않음
+
+    Returns:
+        (압축된 패널 리스트, {'raw_bytes', 'encoded_bytes', 'ratio'})
+    """
+    encoded_panels = []
+    for panel in panels:
+        method, data = encode_best(panel.data, panel.row_bytes, methods)
+        encoded_panels.append(RasterPanel(panel.code, panel.width, panel.height, panel.bits, data, method))
+
+    raw_bytes = sum(panel.raw_length for panel in panels)
+    encoded_bytes = sum(len(panel.data) for panel in encoded_panels)
+    stats = {
+        'raw_bytes': raw_bytes,
+        'encoded_bytes': encoded_bytes,
+        'ratio': raw_bytes / encoded_bytes if encoded_bytes else 1.0,
+    }
+    return encoded_panels, stats
+
+
+def build_frame(kind, seq, payload):
+    """프레임 바이트 생성"""
+    return (bytes([ESC]) + kind + bytes([seq & SEQ_MASK]) + len(payload).to_bytes(2, 'big')
+            + bytes(payload) + bytes([sum(payload) & 0xFF]))
+
+
+class PointmanRasterProtocol:
+    """열린 시리얼 연결 위에서 카드 한 장을 전송하는 래스터 프로토콜"""
+
+    def __init__(self, conn, chunk_size=DEFAULT_CHUNK_SIZE, window=DEFAULT_WINDOW,
+                 flow_control=FLOW_SOFTWARE, compression=DEFAULT_COMPRESSION, ack_timeout=2.0, max_retries=5,
+                 ready_timeout=60.0, poll_interval=0.05):
+        """
+        Args:
+            conn: pyserial 연결 (serial.Serial / serial_for_url)
+            chunk_size: 데이터 프레임 하나의 최대 크기 (최대 65535)
+            window: ACK를 기다리지 않고 연속으로 보낼 프레임 수 (1이면 한 프레임씩)
+            flow_control: 'xonxoff' / 'rtscts' / 'none'
+            compression: 프린터가 지원하는 압축 방식 (예: ('rle', 'delta'), 비어 있으면 압축 안 함)
+            ack_timeout: 전송 시간 외에 ACK를 추가로 기다릴 시간(초)
+            max_retries: 진행 없이 연속으로 재전송할 최대 횟수
+            ready_timeout: 초기화/인쇄 후 준비 상태를 기다릴 최대 시간(초)
+            poll_interval: 인쇄 중일 때 상태 확인 간격(초)
+        """
+        if not 1 <= window < 64:
+            raise ValueError("window는 1~63 사이여야 합니다")
+        self.conn = conn
+        self.chunk_size = min(chunk_size, 0xFFFF)
+        self.window = window
+        self.flow_control = flow_control
+        self.compression = compression_codes(compression)
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+
+        # 1바이트 전송 시간 (시작/정지 비트 포함 10비트)
+        self.baudrate = getattr(conn, 'baudrate', None) or 9600
+        self.byte_seconds = 10.0 / self.baudrate
+        self._paused = False
+        self._unread = []   # XON을 기다리는 동안 받은 응답 바이트
+        self.stats = {}
+
+    # ----- 응답 읽기 -----
+
+    def _read_byte(self, deadline):
+        """deadline까지 1바이트 읽기 (XOFF 중에는 XON까지 기다림) → 바이트 값 또는 None"""
+        if self._unread:
+            return self._unread.pop(0)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.conn.timeout = min(remaining, 0.5)
+            data = self.conn.read(1)
+            if not data:
+                continue
+            value = data[0]
+            if self.flow_control == FLOW_SOFTWARE and value in (XON, XOFF):
+                self._paused = value == XOFF
+                if self._paused:
+                    self.stats['pauses'] = self.stats.get('pauses', 0) + 1
+                    # 수신 버퍼를 비울 때까지 전송 시간만큼 기다려 줌
+                    deadline = max(deadline, time.monotonic() + self.ready_timeout)
+                continue
+            return value
+
+    def _wait_resume(self, deadline):
+        """XOFF를 받았으면 XON이 올 때까지 대기"""
+        while self._paused:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PrinterProtocolError("프린터가 전송 재개(XON)를 보내지 않습니다")
+            self.conn.timeout = min(remaining, 0.5)
+            data = self.conn.read(1)
+            if not data:
+                continue
+            if data[0] == XON:
+                self._paused = False
+            elif data[0] != XOFF:
+                self._unread.append(data[0])
+
+    def _read_reply(self, timeout):
+        """ACK/NAK 응답 읽기 → (ACK 또는 NAK, 순번) / 시간 초과 시 (None, None)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            value = self._read_byte(deadline)
+            if value is None:
+                return None, None
+            if value in (ACK, NAK):
+                seq = self._read_byte(deadline)
+                if seq is None or not seq & REPLY_SEQ_BIT:
+                    return None, None
+                return value, seq & SEQ_MASK
+            # 그 밖의 바이트(지연된 상태 응답 등)는 무시
+
+    # ----- 상태 -----
+
+    def read_status(self, timeout=None):
+        """ESC v로 상태 바이트 조회 → 상태 값 또는 None(응답 없음)"""
+        self.conn.reset_input_buffer()
+        self.conn.write(CMD_STATUS)
+        self.conn.flush()
+        return self._read_byte(time.monotonic() + (timeout or self.ack_timeout))
+
+    def wait_ready(self, timeout=None):
+        """
+        프린터가 준비될 때까지 상태를 확인하며 대기 (고정 sleep 없음)
+
+        Returns:
+            마지막 상태 값
+        """
+        deadline = time.monotonic() + (timeout or self.ready_timeout)
+        while True:
+            status = self.read_status()
+            if status is not None:
+                if status & (STATUS_NO_CARD | STATUS_NO_RIBBON | STATUS_ERROR):
+                    raise PrinterProtocolError(f"프린터 상태 이상: {status_text(status)}")
+                if not status & STATUS_BUSY:
+                    return status
+            if time.monotonic() >= deadline:
+                raise PrinterProtocolError(f"프린터가 준비되지 않습니다 ({status_text(status)})")
+            time.sleep(self.poll_interval)
+
+    def reset(self):
+        """프린터 초기화 후 준비 상태까지 대기"""
+        self.conn.reset_input_buffer()
+        self.conn.write(CMD_INIT)
+        self.conn.flush()
+        return self.wait_ready()
+
+    # ----- 전송 -----
+
+    def _frames(self, panels):
+        """카드 한 장의 (종류, 데이터) 목록 - 데이터 조각은 복사하지 않고 memoryview로 참조"""
+        frames = []
+        for panel in panels:
+            frames.append((FRAME_PANEL, panel.header()))
+            data = memoryview(panel.data)
+            for start in range(0, len(data), self.chunk_size):
+                frames.append((FRAME_DATA, data[start:start + self.chunk_size]))
+        frames.append((FRAME_PRINT, b''))
+        return frames
+
+    def _send_frames(self, frames):
+        """슬라이딩 윈도우로 프레임 전송 (NAK/시간 초과 시 확인되지 않은 프레임부터 다시 보냄)"""
+        base = 0          # 아직 ACK를 받지 못한 첫 프레임
+        next_index = 0    # 다음에 보낼 프레임
+        retries = 0
+
+        # 윈도우 전체가 링크를 지나가는 시간 + 여유
+        window_seconds = self.window * (self.chunk_size + 6) * self.byte_seconds + self.ack_timeout
+
+        while base < len(frames):
+            while next_index < len(frames) and next_index - base < self.window:
+                self._wait_resume(time.monotonic() + self.ready_timeout)
+                kind, payload = frames[next_index]
+                frame = build_frame(kind, next_index, payload)
+                self.conn.write(frame)
+                self.stats['bytes'] += len(frame)
+                next_index += 1
+
+            reply, seq = self._read_reply(window_seconds)
+            if reply == ACK:
+                # 순번은 7비트이므로 base 기준 거리로 프레임 위치 계산
+                acked = base + ((seq - base) & SEQ_MASK)
+                if acked < next_index:
+                    base = acked + 1
+                    retries = 0
+                continue
+
+            retries += 1
+            self.stats['retries'] += 1
+            if retries > self.max_retries:
+                reason = "NAK" if reply == NAK else "응답 없음"
+                raise PrinterProtocolError(f"프레임 {base} 전송 실패 ({reason}, 재시도 {self.max_retries}회 초과)")
+            self.conn.reset_input_buffer()
+            self._unread = []
+            next_index = base
+
+    def send_card(self, image_or_path, panels=None):
+        """
+        카드 한 장 전송 후 인쇄 완료까지 대기
+
+        Args:
+            image_or_path: 카드 이미지(또는 파일 경로)
+            panels: 미리 변환한 패널 (None이면 pack_panels로 변환)
+
+        Returns:
+            {'bytes', 'frames', 'retries', 'pauses', 'seconds',
+             'raw_bytes', 'encoded_bytes', 'ratio', 'estimated_seconds'} 전송 통계
+        """
+        saved_timeout = self.conn.timeout
+        started = time.monotonic()
+        self.stats = {'bytes': 0, 'frames': 0, 'retries': 0, 'pauses': 0}
+        try:
+            if panels is None:
+                panels = pack_panels(image_or_path)
+            panels, compression_stats = compress_panels(panels, self.compression)
+            self.stats.update(compression_stats)
+            self.stats['estimated_seconds'] = estimate_transfer_seconds(
+                compression_stats['encoded_bytes'], self.baudrate, self.chunk_size)
+            self.reset()
+
+            frames = self._frames(panels)
+            self.stats['frames'] = len(frames)
+            self._send_frames(frames)
+
+            # 인쇄/배출이 끝날 때까지 상태로 확인
+            self.wait_ready()
+        finally:
+            self.conn.timeout = saved_timeout
+
+        self.stats['seconds'] = time.monotonic() - started
+        return self.stats
+
+
+def send_card_image(serial_conn, image_path, **options):
+    """
+    print_card/send_to_printer 공통: 카드 이미지를 전송하고 결과 출력
+
+    Returns:
+        성공 여부
+    """
+    try:
+        protocol = PointmanRasterProtocol(serial_conn, **options)
+        stats = protocol.send_card(image_path)
+        print(f"✅ 프린터 전송 완료 ({stats['bytes']:,} bytes, {stats['seconds']:.1f}초, "
+              f"재전송 {stats['retries']}회, 압축률 {stats['ratio']:.1f}:1, "
+              f"예상 전송 시간 {format_seconds(stats['estimated_seconds'])})")
+        return True
+    except PrinterProtocolError as e:
+        print(f"❌ 프린터 전송 실패: {e}")
+        return False
+
+
+def send_reset_and_status(serial_conn, ready_timeout=1.5, poll_timeout=0.1):
+    """
+    ESC @ 초기화 후 ESC v 상태 응답이 올 때까지 확인 (고정 sleep 없음, 이미지 데이터는 보내지 않음)
+
+    초기화 중인 프린터는 상태 명령에 답하지 않으므로 첫 응답이 오는 순간을 준비 완료로 봅니다.
+    상태 바이트의 비트 의미는 매뉴얼로 확인하지 않았으므로 응답 내용으로는 판단하지 않습니다.
+
+    Args:
+        ready_timeout: 응답을 기다릴 최대 시간(초) - 기존 고정 대기(0.5초 + 읽기 1초)와 같은 상한
+        poll_timeout: ESC v 한 번에 응답을 기다릴 시간(초)
+
+    Returns:
+        성공 여부 (응답이 없어도 명령 전송에 성공하면 True)
+    """
+    serial_conn.reset_input_buffer()
+    serial_conn.write(CMD_INIT)
+    serial_conn.flush()
+
+    deadline = time.monotonic() + ready_timeout
+    response = b''
+    while not response:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        serial_conn.write(CMD_STATUS)
+        serial_conn.flush()
+        serial_conn.timeout = min(poll_timeout, remaining)
+        response = serial_conn.read(1)
+
+    if response:
+        # 응답의 나머지 바이트 (최대 10바이트, 이어서 오는 만큼만)
+        serial_conn.timeout = poll_timeout
+        response += serial_conn.read(9)
+    print(f"프린터 응답: {response.hex() if response else 'No response'}")
+    print("✅ 프린터 전송 완료")
+    return True
+
+
+def send_card(serial_conn, image_path, transfer_mode=TRANSFER_STATUS, **options):
+    """
+    print_card/send_to_printer 공통: 전송 방식에 따라 카드 전송
+
+    Args:
+        transfer_mode: 'status' (초기화 + 상태 확인, 기본) / 'raster' (래스터 패널 전송)
+        options: 래스터 전송 옵션 (PointmanRasterProtocol 인자)
+    """
+    if transfer_mode == TRANSFER_RASTER:
+        return send_card_image(serial_conn, image_path, **options)
+    if transfer_mode != TRANSFER_STATUS:
+        raise ValueError(f"알 수 없는 전송 방식: {transfer_mode} ({', '.join(TRANSFER_MODES)})")
+    return send_reset_and_status(serial_conn)
+
+
+def serial_options(flow_control):
+    """흐름 제어 방식에 맞는 pyserial 옵션"""
+    # 소프트웨어 흐름 제어는 드라이버가 아닌 프로토콜에서 처리 (바이너리 데이터 보호)
+    return {'xonxoff': False, 'rtscts': flow_control == FLOW_HARDWARE}
+
+
+class SimulatedPointmanPrinter:
+    """
+    테스트용 가상 Pointman 프린터 (Linux PTY)
+
+    프린터 쪽 프로토콜을 흉내 내며, 받은 패널을 기록하고 일부 프레임에 NAK를 보낼 수 있습니다.
+    """
+
+    def __init__(self, print_seconds=0.2, nak_every=0, xoff_every=0, status=0):
+        """
+        Args:
+            print_seconds: 인쇄 명령 후 BUSY 상태로 있는 시간
+            nak_every: N번째 프레임마다 한 번 NAK (0이면 사용 안 함)
+            xoff_every: N번째 프레임마다 잠깐 XOFF→XON (0이면 사용 안 함)
+            status: 기본 상태 비트 (예: STATUS_NO_CARD)
+        """
+        import pty
+        import tty
+
+        self.print_seconds = print_seconds
+        self.nak_every = nak_every
+        self.xoff_every = xoff_every
+        self.status = status
+
+        self.master_fd, slave_fd = pty.openpty()
+        tty.setraw(slave_fd)
+        self.port = os.ttyname(slave_fd)
+        self._slave_fd = slave_fd
+
+        self.panels = []        # 받은 패널 [(헤더, 데이터)]
+        self.cards_printed = 0
+        self._busy_until = 0
+        self._frame_count = 0
+        self._expected_seq = 0
+        self._buffer = bytearray()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="pointman-sim")
+        self._thread.start()
+
+    def _write(self, data):
+        os.write(self.master_fd, data)
+
+    def _current_status(self):
+        busy = STATUS_BUSY if time.monotonic() < self._busy_until else 0
+        return self.status | busy
+
+    def _take(self, count):
+        while len(self._buffer) < count:
+            chunk = os.read(self.master_fd, 65536)
+            if not chunk:
+                raise OSError("PTY closed")
+            self._buffer.extend(chunk)
+        data = bytes(self._buffer[:count])
+        del self._buffer[:count]
+        return data
+
+    def _run(self):
+        try:
+            while self._running:
+                if self._take(1)[0] != ESC:
+                    continue
+                command = self._take(1)
+                if command == b'@':
+                    self._expected_seq = 0
+                    self.panels = []
+                elif command == b'v':
+                    self._write(bytes([self._current_status()]))
+                else:
+                    self._receive_frame(command)
+        except OSError:
+            pass  # PTY가 닫힘
+
+    def _receive_frame(self, kind):
+        seq = self._take(1)[0]
+        length = int.from_bytes(self._take(2), 'big')
+        payload = self._take(length)
+        checksum = self._take(1)[0]
+
+        self._frame_count += 1
+        if seq != self._expected_seq & SEQ_MASK:
+            return  # go-back-N: 순서가 어긋난 프레임은 버림 (송신측이 다시 보냄)
+        if checksum != sum(payload) & 0xFF or (self.nak_every and self._frame_count % self.nak_every == 0):
+            self._write(bytes([NAK, REPLY_SEQ_BIT | seq]))
+            return
+
+        self._expected_seq += 1
+        if kind == FRAME_PANEL:
+            self.panels.append((payload, bytearray()))
+        elif kind == FRAME_DATA and self.panels:
+            self.panels[-1][1].extend(payload)
+            self._decode_last_panel()
+        elif kind == FRAME_PRINT:
+            self.cards_printed += 1
+            self._busy_until = time.monotonic() + self.print_seconds
+
+        if self.xoff_every and self._frame_count % self.xoff_every == 0:
+            self._write(bytes([XOFF]))
+            time.sleep(0.01)
+            self._write(bytes([XON]))
+        self._write(bytes([ACK, REPLY_SEQ_BIT | seq]))
+
+    def _decode_last_panel(self):
+        """패널 데이터를 다 받으면 압축을 풀어 원본 데이터로 보관"""
+        header, data = self.panels[-1]
+        if len(data) != int.from_bytes(header[7:11], 'big'):
+            return
+        width, bits, compression = int.from_bytes(header[1:3], 'big'), header[5], header[6]
+        if compression:
+            self.panels[-1] = (header, bytearray(decode(data, compression, (width * bits + 7) // 8)))
+
+    def close(self):
+        self._running = False
+        for fd in (self._slave_fd, self.master_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    import argparse
+    import serial
+
+    parser = argparse.ArgumentParser(description="가상 Pointman 프린터(PTY)로 래스터 전송 시험")
+    parser.add_argument('image', help="카드 이미지 파일")
+    parser.add_argument('--baud', type=int, default=115200, help="통신 속도 (ACK 대기 시간 계산용)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--compression', default=','.join(DEFAULT_COMPRESSION), help="압축 방식 (쉼표 구분, 빈 값이면 압축 안 함)")
+    parser.add_argument('--nak-every', type=int, default=0, help="N번째 프레임마다 NAK (재전송 시험)")
+    parser.add_argument('--xoff-every', type=int, default=0, help="N번째 프레임마다 XOFF (흐름 제어 시험)")
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        print("❌ 가상 프린터는 Linux/macOS(PTY)에서만 사용할 수 있습니다")
+        sys.exit(1)
+
+    printer = SimulatedPointmanPrinter(nak_every=args.nak_every, xoff_every=args.xoff_every)
+    conn = serial.Serial(printer.port, baudrate=args.baud, timeout=2)
+    try:
+        protocol = PointmanRasterProtocol(conn, chunk_size=args.chunk_size, window=args.window,
+                                          compression=[m for m in args.compression.split(',') if m])
+        panels = pack_panels(args.image)
+        stats = protocol.send_card(args.image, panels=panels)
+
+        received_ok = [bytes(data) for _, data in printer.panels] == [panel.data for panel in panels]
+        print(f"📊 {stats['frames']}프레임, {stats['bytes']:,} bytes, {stats['seconds']:.2f}초, "
+              f"재전송 {stats['retries']}회, XOFF {stats['pauses']}회, 압축률 {stats['ratio']:.1f}:1")
+        print(f"{'✅' if received_ok else '❌'} 프린터가 받은 패널 {'일치' if received_ok else '불일치'} "
+              f"(인쇄 {printer.cards_printed}장)")
+    finally:
+        conn.close()
+        printer.close()
@@ -0,0 +1,535 @@
+"""
+인쇄 스풀러
+- 인쇄 작업을 디스크(cache/spool)에 기록하는 영구 대기열 → 프로그램을 다시 켜도 남은 작업 이어서 인쇄
+- 작업 스레드 하나가 대기열을 비우므로 GUI는 인쇄를 기다리지 않음
+- 프린터 백엔드 교체 가능: win32 (Windows 기본 인쇄), shell (pywin32 없는 Windows), pointman (시리얼),
+  directory (테스트용 폴더 출력)
+- ShellExecute 인쇄는 비동기이므로 인쇄 파일은 연결 프로그램이 열 시간(release_delay)이 지난 뒤에 지움
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import threading
+import traceback
+
+SPOOL_DIR = os.path.join("cache", "spool")
+
+STATUS_QUEUED = 'queued'
+STATUS_PRINTING = 'printing'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# ShellExecute "print"는 연결 프로그램을 띄우고 바로 반환 → 그 프로그램이 파일을 열 때까지 남겨 둘 시간 (초)
+SHELL_PRINT_RELEASE_DELAY = 60
+
+# 실패한 작업의 기록과 인쇄 파일을 원인 확인용으로 남겨 둘 기간 (초)
+FAILED_JOB_RETENTION = 7 * 24 * 60 * 60
+
+# 인쇄 중에 프로그램이 종료된 작업 (카드가 이미 나왔을 수 있으므로 자동으로 다시 인쇄하지 않음)
+INTERRUPTED_ERROR = "인쇄 중에 프로그램이 종료됨 - 카드가 나왔는지 확인한 뒤 필요하면 다시 인쇄하세요"
+
+# ShellExecute 오류 코드 설명
+SHELL_EXECUTE_ERRORS = {
+    0: "시스템에 메모리나 리소스가 부족합니다",
+    2: "파일을 찾을 수 없습니다",
+    3: "경로를 찾을 수 없습니다",
+    5: "액세스가 거부되었습니다",
+    8: "메모리가 부족합니다",
+    26: "공유 위반이 발생했습니다",
+    27: "파일 이름 연결이 완전하지 않거나 잘못되었습니다",
+    30: "함수가 지원되지 않습니다",
+    31: "네트워크 연결이 없습니다",
+}
+
+
+class PrintBackendError(Exception):
+    """프린터 백엔드 전송 실패"""
+
+
+class PrintJob:
+    """인쇄 작업 하나 (스풀 폴더에 JSON으로 저장)"""
+
+    def __init__(self, job_id, image_path, source_path="", copies=1, description="",
+                 status=STATUS_QUEUED, attempts=0, error=None, printer=None, created_at=None, finished_at=None):
+        self.job_id = job_id
+        self.image_path = image_path      # 스풀 폴더로 복사된 인쇄 파일
+        self.source_path = source_path    # 원래 파일 경로 (안내용)
+        self.copies = copies
+        self.description = description
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+        self.printer = printer            # 실제로 인쇄한 프린터 (백엔드가 기록)
+        self.created_at = created_at or time.time()
+        self.finished_at = finished_at
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return f"PrintJob({self.job_id}, {self.status}, {os.path.basename(self.source_path)})"
+
+
+class DirectorySinkBackend:
+    """테스트용 백엔드: 인쇄 대신 폴더(또는 PTY 같은 장치 파일)에 기록"""
+
+    name = 'directory'
+    release_delay = 0      # 인쇄가 끝난 뒤 인쇄 파일을 남겨 둘 시간 (초)
+
+    def __init__(self, directory="spool_output"):
+        self.directory = directory
+
+    def print_job(self, job):
+        job.printer = self.directory
+        if os.path.isdir(self.directory) or not os.path.exists(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+            for copy in range(job.copies):
+                suffix = f"_{copy + 1}" if job.copies > 1 else ""
+                name, ext = os.path.splitext(os.path.basename(job.source_path or job.image_path))
+                shutil.copyfile(job.image_path, os.path.join(self.directory, f"{job.job_id}_{name}{suffix}{ext}"))
+        else:
+            # 장치 파일 (예: /dev/pts/N)에는 파일 내용을 그대로 씀
+            with open(job.image_path, 'rb') as src, open(self.directory, 'wb') as dst:
+                data = src.read()
+                for _ in range(job.copies):
+                    dst.write(data)
+
+    def close(self):
+        pass
+
+
+class Win32PrintBackend:
+    """Windows 기본(또는 지정) 프린터로 ShellExecute 인쇄"""
+
+    name = 'win32'
+    release_delay = SHELL_PRINT_RELEASE_DELAY
+
+    def __init__(self, printer_name=None):
+        import win32api  # pywin32가 없으면 ImportError
+        import win32print
+        self._win32api = win32api
+        self._win32print = win32print
+        self.printer_name = printer_name
+
+    def print_job(self, job):
+        printer_name = self.printer_name
+        if not printer_name:
+            try:
+                printer_name = self._win32print.GetDefaultPrinter()
+            except Exception as e:
+                raise PrintBackendError(f"기본 프린터를 찾을 수 없습니다: {e}")
+        job.printer = printer_name
+
+        params = f'/d:"{printer_name}"'
+        for _ in range(job.copies):
+            result = self._win32api.ShellExecute(0, "print", os.path.abspath(job.image_path), params, ".", 0)
+            if result <= 32:
+                message = SHELL_EXECUTE_ERRORS.get(result, "알 수 없는 오류")
+                raise PrintBackendError(f"인쇄 실패: {message} (코드: {result})")
+
+    def close(self):
+        pass
+
+
+class ShellPrintBackend:
+    """pywin32가 없는 Windows: os.startfile(path, "print")로 기본 프린터 인쇄"""
+
+    name = 'shell'
+    release_delay = SHELL_PRINT_RELEASE_DELAY
+
+    def __init__(self):
+        if not hasattr(os, 'startfile'):
+            raise OSError("os.startfile 인쇄는 Windows에서만 쓸 수 있습니다")
+
+    def print_job(self, job):
+        job.printer = "기본 프린터"
+        for _ in range(job.copies):
+            try:
+                os.startfile(os.path.abspath(job.image_path), "print")
+            except OSError as e:
+                raise PrintBackendError(f"인쇄 실패: {e}")
+
+    def close(self):
+        pass
+
+
+class PointmanSerialBackend:
+    """Pointman N20 시리얼 프린터로 직접 전송"""
+
+    name = 'pointman'
+    release_delay = 0
+
+    def __init__(self, com_port='COM3', baud_rate=9600, transfer_mode=None):
+        """
+        Args:
+            transfer_mode: 'raster'면 래스터 패널 전송 (기본: 초기화 + 상태 확인만)
+        """
+        from pointman_card_printer import PointmanCardPrinter
+        from pointman_protocol import TRANSFER_STATUS
+        self.printer = PointmanCardPrinter(com_port=com_port, baud_rate=baud_rate,
+                                           transfer_mode=transfer_mode or TRANSFER_STATUS)
+
+    def print_job(self, job):
+        job.printer = self.printer.com_port
+        if not self.printer.connection and not self.printer.connect_printer():
+            raise PrintBackendError(f"프린터 연결 실패: {self.printer.com_port}")
+        for _ in range(job.copies):
+            if not self.printer.print_card(job.image_path):
+                raise PrintBackendError("프린터 전송 실패")
+
+    def close(self):
+        self.printer.disconnect()
+
+
+BACKENDS = {
+    DirectorySinkBackend.name: DirectorySinkBackend,
+    Win32PrintBackend.name: Win32PrintBackend,
+    ShellPrintBackend.name: ShellPrintBackend,
+    PointmanSerialBackend.name: PointmanSerialBackend,
+}
+
+
+def create_backend(name=None, **options):
+    """
+    이름으로 백엔드 생성 (None이면 Windows는 win32 - pywin32가 없으면 shell, 그 외는 directory)
+    """
+    if name is None and sys.platform == 'win32':
+        try:
+            return Win32PrintBackend(**options)
+        except ImportError:
+            print("⚠️ pywin32가 없어 기본 프린터로만 인쇄합니다 (pip install pywin32)")
+            return ShellPrintBackend()
+    if name is None:
+        name = 'directory'
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 프린터 백엔드: {name} ({', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
+
+
+class PrintSpooler:
+    """영구 대기열 + 작업 스레드 인쇄 스풀러"""
+
+    def __init__(self, backend=None, spool_dir=SPOOL_DIR, max_attempts=1, keep_done=False,
+                 failed_retention=FAILED_JOB_RETENTION):
+        """
+        Args:
+            backend: 프린터 백엔드 (None이면 create_backend())
+            spool_dir: 작업 JSON/인쇄 파일을 보관할 폴더
+            max_attempts: 작업당 최대 시도 횟수
+            keep_done: True면 완료된 작업 기록을 지우지 않음
+            failed_retention: 실패한 작업 기록을 남겨 둘 기간(초) - 지나면 다음 실행 때 삭제
+        """
+        self.backend = backend or create_backend()
+        self.spool_dir = spool_dir
+        self.max_attempts = max_attempts
+        self.keep_done = keep_done
+        self.failed_retention = failed_retention
+
+        self._jobs_dir = os.path.join(spool_dir, "jobs")
+        self._data_dir = os.path.join(spool_dir, "data")
+        os.makedirs(self._jobs_dir, exist_ok=True)
+        os.makedirs(self._data_dir, exist_ok=True)
+
+        self._queue = []                # 대기 중인 PrintJob (제출 순서)
+        self._callbacks = {}            # job_id → on_done(job)
+        self._listeners = []
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._busy = False
+        self._stats = {'submitted': 0, 'done': 0, 'failed': 0, 'busy_seconds': 0.0, 'started_at': time.time()}
+
+        self._release_timers = []       # 인쇄 파일을 늦게 지우는 타이머 (release_delay)
+
+        self._restore_jobs()
+        self._worker = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+        self._worker.start()
+
+    # --- 대기열 ---
+
+    def _job_file(self, job_id):
+        return os.path.join(self._jobs_dir, f"{job_id}.json")
+
+    def _save_job(self, job):
+        temp_path = self._job_file(job.job_id) + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(job.to_dict(), f, ensure_ascii=False)
+        os.replace(temp_path, self._job_file(job.job_id))
+
+    def _restore_jobs(self):
+        """
+        이전 실행에서 끝나지 않은 작업을 대기열로 복구
+
+        - 대기 중이던 작업만 다시 인쇄 (인쇄 중이던 작업은 중복 인쇄를 막기 위해 실패로 기록)
+        - 지우기를 미뤄 둔 완료 작업과 보관 기간이 지난 실패 작업은 정리
+        """
+        restored = []
+        interrupted = 0
+        purged = 0
+        now = time.time()
+        for filename in os.listdir(self._jobs_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self._jobs_dir, filename), 'r', encoding='utf-8') as f:
+                    job = PrintJob.from_dict(json.load(f))
+            except (OSError, ValueError, TypeError) as e:
+                print(f"⚠️ 스풀 작업 파일을 읽을 수 없습니다: {filename} ({e})")
+                continue
+            if job.status == STATUS_QUEUED and os.path.exists(job.image_path):
+                restored.append(job)
+            elif job.status == STATUS_PRINTING:
+                job.status = STATUS_FAILED
+                job.error = INTERRUPTED_ERROR
+                job.finished_at = now
+                self._save_job(job)
+                interrupted += 1
+                print(f"⚠️ {job.job_id} ({job.description or job.source_path or job.image_path}): {INTERRUPTED_ERROR}")
+            elif job.status == STATUS_DONE and not self.keep_done and self._release_due(job):
+                self._discard(job)
+                purged += 1
+            elif job.status == STATUS_FAILED and now - (job.finished_at or job.created_at) >= self.failed_retention:
+                self._discard(job)
+                purged += 1
+            elif job.status == STATUS_QUEUED:
+                self._discard(job)   # 인쇄 파일이 없어진 작업
+                purged += 1
+
+        restored.sort(key=lambda job: job.created_at)
+        self._queue.extend(restored)
+        if restored:
+            print(f"✓ 남은 인쇄 작업 {len(restored)}개 복구")
+        if interrupted:
+            print(f"⚠️ 인쇄 중에 중단된 작업 {interrupted}개는 다시 인쇄하지 않고 실패로 기록했습니다")
+        if purged:
+            print(f"✓ 끝난 인쇄 작업 {purged}개 정리")
+
+    def _release_due(self, job):
+        """완료된 작업의 인쇄 파일을 지워도 되는지 (연결 프로그램이 열 시간이 지났는지)"""
+        delay = max(getattr(self.backend, 'release_delay', 0), SHELL_PRINT_RELEASE_DELAY)
+        return time.time() - (job.finished_at or job.created_at) >= delay
+
+    def submit(self, image_path, copies=1, description="", on_done=None):
+        """
+        인쇄 작업 제출 (기다리지 않고 바로 반환)
+
+        인쇄 파일은 스풀 폴더로 복사되므로 호출자는 원본(임시 파일 등)을 바로 지워도 됩니다.
+
+        Args:
+            on_done: on_done(job) - 작업이 끝나면(성공/실패) 스풀러 스레드에서 호출
+
+        Returns:
+            PrintJob
+        """
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"인쇄할 파일이 없습니다: {image_path}")
+
+        job_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        spooled_path = os.path.join(self._data_dir, job_id + os.path.splitext(image_path)[1])
+        shutil.copyfile(image_path, spooled_path)
+
+        job = PrintJob(job_id, spooled_path, source_path=image_path, copies=copies, description=description)
+        self._save_job(job)
+
+        with self._condition:
+            if on_done:
+                self._callbacks[job_id] = on_done
+            self._queue.append(job)
+            self._stats['submitted'] += 1
+            self._condition.notify()
+        return job
+
+    def add_listener(self, listener):
+        """모든 작업 완료 시 listener(job) 호출 (스풀러 스레드에서)"""
+        self._listeners.append(listener)
+
+    def pending_count(self):
+        """대기 중이거나 인쇄 중인 작업 수"""
+        with self._condition:
+            return len(self._queue) + (1 if self._busy else 0)
+
+    def pending_jobs(self):
+        with self._condition:
+            return list(self._queue)
+
+    def cancel(self, job_id):
+        """아직 인쇄하지 않은 작업 취소 → 성공 여부"""
+        with self._condition:
+            for job in self._queue:
+                if job.job_id == job_id:
+                    self._queue.remove(job)
+                    self._callbacks.pop(job_id, None)
+                    break
+            else:
+                return False
+        self._discard(job)
+        return True
+
+    def wait_idle(self, timeout=None):
+        """대기열이 빌 때까지 기다림 → 비었으면 True"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stats(self):
+        """처리량 통계 (완료 수, 실패 수, 카드당 평균 인쇄 시간, 분당 처리량)"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._queue) + (1 if self._busy else 0)
+        finished = stats['done'] + stats['failed']
+        stats['seconds_per_job'] = stats['busy_seconds'] / finished if finished else 0.0
+        stats['jobs_per_minute'] = 60.0 / stats['seconds_per_job'] if stats['seconds_per_job'] else 0.0
+        return stats
+
+    def shutdown(self, wait=False, timeout=None):
+        """작업 스레드 종료 (남은 작업은 스풀 폴더에 남아 다음 실행 때 이어서 인쇄)"""
+        if wait:
+            self.wait_idle(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        # 늦게 지우기로 한 파일은 다음 실행 때 _restore_jobs에서 정리
+        for timer in self._release_timers:
+            timer.cancel()
+        self.backend.close()
+
+    # --- 작업 스레드 ---
+
+    def _release_later(self, job, delay):
+        """완료 기록을 남겨 두고 delay초 뒤에 인쇄 파일과 기록 삭제"""
+        self._save_job(job)
+        timer = threading.Timer(delay, self._discard, (job,))
+        timer.daemon = True
+        self._release_timers = [t for t in self._release_timers if t.is_alive()] + [timer]
+        timer.start()
+
+    def _discard(self, job):
+        for path in (job.image_path, self._job_file(job.job_id)):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                job = self._queue.pop(0)
+                self._busy = True
+
+            self._process(job)
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+
+    def _process(self, job):
+        job.status = STATUS_PRINTING
+        self._save_job(job)
+        started = time.perf_counter()
+
+        while True:
+            job.attempts += 1
+            try:
+                self.backend.print_job(job)
+                job.status = STATUS_DONE
+                job.error = None
+                break
+            except Exception as e:
+                job.error = str(e)
+                print(f"❌ 인쇄 작업 실패 ({job.job_id}, {job.attempts}회): {e}")
+                if not isinstance(e, PrintBackendError):
+                    traceback.print_exc()
+                if job.attempts >= self.max_attempts:
+                    job.status = STATUS_FAILED
+                    break
+
+        job.finished_at = time.time()
+        with self._condition:
+            self._stats['busy_seconds'] += time.perf_counter() - started
+            self._stats['done' if job.status == STATUS_DONE else 'failed'] += 1
+            on_done = self._callbacks.pop(job.job_id, None)
+
+        release_delay = getattr(self.backend, 'release_delay', 0)
+        if job.status == STATUS_DONE and not self.keep_done and release_delay:
+            # ShellExecute는 연결 프로그램이 파일을 열기 전에 반환하므로 바로 지우지 않음
+            self._release_later(job, release_delay)
+        elif job.status == STATUS_DONE and not self.keep_done:
+            self._discard(job)
+        else:
+            # 실패한 작업은 원인 확인용으로 기록과 파일을 남김 (failed_retention이 지나면 다음 실행 때 정리)
+            self._save_job(job)
+
+        for callback in ([on_done] if on_done else []) + self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"❌ 인쇄 완료 콜백 오류: {e}")
+
+
+# 프로세스 전역 스풀러 (GUI들이 공유)
+_spooler = None
+_spooler_lock = threading.Lock()
+
+
+def get_spooler():
+    """프로세스 전역 스풀러 (최초 호출 시 기본 백엔드로 시작)"""
+    global _spooler
+    with _spooler_lock:
+        if _spooler is None:
+            _spooler = PrintSpooler()
+        return _spooler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="인쇄 스풀러 처리량 측정 (Linux에서는 directory 백엔드 사용)")
+    parser.add_argument('image', help="반복 인쇄할 학생증 이미지")
+    parser.add_argument('--count', type=int, default=20, help="작업 수")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None)
+    parser.add_argument('--sink', default="spool_output", help="directory 백엔드 출력 폴더 또는 장치 파일")
+    parser.add_argument('--spool-dir', default=SPOOL_DIR)
+    parser.add_argument('--port', default='COM3', help="pointman 백엔드 시리얼 포트")
+    parser.add_argument('--raster', action='store_true',
+                        help="pointman 백엔드에서 래스터 패널 전송 사용 (N20 매뉴얼 확인 후, 기본: 초기화 + 상태 확인만)")
+    args = parser.parse_args()
+
+    backend_name = args.backend or (None if sys.platform == 'win32' else 'directory')
+    options = {}
+    if backend_name == 'directory':
+        options = {'directory': args.sink}
+    elif backend_name == 'pointman':
+        options = {'com_port': args.port, 'transfer_mode': 'raster' if args.raster else None}
+    backend = create_backend(backend_name, **options)
+    spooler = PrintSpooler(backend, spool_dir=args.spool_dir)
+
+    started = time.perf_counter()
+    for i in range(args.count):
+        spooler.submit(args.image, description=f"bench {i + 1}")
+    submit_seconds = time.perf_counter() - started
+    spooler.wait_idle()
+    total_seconds = time.perf_counter() - started
+
+    stats = spooler.stats()
+    spooler.shutdown()
+    print(f"📊 백엔드: {backend.name}, 작업 {args.count}개")
+    print(f"   제출 시간: {submit_seconds * 1000:.1f}ms (작업당 {submit_seconds / args.count * 1000:.2f}ms)")
+    print(f"   전체 시간: {total_seconds:.2f}s → 분당 {args.count / total_seconds * 60:.0f}장")
+    print(f"   성공 {stats['done']} / 실패 {stats['failed']}")
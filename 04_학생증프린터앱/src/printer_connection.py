@@ -0,0 +1,257 @@
+"""
+Pointman 시리얼 연결 관리자
+- 포트 하나당 연결 하나를 GUI/일괄 작업/스풀러가 공유 → 인쇄할 때마다 포트를 열지 않음
+- 백그라운드 스레드가 주기적으로 상태(ESC v)를 확인 (전송 중이면 건너뛰어 인쇄를 막지 않음)
+- 연결이 끊기면 지수 백오프로 같은 포트에 재연결 (포트 목록을 다시 검색하지 않음)
+"""
+
+import time
+import threading
+import contextlib
+import serial
+from pointman_protocol import FLOW_SOFTWARE, PointmanRasterProtocol, serial_options, status_text
+
+STATE_DISCONNECTED = 'disconnected'
+STATE_CONNECTING = 'connecting'
+STATE_CONNECTED = 'connected'
+
+
+class PrinterConnectionError(Exception):
+    """포트에 연결할 수 없음"""
+
+
+class PrinterConnection:
+    """시리얼 포트 하나를 소유하는 장기 연결"""
+
+    def __init__(self, com_port, baud_rate=9600, flow_control=FLOW_SOFTWARE,
+                 probe_interval=5.0, probe_timeout=0.3, min_backoff=0.5, max_backoff=30.0):
+        """
+        Args:
+            com_port: 시리얼 포트 (예: 'COM3', '/dev/ttyUSB0')
+            baud_rate: 통신 속도
+            flow_control: 'xonxoff' / 'rtscts' / 'none'
+            probe_interval: 상태 확인 간격(초)
+            probe_timeout: 상태 응답 대기 시간(초)
+            min_backoff, max_backoff: 재연결 대기 시간 범위(초) - 실패할 때마다 두 배
+        """
+        self.com_port = com_port
+        self.baud_rate = baud_rate
+        self.flow_control = flow_control
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self.state = STATE_DISCONNECTED
+        self.status = None          # 마지막 상태 바이트 (None: 응답 없음)
+        self.last_error = None
+        self.connect_count = 0      # 포트를 연 횟수 (재연결 포함)
+        self.last_probe_at = None
+
+        self._conn = None
+        self._io_lock = threading.Lock()      # 전송/상태 확인 중 포트 독점
+        self._connected = threading.Event()
+        self._wake = threading.Event()
+        self._listeners = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"printer-{com_port}")
+        self._thread.start()
+
+    def add_listener(self, listener):
+        """상태가 바뀔 때 listener(연결 상태, 상태 바이트) 호출 (관리자 스레드에서)"""
+        self._listeners.append(listener)
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            try:
+                listener(self.state, self.status)
+            except Exception as e:
+                print(f"⚠️ 연결 상태 알림 오류: {e}")
+
+    def _set_state(self, state, status=None):
+        changed = (state, status) != (self.state, self.status)
+        self.state = state
+        self.status = status
+        if changed:
+            self._notify()
+
+    def _open(self):
+        return serial.Serial(
+            port=self.com_port,
+            baudrate=self.baud_rate,
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=2,
+            **serial_options(self.flow_control)
+        )
+
+    def _try_connect(self):
+        self._set_state(STATE_CONNECTING)
+        try:
+            conn = self._open()
+        except (serial.SerialException, OSError) as e:
+            self.last_error = e
+            self._set_state(STATE_DISCONNECTED)
+            return False
+
+        with self._io_lock:
+            self._conn = conn
+        self.connect_count += 1
+        self.last_error = None
+        self._connected.set()
+        self._set_state(STATE_CONNECTED)
+        return True
+
+    def _drop(self, error, failed_conn):
+        """
+        연결 끊김 처리 → 관리자 스레드가 곧바로 재연결 시도
+
+        상태 확인 스레드와 acquire()가 함께 부를 수 있으므로 포트 잠금 안에서 교체하고,
+        그사이 이미 다른 연결로 바뀌었으면(다른 쪽이 먼저 끊고 재연결함) 아무것도 하지 않음
+        """
+        with self._io_lock:
+            if self._conn is not failed_conn:
+                return
+            self._conn = None
+            self.last_error = error
+            self._connected.clear()
+        conn = failed_conn
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._set_state(STATE_DISCONNECTED)
+        self._wake.set()
+
+    def _probe(self):
+        """상태 확인 (포트를 다른 작업이 쓰고 있으면 건너뜀)"""
+        if not self._io_lock.acquire(blocking=False):
+            return
+        error = None
+        try:
+            conn = self._conn
+            if conn is None:
+                return
+            saved_timeout = conn.timeout
+            try:
+                protocol = PointmanRasterProtocol(conn, flow_control=self.flow_control, ack_timeout=self.probe_timeout)
+                status = protocol.read_status()
+            finally:
+                conn.timeout = saved_timeout
+        except (serial.SerialException, OSError) as e:
+            error = e
+        finally:
+            self._io_lock.release()
+
+        if error is not None:
+            self._drop(error, conn)
+            return
+        self.last_probe_at = time.time()
+        self._set_state(STATE_CONNECTED, status)
+
+    def _run(self):
+        backoff = self.min_backoff
+        while not self._closed:
+            if self._conn is None:
+                if self._try_connect():
+                    backoff = self.min_backoff
+                    self._probe()
+                    wait = self.probe_interval
+                else:
+                    wait = backoff
+                    backoff = min(backoff * 2, self.max_backoff)
+            else:
+                self._probe()
+                wait = self.probe_interval
+
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def is_connected(self):
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout=None):
+        """연결될 때까지 대기 (끊겨 있으면 백오프를 기다리지 않고 바로 재시도)"""
+        if not self._connected.is_set():
+            self._wake.set()
+        return self._connected.wait(timeout)
+
+    @contextlib.contextmanager
+    def acquire(self, timeout=5.0):
+        """
+        포트를 독점해서 사용
+
+            with connection.acquire() as conn:
+                PointmanRasterProtocol(conn).send_card(...)
+
+        시리얼 오류가 나면 연결을 끊고 재연결을 예약한 뒤 예외를 다시 발생시킵니다.
+        """
+        if not self.wait_connected(timeout):
+            raise PrinterConnectionError(f"프린터 포트에 연결할 수 없습니다: {self.com_port} ({self.last_error})")
+
+        with self._io_lock:
+            conn = self._conn
+            if conn is None:
+                raise PrinterConnectionError(f"프린터 연결이 끊어졌습니다: {self.com_port}")
+            try:
+                yield conn
+            except (serial.SerialException, OSError) as e:
+                error = e
+            else:
+                error = None
+        if error is not None:
+            self._drop(error, conn)
+            raise error
+
+    def describe(self):
+        """상태 표시용 문구"""
+        if self.state == STATE_CONNECTED:
+            return f"{self.com_port}: {status_text(self.status)}"
+        if self.state == STATE_CONNECTING:
+            return f"{self.com_port}: 연결 중..."
+        return f"{self.com_port}: 연결 끊김 ({self.last_error})" if self.last_error else f"{self.com_port}: 연결 안 됨"
+
+    def close(self):
+        """관리자 스레드 중지 + 포트 닫기"""
+        self._closed = True
+        self._wake.set()
+        with self._io_lock:
+            conn, self._conn = self._conn, None
+        self._connected.clear()
+        if conn is not None:
+            conn.close()
+        self._set_state(STATE_DISCONNECTED)
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(com_port, baud_rate=9600, flow_control=FLOW_SOFTWARE):
+    """
+    포트별 공유 연결 (처음 요청할 때 만들어 백그라운드에서 연결 시작)
+
+    이미 다른 통신 속도/흐름 제어로 열린 포트면 PrinterConnectionError
+    (한 포트를 두 설정으로 쓰면 한쪽은 잘못된 설정으로 통신하게 됨)
+    """
+    with _connections_lock:
+        connection = _connections.get(com_port)
+        if connection is None or connection._closed:
+            connection = PrinterConnection(com_port, baud_rate, flow_control)
+            _connections[com_port] = connection
+        elif (connection.baud_rate, connection.flow_control) != (baud_rate, flow_control):
+            raise PrinterConnectionError(
+                f"{com_port}은(는) 이미 {connection.baud_rate}bps/{connection.flow_control} 설정으로 열려 있습니다 "
+                f"(요청: {baud_rate}bps/{flow_control})")
+        return connection
+
+
+def close_all_connections():
+    """프로그램 종료 시 모든 공유 연결 닫기"""
+    with _connections_lock:
+        connections = list(_connections.values())
+        _connections.clear()
+    for connection in connections:
+        connection.close()
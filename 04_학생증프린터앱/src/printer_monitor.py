@@ -0,0 +1,292 @@
+"""
+프린터 상태 모니터 (백그라운드)
+- 자체 스레드에서 주기적으로 프린터 상태 확인 → GUI 스레드에서 EnumPrinters를 호출하지 않음
+- 찾은 프린터 이름과 핸들을 캐시하고, 오류가 나거나 일정 시간이 지났을 때만 다시 검색
+- 상태가 바뀔 때만 구독자에게 알림
+- 플랫폼 계층 분리: Windows(win32print) / 가상 프린터(Linux 개발·테스트용) / 확인 불가(pywin32 없는 Windows)
+"""
+
+import sys
+import time
+import threading
+
+# win32 PRINTER_STATUS_* 비트 → 표시 문구
+PRINTER_STATUS_MESSAGES = {
+    0x00000001: "일시 중지",
+    0x00000002: "오류",
+    0x00000008: "용지 걸림",
+    0x00000010: "카드 없음",
+    0x00000080: "오프라인",
+    0x00000200: "사용 중",
+    0x00000400: "인쇄 중",
+    0x00001000: "사용할 수 없음",
+    0x00040000: "리본/토너 부족",
+    0x00100000: "사용자 확인 필요",
+    0x00400000: "도어 열림",
+}
+
+
+class PrinterState:
+    """모니터가 알리는 프린터 상태 (값 객체)"""
+
+    def __init__(self, name=None, status=None, error=None):
+        self.name = name        # 찾은 프린터 이름 (None: 없음)
+        self.status = status    # 상태 코드 (0: Ready)
+        self.error = error      # 확인 실패 메시지
+
+    @property
+    def found(self):
+        return self.name is not None
+
+    @property
+    def ready(self):
+        return self.found and self.status == 0 and self.error is None
+
+    def describe(self):
+        """상태 코드 → 문구"""
+        if self.error:
+            return f"확인 불가 ({self.error})"
+        if not self.found:
+            return "없음"
+        if self.status == 0:
+            return "Ready"
+        messages = [message for bit, message in PRINTER_STATUS_MESSAGES.items() if self.status & bit]
+        return ", ".join(messages) if messages else f"상태 {self.status}"
+
+    def __eq__(self, other):
+        return isinstance(other, PrinterState) and \
+            (self.name, self.status, self.error) == (other.name, other.status, other.error)
+
+    def __repr__(self):
+        return f"PrinterState({self.name}, {self.describe()})"
+
+
+class Win32PrinterPlatform:
+    """Windows 프린터 목록/상태 (pywin32)"""
+
+    def __init__(self):
+        import win32print  # pywin32가 없으면 ImportError
+        self._win32print = win32print
+
+    def find_printers(self, name_filter):
+        flags = self._win32print.PRINTER_ENUM_LOCAL | self._win32print.PRINTER_ENUM_CONNECTIONS
+        return [p[2] for p in self._win32print.EnumPrinters(flags) if name_filter in p[2].upper()]
+
+    def open(self, printer_name):
+        return self._win32print.OpenPrinter(printer_name)
+
+    def get_status(self, handle):
+        return self._win32print.GetPrinter(handle, 2)['Status']
+
+    def close(self, handle):
+        self._win32print.ClosePrinter(handle)
+
+
+class FakePrinterPlatform:
+    """
+    가상 프린터 (Linux 개발·테스트용)
+
+    set_status()/remove()로 상태를 바꾸면 모니터가 다음 확인 때 알립니다.
+    """
+
+    def __init__(self, printers=("POINTMAN N20 (가상)",), status=0):
+        self._lock = threading.Lock()
+        self._printers = {name: status for name in printers}
+        self.find_count = 0    # find_printers 호출 횟수 (캐시 확인용)
+
+    def set_status(self, printer_name, status):
+        with self._lock:
+            self._printers[printer_name] = status
+
+    def remove(self, printer_name):
+        with self._lock:
+            self._printers.pop(printer_name, None)
+
+    def find_printers(self, name_filter):
+        with self._lock:
+            self.find_count += 1
+            return [name for name in self._printers if name_filter in name.upper()]
+
+    def open(self, printer_name):
+        with self._lock:
+            if printer_name not in self._printers:
+                raise OSError(f"프린터를 찾을 수 없습니다: {printer_name}")
+        return printer_name
+
+    def get_status(self, handle):
+        with self._lock:
+            if handle not in self._printers:
+                raise OSError(f"프린터 연결이 끊어졌습니다: {handle}")
+            return self._printers[handle]
+
+    def close(self, handle):
+        pass
+
+
+class UnavailablePrinterPlatform:
+    """프린터 상태를 확인할 수 없는 환경 (예: pywin32 없는 Windows) - 항상 '확인 불가'로 알림"""
+
+    def __init__(self, reason):
+        self.reason = reason
+
+    def find_printers(self, name_filter):
+        raise OSError(self.reason)
+
+    def open(self, printer_name):
+        raise OSError(self.reason)
+
+    def get_status(self, handle):
+        raise OSError(self.reason)
+
+    def close(self, handle):
+        pass
+
+
+def create_platform(fake=False):
+    """
+    Windows면 win32print (pywin32가 없으면 확인 불가), 그 외 운영체제나 fake=True면 가상 프린터
+
+    실제 키오스크에서 없는 프린터를 Ready로 표시하지 않도록 Windows에서는 가상 프린터를 쓰지 않습니다.
+    """
+    if fake or sys.platform != 'win32':
+        return FakePrinterPlatform()
+    try:
+        return Win32PrinterPlatform()
+    except ImportError:
+        print("⚠️ pywin32가 없어 프린터 상태를 확인할 수 없습니다. pip install pywin32")
+        return UnavailablePrinterPlatform("pywin32 없음 - pip install pywin32")
+
+
+class PrinterStatusMonitor:
+    """프린터 상태를 백그라운드 스레드에서 확인하고 변경을 알리는 서비스"""
+
+    def __init__(self, platform=None, name_filter="POINTMAN", interval=3.0, rescan_interval=60.0):
+        """
+        Args:
+            platform: 플랫폼 계층 (None이면 create_platform())
+            name_filter: 프린터 이름에 포함될 문자열 (대문자 비교)
+            interval: 상태 확인 간격(초)
+            rescan_interval: 프린터를 찾은 뒤에도 목록을 다시 검색하는 간격(초)
+        """
+        self.platform = platform or create_platform()
+        self.name_filter = name_filter.upper()
+        self.interval = interval
+        self.rescan_interval = rescan_interval
+
+        self.state = None           # 마지막 PrinterState (None: 아직 확인 전)
+        self._printer_name = None
+        self._handle = None
+        self._scanned_at = None     # 마지막 목록 검색 시각
+        self._subscribers = []
+        self._waiters = []          # refresh(on_done) 콜백 - 다음 확인 후 한 번 호출
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name="printer-monitor")
+        self._thread.start()
+
+    def subscribe(self, callback):
+        """
+        상태 변경 구독 - callback(PrinterState)은 모니터 스레드에서 호출됨
+        (Tk에서는 RenderExecutor.post로 메인 스레드에 넘길 것)
+
+        Returns:
+            구독 해제 함수
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def refresh(self, on_done=None, rescan=False):
+        """
+        즉시 다시 확인 (블로킹하지 않음)
+
+        Args:
+            on_done: on_done(PrinterState) - 확인이 끝나면 모니터 스레드에서 한 번 호출
+            rescan: True면 캐시된 프린터를 버리고 목록부터 다시 검색
+        """
+        with self._lock:
+            if on_done:
+                self._waiters.append(on_done)
+            if rescan:
+                self._scanned_at = None
+        self._wake.set()
+
+    def _release_handle(self):
+        if self._handle is not None:
+            try:
+                self.platform.close(self._handle)
+            except Exception:
+                pass
+        self._handle = None
+
+    def _resolve(self):
+        """프린터 이름/핸들 찾기 (캐시가 없거나 다시 검색할 때만)"""
+        printers = self.platform.find_printers(self.name_filter)
+        name = printers[0] if printers else None
+        if name != self._printer_name or self._handle is None:
+            self._release_handle()
+            self._printer_name = name
+            if name is not None:
+                self._handle = self.platform.open(name)
+        self._scanned_at = time.monotonic()
+
+    def _check(self):
+        """프린터 상태 한 번 확인 → PrinterState"""
+        try:
+            with self._lock:
+                need_scan = (self._handle is None or self._scanned_at is None
+                             or time.monotonic() - self._scanned_at >= self.rescan_interval)
+            if need_scan:
+                self._resolve()
+            if self._printer_name is None:
+                return PrinterState()
+            return PrinterState(self._printer_name, self.platform.get_status(self._handle))
+        except Exception as e:
+            # 핸들이 무효해졌을 수 있으므로 다음 확인 때 다시 검색
+            self._release_handle()
+            return PrinterState(self._printer_name, error=str(e) or type(e).__name__)
+
+    def _publish(self, state):
+        with self._lock:
+            changed = state != self.state
+            self.state = state
+            subscribers = list(self._subscribers) if changed else []
+            waiters, self._waiters = self._waiters, []
+
+        for callback in subscribers + waiters:
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"⚠️ 프린터 상태 알림 오류: {e}")
+
+    def _run(self):
+        while not self._closed:
+            self._publish(self._check())
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def shutdown(self):
+        """모니터 스레드 중지 + 캐시된 핸들 닫기"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=self.interval + 1)
+        self._release_handle()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_printer_monitor():
+    """프로세스 전역 프린터 상태 모니터 (최초 호출 시 시작)"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = PrinterStatusMonitor()
+        return _monitor
@@ -0,0 +1,387 @@
+"""
+학생증 제작기 성능 측정 (헤드리스 벤치마크)
+- 제작기마다 여러 크기/모드(RGB/RGBA/LA, 0.3~40MP)의 사진으로 카드를 만들어
+  지연 시간, 최대 메모리(RSS), 출력 파일 크기를 측정
+- 케이스마다 새 프로세스에서 실행하므로 최대 메모리가 다른 케이스의 영향을 받지 않음
+- Tk/win32 없이 실행 (PhotoCardMaker는 GUI가 호출하는 렌더 엔진 경로를 직접 실행)
+- 렌더 캐시는 끄고 정규화 사진 캐시는 매회 비우므로 매번 사진 디코딩부터 다시 측정
+- 저장된 기준값과 비교하여 느려지거나 커지면 ❌ 목록을 출력하고 종료 코드 1로 실패
+  (기준값 파일이 없으면 결과만 출력, CI에서는 --require-baseline으로 기준값이 없을 때도 실패)
+- 템플릿/측정용 사진/기준값은 실행 위치와 관계없이 앱 폴더 기준으로 찾음
+
+    python src/render_benchmark.py                  # 전체 측정 + 기준값 비교
+    python src/render_benchmark.py --quick          # 2MP 이하 사진만
+    python src/render_benchmark.py --save-baseline  # 현재 결과를 기준값으로 저장
+    python src/render_benchmark.py --require-baseline  # CI: 기준값이 없으면 실패
+"""
+
+import os
+import io
+import sys
+import gc
+import json
+import time
+import shutil
+import platform
+import tempfile
+import contextlib
+import subprocess
+from PIL import Image, ImageDraw, ImageChops
+from memory_budget import peak_rss_mb
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PHOTO_DIR = os.path.join(APP_DIR, "cache", "bench_photos")
+BASELINE_PATH = os.path.join(APP_DIR, "benchmark_baseline.json")
+
+# 사진 크기 (세로 사진, 4:3 비율에 가깝게)
+PHOTO_SIZES = (
+    ('0.3MP', (480, 640)),
+    ('2MP', (1224, 1632)),
+    ('12MP', (3000, 4000)),
+    ('40MP', (5472, 7296)),
+)
+QUICK_SIZES = ('0.3MP', '2MP')
+
+# 사진 모드 → (저장 형식, 확장자)
+PHOTO_MODES = (
+    ('RGB', 'JPEG', '.jpg'),
+    ('RGBA', 'PNG', '.png'),
+    ('LA', 'PNG', '.png'),
+)
+
+MAKERS = ('photo', 'pointman_portrait', 'pointman_landscape', 'template', 'student')
+
+# 제작기 → 배경 템플릿 (앱 폴더 기준, PhotoCardMaker는 템플릿 없음)
+MAKER_TEMPLATES = {
+    'pointman_portrait': 'background_frame.jpg',
+    'pointman_landscape': 'background_frame2.jpg',
+    'template': 'background_frame3.jpg',
+    'student': 'background_frame.jpg',
+}
+
+BENCH_STUDENT = {
+    'name': '홍길동',
+    'student_id': '20240001',
+    'department': '컴퓨터공학과',
+    'grade': '3학년',
+    'school_name': 'ABC 대학교',
+}
+BENCH_BIRTH_DATE = '2008.03.15'
+BENCH_TEMPLATE_FIELDS = {'name': '김포토샵', 'school_name': '은하여자고등학교', 'grade': '3', 'class': '2'}
+
+# 측정값 → (허용 비율, 허용 절대값): 기준값 x (1 + 비율) + 절대값을 넘으면 회귀
+TOLERANCES = {
+    'median_ms': (0.25, 5.0),
+    'peak_rss_mb': (0.20, 16.0),
+    'output_bytes': (0.05, 0),
+}
+
+
+def photo_key(size_label, mode):
+    return f"{size_label}_{mode}"
+
+
+def make_fixture_photo(size, mode):
+    """측정용 사진 (그라데이션 배경 + 얼굴 모양, 투명 모드는 타원 바깥이 투명)"""
+    width, height = size
+    radial = Image.radial_gradient('L').resize(size, Image.Resampling.BILINEAR)
+    linear = Image.linear_gradient('L').resize(size, Image.Resampling.BILINEAR)
+    if mode == 'LA':
+        image = ImageChops.blend(radial, linear, 0.5)
+    else:
+        image = Image.merge('RGB', (radial, linear, ImageChops.invert(radial)))
+
+    draw = ImageDraw.Draw(image)
+    face = (width * 0.25, height * 0.2, width * 0.75, height * 0.65)
+    draw.ellipse(face, fill=200 if mode == 'LA' else (255, 218, 185))
+    for eye_x in (0.38, 0.62):
+        draw.ellipse((width * (eye_x - 0.04), height * 0.36, width * (eye_x + 0.04), height * 0.42),
+                     fill=0 if mode == 'LA' else (0, 0, 0))
+
+    if mode in ('RGBA', 'LA'):
+        alpha = Image.new('L', size, 0)
+        ImageDraw.Draw(alpha).ellipse((width * 0.05, height * 0.05, width * 0.95, height * 0.95), fill=255)
+        image.putalpha(alpha)
+    return image
+
+
+def prepare_fixtures(size_labels, photo_dir=BENCH_PHOTO_DIR):
+    """측정용 사진 준비 (이미 있으면 재사용) → {사진 키: 경로}"""
+    os.makedirs(photo_dir, exist_ok=True)
+    fixtures = {}
+    for size_label, size in PHOTO_SIZES:
+        if size_label not in size_labels:
+            continue
+        for mode, image_format, ext in PHOTO_MODES:
+            key = photo_key(size_label, mode)
+            path = os.path.join(photo_dir, key + ext)
+            if not os.path.exists(path):
+                print(f"🖼️ 측정용 사진 생성: {path}")
+                temp_path = path + ".tmp"
+                make_fixture_photo(size, mode).save(temp_path, image_format)
+                os.replace(temp_path, path)
+            fixtures[key] = path
+    return fixtures
+
+
+def template_path(maker):
+    """제작기의 배경 템플릿 절대 경로 (없으면 FileNotFoundError - 배경 없이 잰 값은 비교할 수 없음)"""
+    path = os.path.join(APP_DIR, MAKER_TEMPLATES[maker])
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"템플릿이 없습니다: {path}")
+    return path
+
+
+def missing_templates(makers):
+    """측정할 제작기의 템플릿 중 없는 파일 목록"""
+    paths = {os.path.join(APP_DIR, MAKER_TEMPLATES[maker]) for maker in makers if maker in MAKER_TEMPLATES}
+    return sorted(path for path in paths if not os.path.exists(path))
+
+
+def make_runner(maker):
+    """
+    제작기 하나로 카드를 만드는 함수와 출력 확장자
+
+    Returns:
+        (run(photo_path, output_path) → 성공 여부, 출력 확장자)
+    """
+    if maker == 'photo':
+        # PhotoCardMaker._render_to_file과 같은 경로 (렌더 캐시 제외)
+        from card_render_engine import CardRenderEngine
+        engine = CardRenderEngine()
+
+        def run(photo_path, output_path):
+            engine.save(engine.render(photo_path, BENCH_STUDENT['name'], BENCH_BIRTH_DATE), output_path)
+            return True
+        return run, '.jpg'
+
+    if maker in ('pointman_portrait', 'pointman_landscape'):
+        from pointman_card_printer import PointmanCardPrinter
+        printer = PointmanCardPrinter()
+        printer.render_cache = None
+        orientation = maker.split('_')[1]
+        template = template_path(maker)
+
+        def run(photo_path, output_path):
+            student = dict(BENCH_STUDENT, photo_path=photo_path)
+            return printer.create_student_card(template, student, output_path, orientation=orientation)
+        return run, '.png'
+
+    if maker == 'template':
+        from template_card_maker import TemplateCardMaker
+        card_maker = TemplateCardMaker()
+        card_maker.render_cache = None
+        template = template_path(maker)
+
+        def run(photo_path, output_path):
+            return card_maker.create_card_with_template(template, photo_path,
+                                                        BENCH_TEMPLATE_FIELDS, output_path)
+        return run, '.png'
+
+    if maker == 'student':
+        from student_card_maker import StudentCardMaker
+        card_maker = StudentCardMaker()
+        template = template_path(maker)
+
+        def run(photo_path, output_path):
+            return card_maker.create_student_card(template, dict(BENCH_STUDENT, photo_path=photo_path),
+                                                  output_path)
+        return run, '.png'
+
+    raise ValueError(f"알 수 없는 제작기: {maker}")
+
+
+def run_case(maker, photo_path, repeats):
+    """
+    (자식 프로세스) 케이스 하나 측정
+
+    첫 회는 템플릿/폰트 로드가 포함된 준비 실행으로 따로 기록하고, 이후 repeats회의 중앙값을 비교에 사용
+    """
+    from photo_normalizer import get_photo_normalizer
+
+    work_dir = tempfile.mkdtemp(prefix="card_bench_")
+    normalizer = get_photo_normalizer()
+    normalizer.cache_dir = os.path.join(work_dir, "photos")
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            run, ext = make_runner(maker)
+        output_path = os.path.join(work_dir, "card" + ext)
+        base_rss = peak_rss_mb()
+
+        timings = []
+        for _ in range(repeats + 1):
+            normalizer.clear()
+            gc.collect()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                success = run(photo_path, output_path)
+            timings.append((time.perf_counter() - started) * 1000)
+            if not success:
+                raise RuntimeError(f"카드 생성 실패: {log.getvalue().strip().splitlines()[-1:]}")
+
+        measured = sorted(timings[1:])
+        peak = peak_rss_mb()
+        return {
+            'first_ms': round(timings[0], 2),
+            'median_ms': round(measured[len(measured) // 2], 2),
+            'min_ms': round(measured[0], 2),
+            'peak_rss_mb': round(peak, 1) if peak is not None else None,
+            'rss_growth_mb': round(peak - base_rss, 1) if peak is not None else None,
+            'output_bytes': os.path.getsize(output_path),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def measure(maker, key, photo_path, repeats):
+    """케이스 하나를 새 프로세스에서 측정"""
+    command = [sys.executable, os.path.abspath(__file__), '--case', maker, photo_path, '--repeats', str(repeats)]
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = (completed.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+        raise RuntimeError(f"{maker}/{key} 측정 실패: {error}")
+    return json.loads(lines[-1])
+
+
+def machine_info():
+    """측정 환경 (기준값과 환경이 다르면 시간/메모리 비교는 경고만)"""
+    import PIL
+    return {
+        'platform': sys.platform,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+    }
+
+
+def run_suite(makers, size_labels, repeats):
+    """전체 측정 → {'machine': ..., 'results': {'제작기/사진 키': 측정값}}"""
+    fixtures = prepare_fixtures(size_labels)
+    results = {}
+    print(f"\n{'케이스':<32} {'첫 회(ms)':>10} {'중앙값(ms)':>11} {'최대 RSS(MB)':>13} {'출력(KB)':>9}")
+    for maker in makers:
+        for key, photo_path in fixtures.items():
+            case = f"{maker}/{key}"
+            result = measure(maker, key, photo_path, repeats)
+            results[case] = result
+            rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else "-"
+            print(f"{case:<32} {result['first_ms']:>10.1f} {result['median_ms']:>11.1f} {rss:>13} "
+                  f"{result['output_bytes'] / 1024:>9.1f}")
+    return {'machine': machine_info(), 'results': results}
+
+
+def compare(report, baseline, strict=False):
+    """
+    기준값과 비교
+
+    Returns:
+        회귀 목록 (비어 있으면 통과)
+    """
+    same_machine = report['machine'] == baseline.get('machine')
+    if not same_machine:
+        print(f"⚠️ 기준값과 측정 환경이 다릅니다: {baseline.get('machine')} → {report['machine']}")
+        if not strict:
+            print("   시간/메모리 회귀는 경고로만 표시합니다 (--strict로 실패 처리)")
+
+    regressions = []
+    warnings = []
+    for case, result in report['results'].items():
+        old = baseline.get('results', {}).get(case)
+        if old is None:
+            continue
+        for metric, (ratio, slack) in TOLERANCES.items():
+            new_value = result.get(metric)
+            old_value = old.get(metric)
+            if new_value is None or old_value is None:
+                continue
+            limit = old_value * (1 + ratio) + slack
+            if new_value > limit:
+                message = f"{case} {metric}: {old_value} → {new_value} (허용 {limit:.1f})"
+                if same_machine or strict or metric == 'output_bytes':
+                    regressions.append(message)
+                else:
+                    warnings.append(message)
+
+    for message in warnings:
+        print(f"⚠️ {message}")
+    return regressions
+
+
+def load_baseline(baseline_path):
+    if not os.path.exists(baseline_path):
+        return None
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_report(report, report_path):
+    """측정 결과를 JSON으로 저장 (기준값 파일도 같은 형식)"""
+    temp_path = report_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temp_path, report_path)
+    print(f"💾 측정 결과 저장: {report_path}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="학생증 제작기 헤드리스 성능 측정")
+    parser.add_argument('--maker', action='append', choices=MAKERS, help="측정할 제작기 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--size', action='append', choices=[label for label, _ in PHOTO_SIZES],
+                        help="사진 크기 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--quick', action='store_true', help="2MP 이하 사진만 측정")
+    parser.add_argument('--repeats', type=int, default=5, help="케이스마다 반복 횟수 (준비 실행 제외)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="기준값 파일")
+    parser.add_argument('--save-baseline', action='store_true', help="현재 결과를 기준값으로 저장")
+    parser.add_argument('--require-baseline', action='store_true', help="기준값 파일이 없으면 측정하지 않고 실패 (CI용)")
+    parser.add_argument('--strict', action='store_true', help="측정 환경이 달라도 시간/메모리 회귀를 실패로 처리")
+    parser.add_argument('--json', default=None, help="측정 결과를 JSON 파일로도 저장")
+    parser.add_argument('--case', nargs=2, metavar=('MAKER', 'PHOTO'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        maker, photo_path = args.case
+        print(json.dumps(run_case(maker, photo_path, args.repeats)))
+        return 0
+
+    makers = args.maker or MAKERS
+    missing = missing_templates(makers)
+    if missing:
+        print(f"❌ 템플릿이 없어 측정할 수 없습니다: {', '.join(missing)}")
+        return 1
+
+    baseline = None
+    if not args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None and args.require_baseline:
+            print(f"❌ 기준값이 없습니다 ({args.baseline}) - 먼저 --save-baseline으로 저장하세요")
+            return 1
+
+    size_labels = args.size or (QUICK_SIZES if args.quick else [label for label, _ in PHOTO_SIZES])
+    report = run_suite(makers, size_labels, args.repeats)
+
+    if args.json:
+        write_report(report, args.json)
+    if args.save_baseline:
+        write_report(report, args.baseline)
+        return 0
+    if baseline is None:
+        print(f"\n⚠️ 기준값이 없어 비교하지 않았습니다 ({args.baseline}) - --save-baseline으로 저장하세요")
+        return 0
+
+    regressions = compare(report, baseline, args.strict)
+    if regressions:
+        print(f"\n❌ 성능 회귀 {len(regressions)}건:")
+        for message in regressions:
+            print(f"   ❌ {message}")
+        return 1
+    print("\n✅ 기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
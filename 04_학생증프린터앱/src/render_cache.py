@@ -0,0 +1,195 @@
+"""
+완성 카드 렌더 캐시 (내용 주소 방식)
+- 템플릿/사진 파일 내용, 학생 정보, 레이아웃 값, 렌더러 버전을 해시한 키로 완성 카드를 저장
+- 재인쇄나 리본 오류 후 재시도처럼 입력이 같은 카드는 다시 그리지 않고 캐시에서 바로 복사
+- 출력 파일이 이미 같은 내용이면 복사도 생략
+- 캐시 폴더(cache/renders) 크기가 상한을 넘으면 가장 오래 쓰지 않은 카드부터 삭제
+"""
+
+import os
+import json
+import shutil
+import filecmp
+import hashlib
+import threading
+from content_hash import FileHashMemo
+
+RENDER_CACHE_DIR = os.path.join("cache", "renders")
+DEFAULT_RENDER_CACHE_BYTES = 512 * 1024 * 1024
+
+# 렌더링 결과가 바뀌는 수정을 하면 올릴 것 (이전 캐시가 자동으로 무효화됨)
+RENDERER_VERSION = 4
+
+
+def cache_entries(cache_dir):
+    """캐시 폴더의 파일 목록 (바로 아래와 하위 폴더 한 단계, 임시 파일 제외) → [(최근 사용 시각, 크기, 경로)]"""
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for item in os.scandir(cache_dir):
+        children = os.scandir(item.path) if item.is_dir() else (item,)
+        for entry in children:
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # 다른 프로세스가 방금 삭제함
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def evict_lru(cache_dir, max_bytes):
+    """
+    캐시 폴더가 max_bytes를 넘으면 오래 쓰지 않은(수정시각이 오래된) 파일부터 삭제
+
+    Returns:
+        (남은 크기, 삭제한 파일 수)
+    """
+    entries = sorted(cache_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return total, removed
+
+
+class RenderCache:
+    """완성 카드 파일 캐시 (여러 프로세스가 같은 폴더를 함께 써도 안전)"""
+
+    def __init__(self, cache_dir=RENDER_CACHE_DIR, max_bytes=DEFAULT_RENDER_CACHE_BYTES):
+        """
+        Args:
+            cache_dir: 캐시 카드를 저장할 폴더
+            max_bytes: 캐시 폴더 크기 상한 (넘으면 오래 쓰지 않은 카드부터 삭제)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._file_hashes = FileHashMemo()
+        self._total = None       # 캐시 폴더 크기 추정값 (None: 아직 확인 전)
+        self._lock = threading.Lock()
+
+    def content_hash(self, file_path):
+        """파일 내용 해시 (없으면 None, 수정시각/크기가 같으면 다시 읽지 않음)"""
+        if not file_path:
+            return None
+        try:
+            return self._file_hashes.get(file_path)
+        except OSError:
+            return None
+
+    def make_key(self, maker_kind, template_path, photo_path, fields, layout):
+        """
+        캐시 키 (입력이 하나라도 바뀌면 다른 키)
+
+        Args:
+            maker_kind: 제작기 종류 ('pointman' / 'template' / 'photo')
+            template_path: 템플릿(배경 프레임) 파일 - 경로가 아니라 내용으로 비교
+            photo_path: 학생 사진 파일 - 내용으로 비교
+            fields: 카드에 들어가는 학생 정보 (photo_path는 무시)
+            layout: 결과에 영향을 주는 레이아웃 값/설정 (JSON으로 표현 가능한 값)
+        """
+        parts = {
+            'version': RENDERER_VERSION,
+            'maker': maker_kind,
+            'template': self.content_hash(template_path),
+            'photo': self.content_hash(photo_path),
+            'fields': {k: v for k, v in fields.items() if k != 'photo_path'},
+            'layout': layout,
+        }
+        text = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key, output_path):
+        ext = os.path.splitext(output_path)[1].lower()
+        return os.path.join(self.cache_dir, key[:2], key + ext)
+
+    def fetch(self, key, output_path):
+        """
+        캐시된 카드를 output_path에 복사
+
+        Returns:
+            캐시에 있어서 output_path가 준비되었으면 True
+        """
+        entry = self._entry_path(key, output_path)
+        try:
+            if not (os.path.exists(output_path) and filecmp.cmp(entry, output_path, shallow=False)):
+                output_dir = os.path.dirname(output_path)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                shutil.copyfile(entry, output_path)
+            os.utime(entry)   # 최근 사용 표시 (삭제 순서 기준)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, output_path):
+        """새로 만든 카드를 캐시에 저장 (실패해도 카드 생성에는 영향 없음)"""
+        entry = self._entry_path(key, output_path)
+        temp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            shutil.copyfile(output_path, temp_path)
+            os.replace(temp_path, entry)
+            size = os.path.getsize(entry)
+        except OSError as e:
+            print(f"⚠️ 렌더 캐시 저장 실패: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+            need_scan = self._total is None or self._total > self.max_bytes
+        if need_scan:
+            self.evict()
+
+    def evict(self):
+        """캐시 폴더가 상한을 넘으면 오래 쓰지 않은 카드부터 삭제"""
+        total, removed = evict_lru(self.cache_dir, self.max_bytes)
+        with self._lock:
+            self._total = total
+            self.evictions += removed
+
+    def clear(self):
+        """캐시 폴더 비우기"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        with self._lock:
+            self._total = 0
+        self._file_hashes.clear()
+
+    def describe(self):
+        """캐시 상태 문구"""
+        total = self.hits + self.misses
+        return f"렌더 캐시 적중 {self.hits}/{total}, 삭제 {self.evictions}개"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """프로세스 전역 렌더 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenderCache()
+        return _cache
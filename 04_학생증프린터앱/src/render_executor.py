@@ -0,0 +1,153 @@
+"""
+백그라운드 렌더 실행기 (Tk GUI용)
+- 카드 렌더링/저장/인쇄를 작업 스레드에서 실행하여 창이 멈추지 않게 함
+- 완료 콜백은 after() 폴링으로 Tk 메인 스레드에서 실행
+- 대기 작업 취소와 대기열 길이 표시 지원
+"""
+
+import queue
+import threading
+import traceback
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RenderJob:
+    """제출된 작업 하나 (future + 취소 표시)"""
+
+    def __init__(self, future, description=""):
+        self.future = future
+        self.description = description
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        작업 취소
+
+        아직 시작하지 않은 작업은 실행되지 않고, 이미 실행 중인 작업은
+        끝까지 돌지만 완료 콜백이 호출되지 않습니다.
+
+        Returns:
+            실행 전에 취소되었으면 True
+        """
+        self.cancelled = True
+        return self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+
+class RenderExecutor:
+    """Tk 메인 스레드를 막지 않는 백그라운드 작업 실행기"""
+
+    def __init__(self, root, max_workers=1, on_queue_change=None, poll_interval_ms=50):
+        """
+        Args:
+            root: Tk 루트 (after() 폴링에 사용)
+            max_workers: 작업 스레드 수 (1이면 제출 순서대로 하나씩 처리)
+            on_queue_change: on_queue_change(대기+실행 중 작업 수) - 메인 스레드에서 호출
+            poll_interval_ms: 완료 콜백 확인 주기
+        """
+        self.root = root
+        self.on_queue_change = on_queue_change
+        self.poll_interval_ms = poll_interval_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render")
+        self._callbacks = queue.Queue()   # 메인 스레드에서 실행할 (콜백, args, kwargs)
+        self._jobs = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._poll()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, description="", **kwargs):
+        """
+        작업 스레드에서 fn(*args, **kwargs) 실행
+
+        Args:
+            on_done: on_done(결과) - 성공 시 메인 스레드에서 호출
+            on_error: on_error(예외) - 실패 시 메인 스레드에서 호출 (없으면 콘솔 출력)
+            description: 로그에 표시할 작업 이름
+
+        Returns:
+            RenderJob
+        """
+        future = self._executor.submit(fn, *args, **kwargs)
+        job = RenderJob(future, description)
+        with self._lock:
+            self._jobs.append(job)
+
+        future.add_done_callback(lambda _: self.post(self._finish, job, on_done, on_error))
+        self._notify_queue_change()
+        return job
+
+    def post(self, callback, *args, **kwargs):
+        """아무 스레드에서나 호출 가능 - callback을 Tk 메인 스레드에서 실행하도록 예약"""
+        self._callbacks.put((callback, args, kwargs))
+
+    def pending_count(self):
+        """대기 중이거나 실행 중인 작업 수"""
+        with self._lock:
+            return len(self._jobs)
+
+    def cancel_all(self):
+        """모든 작업 취소 → 실행 전에 취소된 작업 수"""
+        with self._lock:
+            jobs = list(self._jobs)
+        return sum(1 for job in jobs if job.cancel())
+
+    def shutdown(self):
+        """폴링 중지 + 대기 작업 취소 (실행 중인 작업은 기다리지 않음)"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, job, on_done, on_error):
+        with self._lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+        self._notify_queue_change()
+
+        if job.cancelled or job.future.cancelled():
+            return
+
+        error = job.future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"❌ 백그라운드 작업 실패 ({job.description}): {error}")
+        elif on_done:
+            on_done(job.future.result())
+
+    def _notify_queue_change(self):
+        if not self.on_queue_change:
+            return
+        if threading.current_thread() is threading.main_thread():
+            self.on_queue_change(self.pending_count())
+        else:
+            self.post(lambda: self.on_queue_change(self.pending_count()))
+
+    def _poll(self):
+        """메인 스레드: 쌓인 완료 콜백 실행 후 다시 예약"""
+        while True:
+            try:
+                callback, args, kwargs = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ 완료 콜백 오류: {e}")
+                traceback.print_exc()
+
+        if not self._closed:
+            try:
+                self.root.after(self.poll_interval_ms, self._poll)
+            except tk.TclError:
+                # 창이 닫힌 경우
+                self._closed = True
+
+
+def queue_status_text(count):
+    """대기열 표시용 문구"""
+    return f"⏳ 대기 중인 작업: {count}개" if count else ""
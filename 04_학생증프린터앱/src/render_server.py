@@ -0,0 +1,458 @@
+"""
+학생증 렌더 서버 (로컬/LAN HTTP, 표준 라이브러리만 사용)
+- 체크인 태블릿/키오스크가 학생 정보 + 사진을 올리면 완성된 카드(PNG/JPEG)를 바로 돌려줌
+- 시작할 때 워커 프로세스마다 제작기/템플릿/폰트를 미리 로드 (요청마다 콜드 스타트 없음)
+- 동시에 렌더링하는 카드 수는 워커 수로, 대기열 길이는 --max-queue로 제한 (넘치면 503 + Retry-After)
+
+    python src/render_server.py                       # http://127.0.0.1:8765 (이 PC에서만)
+    python src/render_server.py --host 0.0.0.0        # 같은 네트워크의 태블릿에서 접속
+
+요청 예:
+    curl -F name=홍길동 -F student_id=20240001 -F photo=@photos/1.jpg \\
+         http://127.0.0.1:8765/render/pointman -o card.png
+    curl --data-binary @photos/1.jpg -H "Content-Type: image/jpeg" \\
+         "http://127.0.0.1:8765/render/photo?name=홍길동&birth_date=2008.03.15&format=png" -o card.png
+    curl http://127.0.0.1:8765/health
+"""
+
+import os
+import io
+import json
+import time
+import signal
+import hashlib
+import tempfile
+import threading
+import contextlib
+import email.policy
+from email.parser import BytesParser
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from PIL import Image
+from photo_normalizer import PHOTO_EXTENSIONS
+from batch_renderer import MAKER_POINTMAN, MAKER_TEMPLATE, get_maker_class, last_error_line, preload_maker
+from roster_reader import FIELD_ALIASES, REQUIRED_FIELDS, validate_student
+
+MAKER_PHOTO = 'photo'         # CardRenderEngine (PhotoCardMaker와 같은 세로형 카드)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 제작기 종류 → 템플릿(배경 프레임) 기본값
+DEFAULT_MAKERS = {
+    MAKER_POINTMAN: 'card_template.png',
+    MAKER_TEMPLATE: 'card_template.png',
+    MAKER_PHOTO: 'background_frame.jpg',
+}
+
+DEFAULT_MAX_QUEUE = 8                      # 렌더링 중인 카드 외에 기다릴 수 있는 요청 수
+DEFAULT_TIMEOUT = 60                       # 요청 하나의 최대 렌더링 시간 (초)
+DEFAULT_MAX_UPLOAD_BYTES = 30 * 1024 * 1024
+
+# 응답 형식 → (PIL 형식, Content-Type, 확장자)
+OUTPUT_FORMATS = {
+    'png': ('PNG', 'image/png', '.png'),
+    'jpeg': ('JPEG', 'image/jpeg', '.jpg'),
+}
+
+
+class RenderRequestError(ValueError):
+    """잘못된 렌더 요청 (errors: 사용자에게 보여줄 메시지 목록)"""
+
+    def __init__(self, message, errors=()):
+        self.errors = list(errors)
+        super().__init__(message)
+
+
+class ServiceBusyError(Exception):
+    """대기열이 가득 참 (잠시 뒤 다시 요청)"""
+
+
+# 워커 프로세스 상태 (프로세스마다 한 번 초기화)
+_service_worker = {}
+
+
+def _init_service_worker(makers):
+    """워커 초기화: 서비스하는 제작기 전부 생성 + 템플릿/폰트 미리 로드"""
+    # Ctrl+C는 워커에도 전달됨 → 서버 종료는 부모 프로세스만 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        for maker_kind, template_path in makers.items():
+            if maker_kind == MAKER_PHOTO:
+                from card_render_engine import CardRenderEngine
+                engine = CardRenderEngine(background_path=template_path)
+                engine.load_background()
+                engine.load_font(engine.layout.NAME_FONT_SIZE)
+                engine.load_font(engine.layout.BIRTH_FONT_SIZE)
+                _service_worker[maker_kind] = engine
+            else:
+                maker = get_maker_class(maker_kind)()
+                preload_maker(maker_kind, maker, template_path)
+                _service_worker[maker_kind] = maker
+    _service_worker['makers'] = dict(makers)
+    _service_worker['work_dir'] = tempfile.mkdtemp(prefix="card_render_")
+
+
+def _warm_ping():
+    """워커가 모두 떠서 초기화를 마치도록 하는 빈 작업"""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _render_request(maker_kind, student, photo_bytes, photo_ext, output_format):
+    """
+    워커: 요청 한 건 렌더링
+
+    Returns:
+        (카드 파일 바이트, 렌더 캐시 사용 여부)
+    """
+    template_path = _service_worker['makers'][maker_kind]
+    maker = _service_worker[maker_kind]
+    work_dir = _service_worker['work_dir']
+    # 같은 사진은 같은 경로로 저장 → 정규화/렌더 캐시의 경로별 해시 기록이 요청마다 늘어나지 않음
+    photo_path = os.path.join(work_dir, hashlib.sha1(photo_bytes).hexdigest() + photo_ext)
+    written = [photo_path]
+    log = io.StringIO()
+    try:
+        with open(photo_path, 'wb') as f:
+            f.write(photo_bytes)
+        student = dict(student, photo_path=photo_path)
+
+        cached = False
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            if maker_kind == MAKER_PHOTO:
+                output_path = os.path.join(work_dir, "card.jpg")
+                written.append(output_path)
+                maker.save(maker.render(photo_path, student['name'], student['birth_date']), output_path)
+                success = True
+            elif maker_kind == MAKER_POINTMAN:
+                output_path = os.path.join(work_dir, "card.png")
+                written.append(output_path)
+                success = maker.create_student_card(template_path, student, output_path)
+                cached = maker.last_from_cache
+            else:
+                output_path = os.path.join(work_dir, "card.png")
+                written.append(output_path)
+                success = maker.create_card_with_template(template_path, photo_path, student, output_path)
+                cached = maker.last_from_cache
+        if not success:
+            raise RuntimeError(last_error_line(log.getvalue()))
+
+        pil_format, _, ext = OUTPUT_FORMATS[output_format]
+        if os.path.splitext(output_path)[1] != ext:
+            with Image.open(output_path) as card:
+                converted_path = os.path.join(work_dir, "card" + ext)
+                written.append(converted_path)
+                card.convert('RGB').save(converted_path, pil_format, quality=95, dpi=card.info.get('dpi', (300, 300)))
+            output_path = converted_path
+
+        with open(output_path, 'rb') as f:
+            return f.read(), cached
+    finally:
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class RenderService:
+    """미리 띄운 워커 풀 + 대기열 제한"""
+
+    def __init__(self, makers=None, workers=None, max_queue=DEFAULT_MAX_QUEUE, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            makers: {제작기 종류: 템플릿 경로} (기본: DEFAULT_MAKERS)
+            workers: 워커 프로세스 수 = 동시에 렌더링하는 카드 수 (기본: CPU 코어 수)
+            max_queue: 워커가 모두 바쁠 때 기다릴 수 있는 요청 수 (넘으면 ServiceBusyError)
+            timeout: 요청 하나의 최대 대기 + 렌더링 시간 (초)
+        """
+        self.makers = dict(makers or DEFAULT_MAKERS)
+        for maker_kind in self.makers:
+            if maker_kind not in DEFAULT_MAKERS:
+                raise ValueError(f"알 수 없는 제작기 종류: {maker_kind}")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_service_worker,
+                                         initargs=(self.makers,))
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {'requests': 0, 'rendered': 0, 'cached': 0, 'rejected': 0, 'failed': 0,
+                      'in_flight': 0, 'render_ms_total': 0.0}
+
+    def warm_up(self):
+        """모든 워커를 띄워 제작기/템플릿/폰트 로드를 끝냄 (첫 요청이 느리지 않도록)"""
+        futures = [self._pool.submit(_warm_ping) for _ in range(self.workers)]
+        pids = {future.result() for future in futures}
+        print(f"✓ 워커 {len(pids)}개 준비 완료 (제작기: {', '.join(self.makers)})")
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _release_slot(self, future):
+        self._count('in_flight', -1)
+        self._slots.release()
+
+    def render(self, maker_kind, student, photo_bytes, photo_ext='.jpg', output_format=None):
+        """
+        카드 한 장 렌더링 (요청 스레드에서 호출, 완료될 때까지 대기)
+
+        Returns:
+            (카드 파일 바이트, Content-Type, 렌더 캐시 사용 여부)
+        """
+        self._count('requests')
+        if maker_kind not in self.makers:
+            raise RenderRequestError(f"이 서버에서 제공하지 않는 제작기입니다: {maker_kind}")
+        output_format = output_format or ('jpeg' if maker_kind == MAKER_PHOTO else 'png')
+        if output_format not in OUTPUT_FORMATS:
+            raise RenderRequestError(f"지원하지 않는 출력 형식입니다: {output_format} (png/jpeg)")
+
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise ServiceBusyError("대기 중인 요청이 너무 많습니다")
+        self._count('in_flight')
+        started = time.perf_counter()
+        try:
+            future = self._pool.submit(_render_request, maker_kind, student, photo_bytes, photo_ext, output_format)
+        except Exception:
+            self._release_slot(None)
+            raise
+        # 시간 초과로 응답을 포기해도 워커가 끝날 때까지는 자리를 차지하므로 완료 시 반납
+        future.add_done_callback(self._release_slot)
+
+        try:
+            data, cached = future.result(timeout=self.timeout)
+        except Exception:   # 시간 초과(FutureTimeoutError) 포함
+            self._count('failed')
+            raise
+
+        self._count('rendered')
+        self._count('cached', int(cached))
+        self._count('render_ms_total', (time.perf_counter() - started) * 1000)
+        return data, OUTPUT_FORMATS[output_format][1], cached
+
+    def health(self):
+        """상태 정보 (GET /health)"""
+        with self._lock:
+            stats = dict(self.stats)
+        rendered = stats.pop('render_ms_total')
+        stats['mean_ms'] = round(rendered / stats['rendered'], 1) if stats['rendered'] else None
+        return {
+            'status': 'ok',
+            'makers': self.makers,
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'uptime_s': round(time.time() - self.started),
+            'stats': stats,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _normalize_field(key):
+    key = key.strip()
+    return FIELD_ALIASES.get(key) or FIELD_ALIASES.get(key.lower()) or key.lower()
+
+
+def parse_multipart(content_type, body):
+    """
+    multipart/form-data 본문 → (필드 딕셔너리, 사진 (파일 이름, 바이트) 또는 None)
+    """
+    message = BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode('latin-1') + b"\r\n\r\n" + body)
+    if not message.is_multipart():
+        raise RenderRequestError("multipart/form-data 형식이 아닙니다")
+
+    fields = {}
+    photo = None
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if not name:
+            continue
+        payload = part.get_payload(decode=True) or b''
+        filename = part.get_filename()
+        if filename is not None or _normalize_field(name) == 'photo_path':
+            photo = (filename or '', payload)
+        else:
+            fields[_normalize_field(name)] = payload.decode(part.get_content_charset() or 'utf-8').strip()
+    return fields, photo
+
+
+def build_request(maker_kind, fields, photo):
+    """
+    요청 필드 검증 → (학생 정보, 사진 바이트, 사진 확장자)
+    """
+    if photo is None or not photo[1]:
+        raise RenderRequestError("사진 파일이 없습니다 (photo 필드로 업로드)")
+    filename, photo_bytes = photo
+
+    try:
+        with Image.open(io.BytesIO(photo_bytes)) as image:
+            detected = image.format
+    except Exception:
+        raise RenderRequestError("사진 파일을 읽을 수 없습니다 (JPEG/PNG/WEBP 등 이미지만 가능)")
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in PHOTO_EXTENSIONS:
+        ext = '.' + detected.lower() if detected else '.jpg'
+
+    student = {key: value for key, value in fields.items() if key not in ('format', 'photo_path')}
+    errors = validate_student(dict(student, photo_path=filename or 'upload'),
+                              REQUIRED_FIELDS[maker_kind], check_photo=False)
+    if errors:
+        raise RenderRequestError("학생 정보가 올바르지 않습니다", errors)
+    return student, photo_bytes, ext
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """GET /health, POST /render/<제작기>"""
+
+    server_version = "StudentCardRender/1.0"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        if path == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': "없는 주소입니다 (GET /health, POST /render/<제작기>)"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'render':
+            self._send_json(404, {'error': "없는 주소입니다 (POST /render/<제작기>)"})
+            return
+        maker_kind = parts[1]
+        if maker_kind not in self.server.service.makers:
+            self._send_json(404, {'error': f"이 서버에서 제공하지 않는 제작기입니다: {maker_kind}"})
+            self.close_connection = True
+            return
+        if not self._check_length():
+            return
+        length = int(self.headers['Content-Length'])
+        body = self.rfile.read(length)
+
+        try:
+            # 쿼리 문자열 필드 + (multipart 필드 또는 본문 전체가 사진)
+            fields = {_normalize_field(k): v[-1].strip() for k, v in parse_qs(url.query).items()}
+            content_type = self.headers.get('Content-Type', '')
+            if content_type.startswith('multipart/form-data'):
+                form_fields, photo = parse_multipart(content_type, body)
+                fields.update(form_fields)
+            else:
+                photo = ('', body)
+            output_format = fields.get('format', '').lower().replace('jpg', 'jpeg') or None
+
+            student, photo_bytes, photo_ext = build_request(maker_kind, fields, photo)
+            data, content_type, cached = self.server.service.render(
+                maker_kind, student, photo_bytes, photo_ext, output_format)
+        except RenderRequestError as e:
+            self._send_json(400, {'error': str(e), 'details': e.errors})
+            return
+        except ServiceBusyError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except FutureTimeoutError:
+            self._send_json(504, {'error': "렌더링 시간이 초과되었습니다"})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"렌더링 실패: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Render-Cached', '1' if cached else '0')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_expect_100(self):
+        """Expect: 100-continue (curl 큰 업로드) - 본문을 받기 전에 크기부터 확인"""
+        if self.command == 'POST' and not self._check_length():
+            return False
+        return super().handle_expect_100()
+
+    def _check_length(self):
+        """Content-Length 확인 (없거나 너무 크면 오류 응답 후 False)"""
+        length = self.headers.get('Content-Length', '')
+        if not length.isdigit():
+            self._send_json(411, {'error': "Content-Length가 필요합니다"})
+        elif int(length) > self.server.max_upload_bytes:
+            limit_mb = self.server.max_upload_bytes // (1024 * 1024)
+            self._send_json(413, {'error': f"업로드가 너무 큽니다 (최대 {limit_mb}MB)"})
+        else:
+            return True
+        # 읽지 않은 본문이 남아 있으므로 연결 종료
+        self.close_connection = True
+        return False
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+class RenderServer(ThreadingHTTPServer):
+    """요청마다 스레드 하나 (렌더링 자체는 RenderService 워커 풀에서)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES):
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+        super().__init__(address, RenderRequestHandler)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, makers=None, workers=None, max_queue=DEFAULT_MAX_QUEUE,
+          timeout=DEFAULT_TIMEOUT, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES):
+    """렌더 서버 실행 (Ctrl+C로 종료)"""
+    service = RenderService(makers, workers, max_queue, timeout)
+    service.warm_up()
+    server = RenderServer((host, port), service, max_upload_bytes)
+    print(f"🚀 렌더 서버 시작: http://{host}:{server.server_port} "
+          f"(동시 렌더링 {service.workers}장, 대기열 {max_queue}건)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 렌더 서버 종료 중...")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="학생증 렌더 서버 (로컬/LAN HTTP)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="바인드 주소 (LAN 공개: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--maker', action='append', metavar='종류=템플릿',
+                        help="제공할 제작기와 템플릿 (예: template=background_frame3.jpg, 여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--workers', type=int, default=None, help="워커 수 = 동시에 렌더링하는 카드 수 (기본: CPU 코어 수)")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE, help="워커가 바쁠 때 기다릴 수 있는 요청 수")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="요청 하나의 최대 시간 (초)")
+    parser.add_argument('--max-upload-mb', type=int, default=DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024))
+    args = parser.parse_args()
+
+    makers = None
+    if args.maker:
+        makers = {}
+        for spec in args.maker:
+            kind, _, template = spec.partition('=')
+            makers[kind] = template or DEFAULT_MAKERS.get(kind, '')
+
+    serve(args.host, args.port, makers, args.workers, args.max_queue, args.timeout,
+          args.max_upload_mb * 1024 * 1024)
@@ -0,0 +1,266 @@
+"""
+렌더링 단계별 시간 측정 (span / 타이머)
+- 카드 한 장을 span으로 감싸고, 단계(템플릿, 사진, 텍스트, 저장 ...)는 lap으로 기록
+- 결과는 JSON lines 파일(프로세스 여러 개가 함께 추가 가능)과 단계별 히스토그램 요약으로 출력
+- 꺼져 있으면 span/lap이 아무 일도 하지 않는 공용 객체를 돌려주므로 비용이 거의 없음
+- 환경 변수 STUDENT_CARD_TRACE로 GUI에서도 켤 수 있음
+    STUDENT_CARD_TRACE=summary          → 종료 시 히스토그램 요약 출력
+    STUDENT_CARD_TRACE=trace.jsonl      → JSON lines 기록 + 종료 시 요약 출력
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+
+TRACE_ENV = "STUDENT_CARD_TRACE"
+
+# 히스토그램 구간 상한 (ms)
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_enabled = False
+_histogram = None        # span 이름 → [소요 시간(ms)]
+_jsonl_file = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NoopSpan:
+    """측정이 꺼져 있을 때 쓰는 공용 span (아무것도 기록하지 않음)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def lap(self, name, **attrs):
+        pass
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """측정 구간 하나 (중첩 가능, 이름은 부모 이름/자기 이름)"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.started = None
+        self._mark = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        if self.parent is not None:
+            self.name = f"{self.parent.name}/{self.name}"
+        stack.append(self)
+        self.started = self._mark = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        now = time.perf_counter()
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        _record(self.name, (now - self.started) * 1000, self.attrs)
+        if self.parent is not None:
+            # 부모의 다음 lap은 이 구간이 끝난 뒤부터 계산
+            self.parent._mark = now
+        return False
+
+    def lap(self, name, **attrs):
+        """직전 lap(또는 span 시작/자식 span 종료) 이후 시간을 단계 name으로 기록"""
+        now = time.perf_counter()
+        _record(f"{self.name}/{name}", (now - self._mark) * 1000, attrs)
+        self._mark = now
+
+    def set(self, **attrs):
+        """span에 속성 추가 (JSON lines에 함께 기록)"""
+        self.attrs.update(attrs)
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(name, ms, attrs):
+    line = None
+    if _jsonl_file is not None:
+        entry = {'ts': round(time.time(), 6), 'pid': os.getpid(), 'span': name, 'ms': round(ms, 3)}
+        entry.update(attrs)
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+    with _lock:
+        if _histogram is not None:
+            _histogram.setdefault(name, []).append(ms)
+        if line is not None and _jsonl_file is not None:
+            _jsonl_file.write(line)
+            _jsonl_file.flush()
+
+
+def span(name, **attrs):
+    """
+    측정 구간 시작
+
+        with span('pointman.card', name=student['name']) as card:
+            ...
+            card.lap('photo')
+            ...
+            card.lap('text')
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def current_span():
+    """현재 스레드에서 진행 중인 span (없거나 측정이 꺼져 있으면 아무것도 하지 않는 span)"""
+    if not _enabled:
+        return _NOOP
+    stack = _stack()
+    return stack[-1] if stack else _NOOP
+
+
+def traced(name):
+    """함수 전체를 span으로 감싸는 데코레이터 (함수 안에서는 current_span().lap 사용)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable_tracing(jsonl_path=None, histogram=True):
+    """
+    측정 켜기
+
+    Args:
+        jsonl_path: 지정하면 구간마다 JSON 한 줄씩 추가 기록
+        histogram: True면 메모리에 단계별 소요 시간을 모아 print_summary()로 출력
+    """
+    global _enabled, _histogram, _jsonl_file
+    with _lock:
+        if _jsonl_file is not None:
+            _jsonl_file.close()
+            _jsonl_file = None
+        if jsonl_path:
+            output_dir = os.path.dirname(jsonl_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            _jsonl_file = open(jsonl_path, 'a', encoding='utf-8')
+        _histogram = {} if histogram else None
+        _enabled = True
+
+
+def disable_tracing():
+    """측정 끄기 (기록 파일 닫기)"""
+    global _enabled, _jsonl_file
+    with _lock:
+        _enabled = False
+        if _jsonl_file is not None:
+            _jsonl_file.close()
+            _jsonl_file = None
+
+
+def tracing_enabled():
+    return _enabled
+
+
+def _percentile(values, fraction):
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(durations):
+    """
+    span 이름 → 소요 시간 목록을 히스토그램 요약 문자열로
+
+    Args:
+        durations: {span 이름: [ms, ...]}
+    """
+    if not durations:
+        return "📊 측정된 구간이 없습니다"
+
+    lines = ["📊 렌더링 단계별 소요 시간 (ms)",
+             f"{'구간':<40} {'횟수':>6} {'평균':>8} {'p50':>8} {'p95':>8} {'최대':>8}  분포"]
+    for name in sorted(durations):
+        values = sorted(durations[name])
+        buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for value in values:
+            index = 0
+            while index < len(HISTOGRAM_BOUNDS_MS) and value > HISTOGRAM_BOUNDS_MS[index]:
+                index += 1
+            buckets[index] += 1
+        peak = max(buckets)
+        bars = "".join(" ▁▂▃▄▅▆▇█"[0 if not count else max(1, round(count / peak * 8))] for count in buckets)
+        lines.append(f"{name:<40} {len(values):>6} {sum(values) / len(values):>8.1f} "
+                     f"{_percentile(values, 0.5):>8.1f} {_percentile(values, 0.95):>8.1f} {values[-1]:>8.1f}  {bars}")
+    bounds = " ".join(str(bound) for bound in HISTOGRAM_BOUNDS_MS)
+    lines.append(f"   분포 구간 상한(ms): {bounds} ∞")
+    return "\n".join(lines)
+
+
+def print_summary():
+    """지금까지 모은 히스토그램 요약 출력"""
+    with _lock:
+        durations = {name: list(values) for name, values in (_histogram or {}).items()}
+    print(summarize(durations))
+
+
+def reset_summary():
+    with _lock:
+        if _histogram is not None:
+            _histogram.clear()
+
+
+def load_jsonl(jsonl_path):
+    """JSON lines 기록 → {span 이름: [ms, ...]} (일괄 생성 워커들의 기록을 합칠 때)"""
+    durations = {}
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            durations.setdefault(entry['span'], []).append(entry['ms'])
+    return durations
+
+
+def _configure_from_env():
+    setting = os.environ.get(TRACE_ENV, "").strip()
+    if not setting or setting.lower() in ("0", "off", "false"):
+        return
+    enable_tracing(jsonl_path=None if setting.lower() == "summary" else setting)
+    atexit.register(print_summary)
+
+
+_configure_from_env()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON lines 측정 기록을 단계별 히스토그램으로 요약")
+    parser.add_argument('trace', help="측정 기록 파일 (.jsonl)")
+    args = parser.parse_args()
+
+    print(summarize(load_jsonl(args.trace)))
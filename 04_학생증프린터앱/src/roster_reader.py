@@ -0,0 +1,245 @@
+"""
+학생 명단(로스터) 읽기
+- CSV / XLSX / JSONL 파일을 한 줄씩 지연 로딩 (명단 크기와 관계없이 메모리 일정)
+- 렌더링 전에 빠른 검증 패스로 잘못된 행을 한꺼번에 보고
+"""
+
+import csv
+import datetime
+import json
+import os
+import re
+
+# 생년월일 형식 (PhotoCardMaker와 동일: YYYY.MM.DD)
+BIRTH_DATE_PATTERN = re.compile(r'^\d{4}\.\d{2}\.\d{2}$')
+
+# 한글/대체 헤더 → 내부 필드명
+FIELD_ALIASES = {
+    '이름': 'name',
+    '성명': 'name',
+    '학번': 'student_id',
+    'id': 'student_id',
+    '생년월일': 'birth_date',
+    'birth': 'birth_date',
+    'birthday': 'birth_date',
+    '사진': 'photo_path',
+    '사진경로': 'photo_path',
+    'photo': 'photo_path',
+    '학과': 'department',
+    '학년': 'grade',
+    '반': 'class',
+    '학교명': 'school_name',
+    '학교': 'school_name',
+}
+
+# 제작기별 필수 필드
+REQUIRED_FIELDS = {
+    'pointman': ('name', 'student_id', 'photo_path'),
+    'template': ('name', 'photo_path'),
+    'photo': ('name', 'birth_date', 'photo_path'),
+}
+
+ROSTER_EXTENSIONS = ('.csv', '.xlsx', '.jsonl')
+
+
+class RosterValidationError(ValueError):
+    """명단 검증 실패 (errors: [(행 번호, 메시지), ...])"""
+
+    def __init__(self, roster_path, errors):
+        self.roster_path = roster_path
+        self.errors = errors
+        super().__init__(f"{roster_path}: 잘못된 행 {len(errors)}개")
+
+
+def _normalize_key(key):
+    key = str(key or '').strip()
+    lowered = key.lower()
+    return FIELD_ALIASES.get(key) or FIELD_ALIASES.get(lowered) or lowered
+
+
+def _normalize_value(key, value):
+    """셀 값을 문자열로 정리 (엑셀 숫자/날짜 포함)"""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime('%Y.%m.%d') if key == 'birth_date' else value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _normalize_row(raw, roster_dir):
+    row = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        key = _normalize_key(key)
+        row[key] = _normalize_value(key, value)
+
+    # 상대 경로 사진은 현재 폴더 → 명단 파일 폴더 순서로 찾음
+    photo_path = row.get('photo_path')
+    if photo_path and not os.path.isabs(photo_path) and not os.path.exists(photo_path):
+        candidate = os.path.join(roster_dir, photo_path)
+        if os.path.exists(candidate):
+            row['photo_path'] = candidate
+    return row
+
+
+def _iter_csv(roster_path):
+    with open(roster_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        for raw in reader:
+            yield reader.line_num, raw
+
+
+def _iter_jsonl(roster_path):
+    with open(roster_path, 'r', encoding='utf-8-sig') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                raw = {'__error__': f"JSON 형식 오류: {e}"}
+            if not isinstance(raw, dict):
+                raw = {'__error__': "JSON 객체가 아닙니다"}
+            yield line_no, raw
+
+
+def _iter_xlsx(roster_path):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("XLSX 명단을 읽으려면 openpyxl이 필요합니다. pip install openpyxl")
+
+    # read_only 모드는 시트를 스트리밍으로 읽음
+    workbook = openpyxl.load_workbook(roster_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for row_no, values in enumerate(rows, 2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield row_no, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_roster(roster_path):
+    """
+    명단 파일을 한 행씩 읽기
+
+    Yields:
+        (행 번호, 학생 정보 딕셔너리) - 키는 name/student_id/birth_date/photo_path 등으로 정규화
+    """
+    ext = os.path.splitext(roster_path)[1].lower()
+    if ext == '.csv':
+        rows = _iter_csv(roster_path)
+    elif ext == '.xlsx':
+        rows = _iter_xlsx(roster_path)
+    elif ext == '.jsonl':
+        rows = _iter_jsonl(roster_path)
+    else:
+        raise ValueError(f"지원하지 않는 명단 형식입니다: {ext} (CSV/XLSX/JSONL만 가능)")
+
+    roster_dir = os.path.dirname(os.path.abspath(roster_path))
+    for row_no, raw in rows:
+        if '__error__' in raw:
+            yield row_no, raw
+        else:
+            yield row_no, _normalize_row(raw, roster_dir)
+
+
+def validate_student(student, required_fields=REQUIRED_FIELDS['pointman'], check_photo=True):
+    """학생 한 명의 필드 검증 → 오류 메시지 리스트"""
+    if '__error__' in student:
+        return [student['__error__']]
+
+    errors = []
+    for field in required_fields:
+        if not student.get(field):
+            errors.append(f"'{field}' 값이 비어 있습니다")
+
+    birth_date = student.get('birth_date')
+    if birth_date and not BIRTH_DATE_PATTERN.match(birth_date):
+        errors.append(f"생년월일은 YYYY.MM.DD 형식이어야 합니다: {birth_date}")
+
+    photo_path = student.get('photo_path')
+    if check_photo and photo_path and not os.path.exists(photo_path):
+        errors.append(f"사진 파일을 찾을 수 없습니다: {photo_path}")
+
+    return errors
+
+
+def validate_roster(roster_path, required_fields=REQUIRED_FIELDS['pointman'], check_photos=True, output_name=None):
+    """
+    명단 전체를 한 번 훑어 잘못된 행을 수집 (이미지는 열지 않음)
+
+    Args:
+        output_name: 학생 → 출력 파일 이름 (제작기의 batch_output_path) - 지정하면 이 이름이 겹치는 행을 보고,
+                     없으면 학번 중복을 보고
+
+    Returns:
+        (유효한 행 수, [(행 번호, 메시지), ...])
+    """
+    errors = []
+    valid_count = 0
+    seen_ids = {}
+    seen_outputs = {}
+
+    for row_no, student in iter_roster(roster_path):
+        row_errors = validate_student(student, required_fields, check_photos)
+
+        # 출력 파일 이름이 겹치면 앞 학생의 카드를 덮어쓰므로 (병렬 생성에서는 같은 파일을 동시에 씀) 함께 보고
+        if output_name is not None:
+            if not row_errors:
+                name = output_name(student)
+                if name in seen_outputs:
+                    row_errors.append(f"출력 파일 {name}이(가) {seen_outputs[name]}행과 겹칩니다")
+                else:
+                    seen_outputs[name] = row_no
+        else:
+            student_id = student.get('student_id')
+            if student_id:
+                if student_id in seen_ids:
+                    row_errors.append(f"학번 {student_id}이(가) {seen_ids[student_id]}행과 중복됩니다")
+                else:
+                    seen_ids[student_id] = row_no
+
+        if row_errors:
+            errors.extend((row_no, message) for message in row_errors)
+        else:
+            valid_count += 1
+
+    return valid_count, errors
+
+
+def read_roster(roster_path, required_fields=REQUIRED_FIELDS['pointman'], check_photos=True, output_name=None):
+    """
+    명단을 검증한 뒤 학생 정보를 지연 로딩하는 이터레이터 반환
+
+    검증 패스에서 잘못된 행이 하나라도 있으면 렌더링 전에 RosterValidationError 발생
+
+    Args:
+        output_name: 학생 → 출력 파일 이름 (validate_roster 참고)
+
+    Returns:
+        (학생 수, 학생 정보 딕셔너리 이터레이터)
+    """
+    valid_count, errors = validate_roster(roster_path, required_fields, check_photos, output_name)
+    if errors:
+        raise RosterValidationError(roster_path, errors)
+
+    students = (student for _, student in iter_roster(roster_path))
+    return valid_count, students
+
+
+def print_roster_errors(errors, limit=50):
+    """검증 오류 출력"""
+    for row_no, message in errors[:limit]:
+        print(f"  ❌ {row_no}행: {message}")
+    if len(errors) > limit:
+        print(f"  ... 외 {len(errors) - limit}개")
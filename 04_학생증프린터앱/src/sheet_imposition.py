@@ -0,0 +1,247 @@
+"""
+N-up 시트 배치 (교정쇄 / 일반 프린터 대체 인쇄용)
+- 완성된 학생증(54x86mm, 300 DPI)을 A4/Letter 용지에 격자로 배치하고 재단선 표시
+- 페이지를 하나씩 만들어 바로 다중 페이지 PDF/TIFF에 추가 → 메모리에는 현재 페이지와 카드 한 장만 유지
+"""
+
+import os
+from PIL import Image, ImageDraw, TiffImagePlugin
+
+# 용지 크기 (폭, 높이 mm)
+PAGE_SIZES_MM = {
+    'A4': (210.0, 297.0),
+    'Letter': (215.9, 279.4),
+}
+
+# CR80 카드 (세로 기준 폭, 높이 mm)
+CARD_SIZE_MM = (54.0, 86.0)
+
+DPI = 300
+
+SHEET_FORMATS = {
+    '.pdf': 'PDF',
+    '.tif': 'TIFF',
+    '.tiff': 'TIFF',
+}
+
+
+def mm_to_px(mm, dpi=DPI):
+    return int(round(mm / 25.4 * dpi))
+
+
+class SheetLayout:
+    """용지 한 장의 카드 배치 (카드 위치/재단선 계산)"""
+
+    def __init__(self, page='A4', dpi=DPI, margin_mm=10.0, gap_mm=8.0, orientation=None,
+                 crop_mark_mm=3.0, crop_offset_mm=1.0):
+        """
+        Args:
+            page: 'A4' 또는 'Letter'
+            margin_mm: 용지 여백
+            gap_mm: 카드 사이 간격 (재단선이 들어갈 자리)
+            orientation: 'portrait' / 'landscape' / None(더 많이 들어가는 방향)
+            crop_mark_mm: 재단선 길이 (간격/여백이 좁으면 자동으로 줄어듦)
+            crop_offset_mm: 카드 모서리와 재단선 사이 거리
+        """
+        if page not in PAGE_SIZES_MM:
+            raise ValueError(f"지원하지 않는 용지 크기: {page} ({', '.join(PAGE_SIZES_MM)})")
+
+        self.page = page
+        self.dpi = dpi
+        page_w_mm, page_h_mm = PAGE_SIZES_MM[page]
+
+        if orientation is None:
+            portrait = self._grid(page_w_mm, page_h_mm, CARD_SIZE_MM, margin_mm, gap_mm)
+            landscape = self._grid(page_w_mm, page_h_mm, CARD_SIZE_MM[::-1], margin_mm, gap_mm)
+            orientation = 'landscape' if landscape[0] * landscape[1] > portrait[0] * portrait[1] else 'portrait'
+        self.orientation = orientation
+
+        card_mm = CARD_SIZE_MM if orientation == 'portrait' else CARD_SIZE_MM[::-1]
+        self.cols, self.rows = self._grid(page_w_mm, page_h_mm, card_mm, margin_mm, gap_mm)
+        if self.cols < 1 or self.rows < 1:
+            raise ValueError(f"{page} 용지에 카드가 들어가지 않습니다 (여백 {margin_mm}mm)")
+
+        self.page_size = (mm_to_px(page_w_mm, dpi), mm_to_px(page_h_mm, dpi))
+        self.card_size = (mm_to_px(card_mm[0], dpi), mm_to_px(card_mm[1], dpi))
+        gap = mm_to_px(gap_mm, dpi)
+
+        # 격자를 용지 가운데에 배치
+        grid_w = self.cols * self.card_size[0] + (self.cols - 1) * gap
+        grid_h = self.rows * self.card_size[1] + (self.rows - 1) * gap
+        left = (self.page_size[0] - grid_w) // 2
+        top = (self.page_size[1] - grid_h) // 2
+        self.positions = [
+            (left + col * (self.card_size[0] + gap), top + row * (self.card_size[1] + gap))
+            for row in range(self.rows) for col in range(self.cols)
+        ]
+
+        mark_mm = min(crop_mark_mm, gap_mm / 2 - crop_offset_mm, margin_mm - crop_offset_mm)
+        self.crop_mark = mm_to_px(mark_mm, dpi) if mark_mm > 0 else 0
+        self.crop_offset = mm_to_px(crop_offset_mm, dpi)
+
+    @staticmethod
+    def _grid(page_w_mm, page_h_mm, card_mm, margin_mm, gap_mm):
+        """용지에 들어가는 (열, 행) 수"""
+        cols = int((page_w_mm - 2 * margin_mm + gap_mm) // (card_mm[0] + gap_mm))
+        rows = int((page_h_mm - 2 * margin_mm + gap_mm) // (card_mm[1] + gap_mm))
+        return cols, rows
+
+    @property
+    def per_page(self):
+        return len(self.positions)
+
+    def new_page(self):
+        return Image.new('RGB', self.page_size, 'white')
+
+    def draw_crop_marks(self, page, count):
+        """앞에서부터 count장의 카드 모서리에 재단선 그리기"""
+        if not self.crop_mark:
+            return
+        draw = ImageDraw.Draw(page)
+        offset, length = self.crop_offset, self.crop_mark
+        width, height = self.card_size
+        for x, y in self.positions[:count]:
+            for cx in (x, x + width - 1):
+                for cy in (y, y + height - 1):
+                    # 가로선: 카드 바깥쪽으로
+                    sx = cx - offset - length if cx == x else cx + offset
+                    draw.line([(sx, cy), (sx + length, cy)], fill='black', width=1)
+                    # 세로선: 카드 바깥쪽으로
+                    sy = cy - offset - length if cy == y else cy + offset
+                    draw.line([(cx, sy), (cx, sy + length)], fill='black', width=1)
+
+    def fit_card(self, card):
+        """카드 이미지를 배치 방향/크기에 맞춤 (투명 부분은 흰색)"""
+        if card.mode != 'RGB':
+            if 'A' in card.getbands() or 'transparency' in card.info:
+                rgba = card.convert('RGBA')
+                card = Image.new('RGB', rgba.size, 'white')
+                card.paste(rgba, mask=rgba.getchannel('A'))
+            else:
+                card = card.convert('RGB')
+
+        if (card.width > card.height) != (self.card_size[0] > self.card_size[1]):
+            card = card.transpose(Image.Transpose.ROTATE_90)
+        if card.size != self.card_size:
+            card = card.resize(self.card_size, Image.Resampling.LANCZOS)
+        return card
+
+
+def iter_sheets(card_paths, layout):
+    """
+    카드 파일들을 용지에 배치하며 페이지를 하나씩 내보내는 제너레이터
+
+    Yields:
+        (페이지 이미지, 이 페이지의 카드 수)
+    """
+    page = None
+    count = 0
+    for card_path in card_paths:
+        if page is None:
+            page = layout.new_page()
+            count = 0
+        with Image.open(card_path) as card:
+            page.paste(layout.fit_card(card), layout.positions[count])
+        count += 1
+
+        if count == layout.per_page:
+            layout.draw_crop_marks(page, count)
+            yield page, count
+            page = None
+
+    if page is not None:
+        layout.draw_crop_marks(page, count)
+        yield page, count
+
+
+class SheetWriter:
+    """다중 페이지 PDF/TIFF에 페이지를 하나씩 추가"""
+
+    def __init__(self, output_path, dpi=DPI):
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext not in SHEET_FORMATS:
+            raise ValueError(f"지원하지 않는 시트 형식: {ext} (PDF/TIFF만 가능)")
+        self.output_path = output_path
+        self.format = SHEET_FORMATS[ext]
+        self.dpi = dpi
+        self.pages = 0
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # TIFF 파일은 첫 페이지를 추가할 때 생성 (카드가 없으면 빈 파일을 남기지 않음)
+        self._file = None
+        self._tiff = None
+
+    def add_page(self, page):
+        if self.format == 'PDF':
+            # 첫 페이지 이후에는 기존 PDF 뒤에 페이지만 덧붙임 (이전 페이지를 다시 쓰지 않음)
+            page.save(self.output_path, 'PDF', resolution=self.dpi, quality=95, append=self.pages > 0)
+        else:
+            if self._tiff is None:
+                self._file = open(self.output_path, 'w+b')
+                self._tiff = TiffImagePlugin.AppendingTiffWriter(self._file, new=True)
+            page.save(self._tiff, 'TIFF', compression='tiff_adobe_deflate', dpi=(self.dpi, self.dpi))
+            self._tiff.newFrame()
+        self.pages += 1
+
+    def close(self):
+        if self._tiff is not None:
+            self._tiff.close()
+            self._file.close()
+            self._tiff = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_sheets(card_paths, output_path, page='A4', verbose=True, **layout_options):
+    """
+    카드 파일들을 N-up 시트 PDF/TIFF로 저장
+
+    Args:
+        card_paths: 카드 이미지 경로들 (리스트 또는 지연 로딩 이터레이터)
+        output_path: .pdf / .tif / .tiff
+        page: 'A4' 또는 'Letter'
+        layout_options: SheetLayout 옵션 (margin_mm, gap_mm, orientation ...)
+
+    Returns:
+        (페이지 수, 카드 수)
+    """
+    layout = SheetLayout(page=page, **layout_options)
+    if verbose:
+        print(f"📄 {page} 용지에 {layout.cols}x{layout.rows} ({layout.per_page}장/페이지, "
+              f"{'세로' if layout.orientation == 'portrait' else '가로'} 카드) 배치 중...")
+
+    cards = 0
+    with SheetWriter(output_path, dpi=layout.dpi) as writer:
+        for sheet, count in iter_sheets(card_paths, layout):
+            writer.add_page(sheet)
+            cards += count
+            if verbose:
+                print(f"  ✓ {writer.pages}페이지 ({cards}장)")
+        pages = writer.pages
+
+    if verbose:
+        print(f"✅ 시트 저장 완료: {output_path} ({pages}페이지, 카드 {cards}장)")
+    return pages, cards
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="완성된 학생증을 A4/Letter 시트(PDF/TIFF)로 배치")
+    parser.add_argument('cards', nargs='+', help="카드 이미지 파일")
+    parser.add_argument('-o', '--output', default='student_cards_sheet.pdf', help="출력 파일 (.pdf / .tif)")
+    parser.add_argument('--page', choices=sorted(PAGE_SIZES_MM), default='A4')
+    parser.add_argument('--orientation', choices=['portrait', 'landscape'], default=None)
+    parser.add_argument('--margin', type=float, default=10.0, help="여백 (mm)")
+    parser.add_argument('--gap', type=float, default=8.0, help="카드 간격 (mm)")
+    args = parser.parse_args()
+
+    write_sheets(args.cards, args.output, page=args.page, orientation=args.orientation,
+                 margin_mm=args.margin, gap_mm=args.gap)
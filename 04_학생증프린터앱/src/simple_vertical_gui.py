@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
 import glob
+from render_executor import RenderExecutor, queue_status_text
+from print_spooler import get_spooler, STATUS_DONE
 
 def create_simple_gui():
     """간단한 세로 학생증 GUI"""
@@ -35,6 +37,10 @@ def create_simple_gui():
     current_photo_index = [0]  # 리스트로 감싸서 참조 가능하게
     current_photo_path = [""]
     
+    # 렌더링/인쇄는 백그라운드에서 실행 (생성 중에도 다음 학생 입력 가능)
+    executor = RenderExecutor(root, on_queue_change=lambda count: queue_label.config(text=queue_status_text(count)))
+    printer = [None]  # 프린터 객체는 한 번만 생성 (작업 스레드에서 사용)
+    
     def load_photos():
         """사진 로드"""
         nonlocal photo_files
@@ -66,8 +72,8 @@ def create_simple_gui():
             current_photo_path[0] = photo_files[current_photo_index[0]]
             photo_label.config(text=f"사진 {current_photo_index[0]+1}/{len(photo_files)}: {os.path.basename(current_photo_path[0])}")
     
-    def create_card():
-        """학생증 생성"""
+    def create_card(on_created=None):
+        """학생증 생성 (on_created(출력 경로): 생성 성공 후 호출)"""
         if not student_name.get().strip():
             messagebox.showerror("오류", "이름을 입력해주세요")
             return
@@ -76,75 +82,87 @@ def create_simple_gui():
             messagebox.showerror("오류", "사진을 선택해주세요")
             return
         
-        try:
+        # 입력값은 제출 시점에 고정
+        student_data = {
+            'name': student_name.get().strip(),
+            'student_id': student_id.get().strip(),
+            'photo_path': current_photo_path[0],
+            'department': department.get().strip(),
+            'grade': grade.get().strip(),
+            'school_name': school_name.get().strip()
+        }
+        card_orientation = orientation.get()
+        
+        safe_name = "".join(c for c in student_data['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        orientation_text = "세로" if card_orientation == "portrait" else "가로"
+        output_path = f"output/{student_data['student_id']}_{safe_name}_{orientation_text}_학생증.png"
+        
+        def render():
+            """작업 스레드: 학생증 생성"""
             from pointman_card_printer import PointmanCardPrinter
             
-            printer = PointmanCardPrinter()
-            
-            student_data = {
-                'name': student_name.get().strip(),
-                'student_id': student_id.get().strip(),
-                'photo_path': current_photo_path[0],
-                'department': department.get().strip(),
-                'grade': grade.get().strip(),
-                'school_name': school_name.get().strip()
-            }
+            if printer[0] is None:
+                printer[0] = PointmanCardPrinter()
             
             if not os.path.exists('output'):
-                os.makedirs('output')
-            
-            safe_name = "".join(c for c in student_data['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
-            orientation_text = "세로" if orientation.get() == "portrait" else "가로"
-            output_path = f"output/{student_data['student_id']}_{safe_name}_{orientation_text}_학생증.png"
-            
-            status_label.config(text="학생증 생성 중...")
-            root.update()
+                os.makedirs('output', exist_ok=True)
             
-            success = printer.create_student_card(
+            return printer[0].create_student_card(
                 template_path='card_template.png',
                 student_data=student_data,
                 output_path=output_path,
-                orientation=orientation.get()
+                orientation=card_orientation
             )
-            
+        
+        def on_done(success):
             if success:
                 status_label.config(text="✅ 학생증 생성 완료!")
                 messagebox.showinfo("성공", f"{orientation_text} 학생증이 생성되었습니다!\n\n파일: {output_path}")
+                if on_created:
+                    on_created(output_path)
             else:
                 status_label.config(text="❌ 생성 실패")
                 messagebox.showerror("오류", "학생증 생성에 실패했습니다")
-                
-        except Exception as e:
+        
+        def on_error(e):
             status_label.config(text="❌ 오류 발생")
             messagebox.showerror("오류", f"학생증 생성 중 오류:\n{str(e)}")
-    
-    def print_card():
-        """학생증 인쇄"""
-        create_card()  # 먼저 생성
         
+        status_label.config(text="학생증 생성 중...")
+        executor.submit(render, on_done=on_done, on_error=on_error,
+                        description=f"{student_data['name']} 학생증 생성")
+    
+    def on_print_done(job):
+        """인쇄 결과 표시 (메인 스레드)"""
+        if job.status == STATUS_DONE:
+            status_label.config(text="✅ 인쇄 명령 전송!")
+            messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!")
+        else:
+            status_label.config(text="❌ 인쇄 실패")
+            messagebox.showerror("실패", f"인쇄 실패:\n{job.error}")
+    
+    def print_file(output_path):
+        """생성된 학생증을 인쇄 대기열에 추가 (인쇄는 스풀러 스레드에서 진행)"""
         try:
-            import win32api
-            
-            safe_name = "".join(c for c in student_name.get() if c.isalnum() or c in (' ', '-', '_')).strip()
-            orientation_text = "세로" if orientation.get() == "portrait" else "가로"
-            output_path = f"output/{student_id.get()}_{safe_name}_{orientation_text}_학생증.png"
-            
             if os.path.exists(output_path):
-                abs_path = os.path.abspath(output_path)
-                result = win32api.ShellExecute(0, "print", abs_path, None, ".", 0)
-                
-                if result > 32:
-                    status_label.config(text="✅ 인쇄 명령 전송!")
-                    messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!")
-                else:
-                    status_label.config(text="❌ 인쇄 실패")
-                    messagebox.showerror("실패", f"인쇄 실패 (코드: {result})")
+                get_spooler().submit(output_path, description=os.path.basename(output_path),
+                                     on_done=lambda job: executor.post(on_print_done, job))
+                status_label.config(text="🖨️ 인쇄 대기열에 추가됨")
             else:
                 messagebox.showerror("오류", "인쇄할 파일이 없습니다")
                 
         except Exception as e:
             messagebox.showerror("오류", f"인쇄 중 오류:\n{str(e)}")
     
+    def print_card():
+        """학생증 인쇄"""
+        create_card(on_created=print_file)  # 먼저 생성, 끝나면 인쇄
+    
+    def cancel_jobs():
+        """아직 시작하지 않은 작업 취소"""
+        cancelled = executor.cancel_all()
+        status_label.config(text=f"⏹ 대기 작업 {cancelled}개 취소됨")
+    
     # UI 구성
     main_frame = ttk.Frame(root, padding="20")
     main_frame.pack(fill=tk.BOTH, expand=True)
@@ -208,11 +226,19 @@ def create_simple_gui():
     status_label = ttk.Label(main_frame, text="준비됨", font=('Arial', 10))
     status_label.pack(pady=10)
     
+    # 대기열 표시 + 취소
+    queue_frame = ttk.Frame(main_frame)
+    queue_frame.pack()
+    queue_label = ttk.Label(queue_frame, text="", font=('Arial', 9), foreground='gray')
+    queue_label.pack(side=tk.LEFT, padx=(0, 10))
+    ttk.Button(queue_frame, text="⏹ 대기 작업 취소", command=cancel_jobs).pack(side=tk.LEFT)
+    
     # 초기 사진 로드
     load_photos()
     
     print("✅ GUI가 성공적으로 시작되었습니다!")
     root.mainloop()
+    executor.shutdown()
 
 if __name__ == "__main__":
     print("🚀 간단한 세로 학생증 GUI 시작...")
@@ -9,6 +9,8 @@ from PIL import Image, ImageTk
 import os
 import glob
 from pointman_card_printer import PointmanCardPrinter
+from printer_connection import close_all_connections
+from thumbnail_cache import ThumbnailCache
 
 class StudentCardGUI:
     def __init__(self, root):
@@ -24,6 +26,7 @@ class StudentCardGUI:
         self.photo_files = []
         self.current_photo_index = 0
         self.current_photo_path = ""
+        self.thumbnails = ThumbnailCache()  # 디스크/메모리 썸네일 캐시 + 앞뒤 사진 미리 로드
         
         # 학생 정보 변수
         self.student_name = tk.StringVar()
@@ -148,9 +151,9 @@ class StudentCardGUI:
             # 현재 사진 경로
             self.current_photo_path = self.photo_files[self.current_photo_index]
             
-            # 이미지 로드 및 리사이즈
-            image = Image.open(self.current_photo_path)
-            image = image.resize((200, 240), Image.Resampling.LANCZOS)
+            # 썸네일 로드 (캐시)
+            image = self.thumbnails.get(self.current_photo_path, (200, 240))
+            self.thumbnails.prefetch_neighbors(self.photo_files, self.current_photo_index, (200, 240))
             
             # tkinter용 이미지로 변환
             self.photo_image = ImageTk.PhotoImage(image)
@@ -318,9 +321,11 @@ def main():
     root = tk.Tk()
     app = StudentCardGUI(root)
     
-    # 프로그램 종료 시 프린터 연결 해제
+    # 프로그램 종료 시 프린터 연결 해제 (공유 포트도 닫음)
     def on_closing():
         app.printer.disconnect()
+        close_all_connections()
+        app.thumbnails.shutdown()
         root.destroy()
         
     root.protocol("WM_DELETE_WINDOW", on_closing)
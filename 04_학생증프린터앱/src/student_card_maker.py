@@ -3,23 +3,34 @@ Pointman N20 학생증 제작 프로그램
 PNG 파일에 사진과 텍스트를 합성하여 학생증을 만들고 프린터로 출력
 """
 
-import serial
-import time
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
+from font_registry import load_font
+from pointman_protocol import DEFAULT_COMPRESSION, FLOW_SOFTWARE, TRANSFER_STATUS, send_card
+from printer_connection import PrinterConnectionError, get_connection
+
+# 맑은 고딕
+MALGUN_FONTS = ("C:/Windows/Fonts/malgun.ttf",)
 
 class StudentCardMaker:
-    def __init__(self, com_port='COM3', baud_rate=9600):
+    def __init__(self, com_port='COM3', baud_rate=9600, flow_control=FLOW_SOFTWARE,
+                 compression=DEFAULT_COMPRESSION, transfer_mode=TRANSFER_STATUS):
         """
         학생증 제작기 초기화
         
         Args:
             com_port: 프린터가 연결된 COM 포트 (예: 'COM3')
             baud_rate: 통신 속도 (기본값: 9600)
+            flow_control: 흐름 제어 'xonxoff' / 'rtscts' / 'none'
+            compression: 프린터가 지원하는 패널 압축 방식 ('rle', 'delta' / 빈 튜플이면 압축 안 함)
+            transfer_mode: 'status' (초기화 + 상태 확인, 기본) / 'raster' (래스터 패널 전송 - 매뉴얼 확인 후 사용)
         """
         self.com_port = com_port
         self.baud_rate = baud_rate
-        self.serial_conn = None
+        self.flow_control = flow_control
+        self.compression = compression
+        self.transfer_mode = transfer_mode
+        self.connection = None   # 포트별 공유 연결 (printer_connection)
         
     def find_available_ports(self):
         """사용 가능한 COM 포트 찾기"""
@@ -30,23 +41,19 @@ class StudentCardMaker:
             available_ports.append(port.device)
         return available_ports
         
-    def connect_printer(self):
-        """프린터와 시리얼 통신 연결"""
+    def connect_printer(self, timeout=2):
+        """프린터와 시리얼 통신 연결 (포트별 공유 연결 사용)"""
         try:
-            self.serial_conn = serial.Serial(
-                port=self.com_port,
-                baudrate=self.baud_rate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=1
-            )
-            print(f"프린터 연결 성공: {self.com_port}")
-            return True
-        except Exception as e:
+            self.connection = get_connection(self.com_port, self.baud_rate, self.flow_control)
+        except PrinterConnectionError as e:
             print(f"프린터 연결 실패: {e}")
-            print("사용 가능한 포트:", self.find_available_ports())
             return False
+        if self.connection.wait_connected(timeout):
+            print(f"프린터 연결 성공: {self.com_port}")
+            return True
+        print(f"프린터 연결 실패: {self.connection.last_error}")
+        print("사용 가능한 포트:", self.find_available_ports())
+        return False
     
     def create_student_card(self, template_path, student_data, output_path):
         """
@@ -78,14 +85,9 @@ class StudentCardMaker:
             # 텍스트 추가를 위한 Draw 객체 생성
             draw = ImageDraw.Draw(template)
             
-            # 폰트 설정 (시스템 폰트 사용)
-            try:
-                font_name = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", 24)  # 맑은 고딕
-                font_id = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", 18)
-            except:
-                print("맑은 고딕 폰트를 찾을 수 없어 기본 폰트를 사용합니다.")
-                font_name = ImageFont.load_default()
-                font_id = ImageFont.load_default()
+            # 폰트 설정 (시스템 폰트 사용, 프로세스 전역 캐시)
+            font_name = load_font(24, MALGUN_FONTS)  # 맑은 고딕
+            font_id = load_font(18, MALGUN_FONTS)
             
             # 이름 추가
             name_x, name_y = 200, 100  # 이름 위치 좌표 (수정 가능)
@@ -124,26 +126,15 @@ class StudentCardMaker:
         """
         완성된 학생증을 프린터로 전송
         """
-        if not self.serial_conn:
+        if not self.connection:
             print("프린터가 연결되지 않았습니다.")
             return False
         
         try:
             print("프린터로 이미지 전송 중...")
-            
-            # 프린터 초기화
-            init_cmd = b'\x1B\x40'  # ESC @
-            self.serial_conn.write(init_cmd)
-            time.sleep(0.5)
-            
-            # 상태 확인
-            status_cmd = b'\x1B\x76'  # 상태 확인 명령
-            self.serial_conn.write(status_cmd)
-            response = self.serial_conn.read(10)
-            print(f"프린터 응답: {response}")
-            
-            print("프린터로 전송 완료")
-            return True
+            with self.connection.acquire() as conn:
+                return send_card(conn, image_path, self.transfer_mode, flow_control=self.flow_control,
+                                 compression=self.compression)
             
         except Exception as e:
             print(f"프린터 전송 실패: {e}")
@@ -151,8 +142,8 @@ class StudentCardMaker:
     
     def disconnect_printer(self):
         """프린터 연결 해제"""
-        if self.serial_conn and self.serial_conn.is_open:
-            self.serial_conn.close()
+        if self.connection:
+            self.connection = None
             print("프린터 연결 해제")
 
 # 간단한 테스트용 함수들
@@ -169,10 +160,7 @@ def create_sample_template():
     draw.rectangle([5, 5, width-5, height-5], outline='black', width=2)
     
     # 제목 추가
-    try:
-        title_font = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", 20)
-    except:
-        title_font = ImageFont.load_default()
+    title_font = load_font(20, MALGUN_FONTS)
     
     draw.text((width//2-50, 20), "학생증", font=title_font, fill='black')
     
@@ -227,7 +215,7 @@ if __name__ == "__main__":
             print(f"\n프린터 연결을 시도합니다... (포트: {available_ports[0]})")
             card_maker.com_port = available_ports[0]
             if card_maker.connect_printer():
-                # 프린터로 출력 (실제 프로토콜 구현 필요)
+                # 프린터로 출력 (주석 해제해서 사용)
                 # card_maker.send_to_printer('output/sample_card.png')
                 pass
         
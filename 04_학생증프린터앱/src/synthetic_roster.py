@@ -0,0 +1,259 @@
+"""
+부하 테스트용 가상 명단/사진 생성기
+- 시드가 같으면 항상 같은 학생 정보와 사진을 만듦 (학생마다 독립된 시드라 병렬 생성해도 결과 동일)
+- 이름은 학생마다 다름 (동명이인이 없어야 일괄 생성 부하 테스트에서 카드 수가 정확함)
+- 사진은 여러 크기(웹캠~DSLR), 형식(JPEG/PNG/WEBP), EXIF 방향, 투명도(RGBA/LA/팔레트)를 섞어서 생성
+- 사진 파일 이름은 학번 (photos/<학번>.jpg), 명단은 roster_reader가 읽는 CSV/JSONL
+- 사진은 프로세스 풀로 병렬 생성 → 수천 명 명단도 batch_renderer / 프린터 스풀러 부하 테스트에 바로 사용
+
+    python src/synthetic_roster.py loadtest --count 2000 --seed 7
+    python src/batch_renderer.py loadtest/roster.csv --maker template --output loadtest/cards
+"""
+
+import os
+import csv
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw, features
+from photo_normalizer import ORIENTATION_TRANSPOSE, EXIF_ORIENTATION
+
+ROSTER_FIELDS = ('name', 'student_id', 'birth_date', 'photo_path', 'department', 'grade', 'class', 'school_name')
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_SYLLABLES = "민서지현수우준도하윤예은채원시아주연유진성영호재희동혁태경"
+DEPARTMENTS = ('컴퓨터공학과', '전자공학과', '경영학과', '국어국문학과', '수학과', '디자인학과', '간호학과')
+SCHOOLS = ('ABC 대학교', '은하여자고등학교', '한빛고등학교', '새솔중학교')
+
+# 이름 조합 수(성 x 음절 x 음절)와 서로소인 소수 - index마다 다른 조합을 고름
+NAME_STRIDE = 7919
+
+# 사진 크기 → (이름, (폭, 높이), 가중치)
+PHOTO_PROFILES = (
+    ('webcam', (480, 640), 3),
+    ('phone', (1536, 2048), 4),
+    ('phone_hd', (3024, 4032), 2),
+    ('dslr', (5472, 7296), 1),
+)
+
+# 사진 종류 → (확장자, 가중치)
+PHOTO_KINDS = (
+    ('jpeg', '.jpg', 6),
+    ('png_rgb', '.png', 1),
+    ('png_rgba', '.png', 2),
+    ('png_la', '.png', 1),
+    ('png_palette', '.png', 1),
+    ('webp', '.webp', 1),
+)
+
+# EXIF 방향 값 → 가중치 (대부분 정방향, 휴대폰 세로 사진은 6이 흔함)
+ORIENTATION_WEIGHTS = ((1, 10), (3, 1), (6, 4), (8, 2), (2, 1), (4, 1), (5, 1), (7, 1))
+
+# 똑바로 세운 사진 → EXIF 방향대로 저장할 픽셀 (ORIENTATION_TRANSPOSE의 역변환)
+INVERSE_TRANSPOSE = {
+    orientation: {
+        Image.Transpose.ROTATE_90: Image.Transpose.ROTATE_270,
+        Image.Transpose.ROTATE_270: Image.Transpose.ROTATE_90,
+    }.get(transpose, transpose)
+    for orientation, transpose in ORIENTATION_TRANSPOSE.items()
+}
+
+# 사진을 그리는 기본 해상도 (이후 목표 크기로 확대)
+SKETCH_SIZE = (300, 400)
+
+
+def _choose(rng, weighted):
+    """[(값..., 가중치)] 중 하나 선택"""
+    return rng.choices(weighted, weights=[item[-1] for item in weighted])[0]
+
+
+def student_rng(seed, index):
+    """학생 한 명 전용 난수 생성기 (순서/병렬 여부와 무관하게 같은 값)"""
+    return random.Random(f"{seed}:{index}")
+
+
+def student_name(seed, index):
+    """index번째 학생 이름 (조합 수 안에서는 겹치지 않고, 넘으면 회차 번호를 붙임)"""
+    syllables = len(GIVEN_SYLLABLES)
+    combinations = len(SURNAMES) * syllables * syllables
+    offset = random.Random(f"{seed}:names").randrange(combinations)
+    surname, given = divmod((offset + index * NAME_STRIDE) % combinations, syllables * syllables)
+    name = SURNAMES[surname] + GIVEN_SYLLABLES[given // syllables] + GIVEN_SYLLABLES[given % syllables]
+    if index >= combinations:
+        name += str(index // combinations + 1)
+    return name
+
+
+def make_student(seed, index, max_megapixels=12):
+    """
+    index번째 가상 학생 정보와 사진 사양
+
+    Returns:
+        (학생 정보 딕셔너리, 사진 사양 딕셔너리)
+    """
+    rng = student_rng(seed, index)
+    name = student_name(seed, index)
+    birth_year = rng.randint(1995, 2012)
+    student = {
+        'name': name,
+        'student_id': f"{2020 + index % 6}{index:06d}",
+        'birth_date': f"{birth_year}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+        'department': rng.choice(DEPARTMENTS),
+        'grade': str(rng.randint(1, 3)),
+        'class': str(rng.randint(1, 12)),
+        'school_name': rng.choice(SCHOOLS),
+    }
+
+    profiles = [p for p in PHOTO_PROFILES if p[1][0] * p[1][1] <= max_megapixels * 1000 * 1000] or PHOTO_PROFILES[:1]
+    kinds = [k for k in PHOTO_KINDS if k[0] != 'webp' or features.check('webp')]
+    profile = _choose(rng, profiles)
+    kind = _choose(rng, kinds)
+    spec = {
+        'seed': rng.getrandbits(32),
+        'size': profile[1],
+        'kind': kind[0],
+        'ext': kind[1],
+        # JPEG/WEBP만 EXIF 방향을 붙임 (PNG 명함 사진은 보통 방향 정보가 없음)
+        'orientation': _choose(rng, ORIENTATION_WEIGHTS)[0] if kind[0] in ('jpeg', 'webp') else 1,
+    }
+    return student, spec
+
+
+def draw_portrait(spec):
+    """사양에 맞는 가상 증명사진 (똑바로 선 상태, 투명 종류는 배경이 투명)"""
+    rng = random.Random(spec['seed'])
+    width, height = SKETCH_SIZE
+    background = tuple(rng.randint(170, 250) for _ in range(3))
+    skin = (rng.randint(200, 255), rng.randint(160, 220), rng.randint(120, 180))
+    hair = tuple(rng.randint(20, 110) for _ in range(3))
+    shirt = tuple(rng.randint(0, 200) for _ in range(3))
+
+    sketch = Image.new('RGBA', SKETCH_SIZE, background + (255,))
+    draw = ImageDraw.Draw(sketch)
+    face_x = width // 2 + rng.randint(-15, 15)
+    face_y = height * 2 // 5 + rng.randint(-15, 15)
+    face_w = rng.randint(60, 80)
+    face_h = int(face_w * rng.uniform(1.15, 1.35))
+
+    draw.ellipse([face_x - 130, height - 110, face_x + 130, height + 150], fill=shirt + (255,))
+    draw.ellipse([face_x - face_w - 8, face_y - face_h - 15, face_x + face_w + 8, face_y + face_h // 3], fill=hair + (255,))
+    draw.ellipse([face_x - face_w, face_y - face_h, face_x + face_w, face_y + face_h], fill=skin + (255,))
+    for eye_dx in (-face_w // 2.5, face_w // 2.5):
+        draw.ellipse([face_x + eye_dx - 7, face_y - 15, face_x + eye_dx + 7, face_y - 3], fill=(20, 20, 20, 255))
+    draw.arc([face_x - 22, face_y + 15, face_x + 22, face_y + 45], 20, 160, fill=(150, 60, 60, 255), width=3)
+
+    # 조명 얼룩 (JPEG 크기가 실제 사진처럼 나오도록)
+    noise = Image.frombytes('L', (width // 10, height // 10), rng.randbytes((width // 10) * (height // 10)))
+    shade = Image.new('RGBA', SKETCH_SIZE, (255, 255, 255, 0))
+    shade.putalpha(noise.resize(SKETCH_SIZE, Image.Resampling.BICUBIC).point(lambda v: v // 6))
+    sketch = Image.alpha_composite(sketch, shade)
+
+    if spec['kind'] in ('png_rgba', 'png_la', 'png_palette'):
+        # 누끼 사진: 인물 바깥 배경을 투명하게
+        cutout = Image.new('L', SKETCH_SIZE, 0)
+        cut = ImageDraw.Draw(cutout)
+        cut.ellipse([face_x - face_w - 10, face_y - face_h - 20, face_x + face_w + 10, face_y + face_h + 10], fill=255)
+        cut.ellipse([face_x - 130, height - 110, face_x + 130, height + 150], fill=255)
+        sketch.putalpha(cutout)
+    return sketch.resize(tuple(spec['size']), Image.Resampling.BICUBIC)
+
+
+def write_photo(spec, photo_path):
+    """사양대로 사진 파일 저장 (형식/모드/EXIF 방향 적용)"""
+    image = draw_portrait(spec)
+    orientation = spec['orientation']
+    if orientation in INVERSE_TRANSPOSE:
+        image = image.transpose(INVERSE_TRANSPOSE[orientation])
+
+    kind = spec['kind']
+    temp_path = f"{photo_path}.{os.getpid()}.tmp"
+    if kind in ('jpeg', 'webp'):
+        exif = Image.Exif()
+        if orientation != 1:
+            exif[EXIF_ORIENTATION] = orientation
+        image.convert('RGB').save(temp_path, 'JPEG' if kind == 'jpeg' else 'WEBP', quality=88, exif=exif)
+    elif kind == 'png_rgb':
+        image.convert('RGB').save(temp_path, 'PNG')
+    elif kind == 'png_rgba':
+        image.save(temp_path, 'PNG')
+    elif kind == 'png_la':
+        image.convert('LA').save(temp_path, 'PNG')
+    else:
+        # 팔레트 + 투명 색 인덱스 (GIF식 투명도)
+        alpha = image.getchannel('A')
+        palette = image.convert('RGB').quantize(255)
+        palette.paste(255, mask=alpha.point(lambda v: 255 if v < 128 else 0))
+        palette.save(temp_path, 'PNG', transparency=255)
+    os.replace(temp_path, photo_path)
+
+
+def _write_photos(jobs):
+    """워커: 사진 여러 장 저장 → 저장한 장 수"""
+    for spec, photo_path in jobs:
+        write_photo(spec, photo_path)
+    return len(jobs)
+
+
+def generate(output_dir, count, seed=0, roster_format='csv', workers=None, max_megapixels=12, chunk_size=25):
+    """
+    가상 명단 + 사진 생성
+
+    Args:
+        output_dir: 출력 폴더 (photos/ 와 roster.csv|roster.jsonl 생성)
+        count: 학생 수
+        seed: 시드 (같으면 같은 명단/사진)
+        roster_format: 'csv' 또는 'jsonl'
+        workers: 사진 생성 프로세스 수 (기본: CPU 코어 수)
+        max_megapixels: 이보다 큰 사진 크기는 쓰지 않음 (40이면 DSLR 크기 포함)
+
+    Returns:
+        명단 파일 경로
+    """
+    if roster_format not in ('csv', 'jsonl'):
+        raise ValueError(f"지원하지 않는 명단 형식입니다: {roster_format} (csv/jsonl)")
+
+    photo_dir = os.path.join(output_dir, "photos")
+    os.makedirs(photo_dir, exist_ok=True)
+    roster_path = os.path.join(output_dir, f"roster.{roster_format}")
+
+    jobs = []
+    with open(roster_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=ROSTER_FIELDS) if roster_format == 'csv' else None
+        if writer:
+            writer.writeheader()
+        for index in range(1, count + 1):
+            student, spec = make_student(seed, index, max_megapixels)
+            filename = student['student_id'] + spec['ext']
+            # 명단에는 명단 파일 기준 상대 경로로 기록
+            student['photo_path'] = f"photos/{filename}"
+            if writer:
+                writer.writerow(student)
+            else:
+                f.write(json.dumps(student, ensure_ascii=False) + "\n")
+            jobs.append((spec, os.path.join(photo_dir, filename)))
+
+    print(f"📋 명단 저장: {roster_path} ({count}명)")
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for written in pool.map(_write_photos, chunks):
+            done += written
+            print(f"\r🖼️ 사진 생성 {done}/{count}", end='', flush=True)
+    print(f"\n✅ 가상 명단 생성 완료: {output_dir}")
+    return roster_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="부하 테스트용 가상 명단/사진 생성")
+    parser.add_argument('output', help="출력 폴더")
+    parser.add_argument('--count', type=int, default=1000, help="학생 수")
+    parser.add_argument('--seed', type=int, default=0, help="시드 (같으면 같은 결과)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv', help="명단 형식")
+    parser.add_argument('--workers', type=int, default=None, help="워커 수 (기본: CPU 코어 수)")
+    parser.add_argument('--max-mp', type=float, default=12, help="최대 사진 크기 (메가픽셀, 40이면 DSLR 포함)")
+    args = parser.parse_args()
+
+    generate(args.output, args.count, seed=args.seed, roster_format=args.format, workers=args.workers,
+             max_megapixels=args.max_mp)
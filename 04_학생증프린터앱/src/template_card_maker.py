@@ -4,43 +4,41 @@
 - 사진 합성 + 이름만 추가
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import os
 import json
+from card_render_engine import load_template_image
+from font_registry import KOREAN_SYSTEM_FONTS, font_signature
+from layout_plan import TEMPLATE_CONFIG_PATH, compile_config, load_layout_plan
+from photo_normalizer import MODE_RGBA, normalize_photo
+from render_cache import get_render_cache
+from text_tiles import draw_text
+from render_trace import current_span, traced
+from memory_budget import CanvasPool, MemoryGovernor
 
 class TemplateCardMaker:
-    def __init__(self):
-        """템플릿 기반 카드 제작기 초기화"""
-        self.template_config = self.load_template_config()
+    def __init__(self, config_path=TEMPLATE_CONFIG_PATH):
+        """템플릿 기반 카드 제작기 초기화 (설정은 layout_plan이 수정 시각 기준으로 캐시)"""
+        self.config_path = config_path
+        self.render_cache = get_render_cache()   # None이면 항상 새로 렌더링
+        self.last_from_cache = False
+        self.canvas_pool = None   # 지정하면 카드 캔버스 재사용 (memory_budget.CanvasPool, 일괄 생성용)
         
-    def load_template_config(self):
-        """템플릿 설정 로드"""
-        # 기본 설정 (config.json이 없으면 사용)
-        default_config = {
-            "photo_area": {
-                "x": 50,
-                "y": 80,
-                "width": 120,
-                "height": 150
-            },
-            "name_area": {
-                "x": 200,
-                "y": 100,
-                "font_size": 24,
-                "color": [0, 0, 0],
-                "align": "left"
-            }
+    @property
+    def template_config(self):
+        """현재 템플릿 설정 (파일이 바뀌었으면 다시 읽음)"""
+        return compile_config(self.config_path).config
+        
+    def render_signature(self):
+        """렌더 캐시 키에 들어가는 레이아웃 값 (설정 파일 내용 + 폰트)"""
+        return {
+            'config': self.template_config,
+            'font': font_signature(KOREAN_SYSTEM_FONTS),
         }
         
-        config_path = "template_config.json"
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                print("⚠️ 설정 파일 로드 실패, 기본 설정 사용")
-                
-        return default_config
+    def load_template_config(self):
+        """템플릿 설정 로드"""
+        return self.template_config
     
     def create_template_config(self, template_path):
         """템플릿 설정 파일 생성 도우미"""
@@ -76,13 +74,14 @@ class TemplateCardMaker:
             }
         }
         
-        with open("template_config.json", 'w', encoding='utf-8') as f:
+        with open(self.config_path, 'w', encoding='utf-8') as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
             
-        print(f"✅ 설정 파일 생성: template_config.json")
+        print(f"✅ 설정 파일 생성: {self.config_path}")
         print(f"템플릿 크기: {width} x {height}")
         print("📝 설정을 수정한 후 사용하세요!")
         
+    @traced('template.card')
     def create_card_with_template(self, template_path, photo_path, student_data, output_path):
         """
         포토샵 템플릿을 사용하여 학생증 생성
@@ -97,113 +96,31 @@ class TemplateCardMaker:
                 'class': '2'
             }
             output_path: 완성된 학생증 저장 경로
+        
+        입력(템플릿/사진 내용, 학생 정보, 설정)이 같은 카드는 렌더 캐시에서 복사합니다.
         """
+        stage = current_span()
         try:
             print(f"🎨 템플릿 기반 학생증 생성 시작...")
             print(f"   템플릿: {template_path}")
             print(f"   사진: {photo_path}")
             print(f"   학생 정보: {student_data}")
             
-            # 1. 포토샵 템플릿 로드 (없으면 흰색 배경 생성)
-            if not os.path.exists(template_path):
-                print(f"⚠️ 템플릿 파일이 없습니다: {template_path}")
-                print("📄 흰색 배경으로 학생증을 생성합니다")
-                
-                # 기본 카드 크기로 흰색 배경 생성 (실제 카드 크기)
-                card_width = 1016  # 86mm x 300DPI
-                card_height = 637  # 54mm x 300DPI
-                template = Image.new('RGB', (card_width, card_height), (255, 255, 255))
-                print(f"✅ 흰색 배경 생성: {template.size}")
-            else:
-                template = Image.open(template_path)
-                if template.mode != 'RGBA':
-                    template = template.convert('RGBA')
-                print(f"✅ 템플릿 로드: {template.size}")
+            cache_key = None
+            self.last_from_cache = False
+            if self.render_cache is not None and os.path.exists(photo_path):
+                cache_key = self.render_cache.make_key(
+                    'template', template_path, photo_path, student_data, self.render_signature())
+                hit = self.render_cache.fetch(cache_key, output_path)
+                stage.lap('cache_lookup', hit=hit)
+                if hit:
+                    self.last_from_cache = True
+                    print(f"✅ 학생증 생성 완료 (캐시): {output_path}")
+                    return True
             
-            # 2. 학생 사진 로드 및 크기 조정
-            if not os.path.exists(photo_path):
-                print(f"❌ 사진 파일이 없습니다: {photo_path}")
+            template = self.render_card(template_path, photo_path, student_data)
+            if template is None:
                 return False
-                
-            photo = Image.open(photo_path)
-            
-            # 사진 영역 설정
-            photo_config = self.template_config["photo_area"]
-            photo_x = photo_config["x"]
-            photo_y = photo_config["y"] 
-            photo_width = photo_config["width"]
-            photo_height = photo_config["height"]
-            
-            # 사진 크기 조정
-            photo = photo.resize((photo_width, photo_height), Image.Resampling.LANCZOS)
-            if photo.mode != 'RGBA':
-                photo = photo.convert('RGBA')
-            print(f"✅ 사진 처리: {photo.size} → ({photo_x}, {photo_y})")
-            
-            # 3. 사진을 템플릿에 합성
-            # 알파 채널을 고려한 합성
-            template.paste(photo, (photo_x, photo_y), photo)
-            
-            # 4. 텍스트 정보 추가 (학교명, 학년/반, 이름)
-            draw = ImageDraw.Draw(template)
-            
-            # 폰트 로드 함수
-            def load_font(font_size):
-                try:
-                    font_paths = [
-                        "C:/Windows/Fonts/malgun.ttf",    # 맑은 고딕
-                        "C:/Windows/Fonts/gulim.ttc",     # 굴림
-                        "C:/Windows/Fonts/batang.ttc",    # 바탕
-                    ]
-                    
-                    for font_path in font_paths:
-                        if os.path.exists(font_path):
-                            return ImageFont.truetype(font_path, font_size)
-                            
-                    return ImageFont.load_default()
-                except Exception as e:
-                    print(f"⚠️ 폰트 로드 실패: {e}")
-                    return ImageFont.load_default()
-            
-            # 텍스트 그리기 함수
-            def draw_text(text, config_key, default_text=""):
-                if config_key not in self.template_config:
-                    return
-                    
-                config = self.template_config[config_key]
-                font_size = config["font_size"]
-                font = load_font(font_size)
-                
-                x = config["x"]
-                y = config["y"]
-                color = tuple(config["color"])
-                align = config.get("align", "left")
-                
-                # 중앙 정렬인 경우 위치 조정
-                if align == "center":
-                    bbox = draw.textbbox((0, 0), text, font=font)
-                    text_width = bbox[2] - bbox[0]
-                    x = x - (text_width // 2)
-                
-                draw.text((x, y), text, font=font, fill=color)
-                print(f"✅ {config_key} 추가: '{text}' at ({x}, {y})")
-            
-            # 학교명 추가
-            school_name = student_data.get('school_name', '은하여자고등학교')
-            draw_text(school_name, "school_name_area")
-            
-            # 학년/반 추가
-            grade = student_data.get('grade', '')
-            class_num = student_data.get('class', '')
-            if grade and class_num:
-                grade_class_text = f"{grade}학년 {class_num}반"
-            else:
-                grade_class_text = "3학년 2반"  # 기본값
-            draw_text(grade_class_text, "grade_class_area")
-            
-            # 이름 추가
-            name = student_data.get('name', '')
-            draw_text(name, "name_area")
             
             # 5. 최종 이미지 저장
             # 출력 폴더 생성
@@ -211,14 +128,12 @@ class TemplateCardMaker:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
             
-            # RGBA를 RGB로 변환 (PNG 호환성)
-            if template.mode == 'RGBA':
-                # 흰색 배경과 합성
-                background = Image.new('RGB', template.size, (255, 255, 255))
-                background.paste(template, mask=template.split()[-1])  # 알파 채널을 마스크로 사용
-                template = background
-            
             template.save(output_path, 'PNG')
+            self.release_card(template)
+            stage.lap('save')
+            if cache_key:
+                self.render_cache.store(cache_key, output_path)
+                stage.lap('cache_store')
             print(f"✅ 학생증 생성 완료: {output_path}")
             
             return True
@@ -229,25 +144,181 @@ class TemplateCardMaker:
             traceback.print_exc()
             return False
     
-    def batch_create_cards(self, template_path, students_data, output_folder):
-        """여러 학생증 일괄 생성"""
-        success_count = 0
+    @traced('template.render')
+    def render_card(self, template_path, photo_path, student_data, scale=1.0, verbose=True):
+        """
+        템플릿 학생증 이미지 렌더링 (저장하지 않음)
         
-        for i, student in enumerate(students_data, 1):
-            print(f"\n[{i}/{len(students_data)}] {student['name']} 학생증 생성 중...")
-            
-            safe_name = "".join(c for c in student['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
-            output_path = os.path.join(output_folder, f"{safe_name}_학생증.png")
-            
-            success = self.create_card_with_template(
-                template_path=template_path,
-                photo_path=student['photo_path'],
-                student_data=student,
-                output_path=output_path
-            )
+        Args:
+            scale: 픽셀 배율 (1.0 = 원본 해상도, 미리보기는 1보다 작게)
+            verbose: False면 진행 로그를 출력하지 않음
+        
+        Returns:
+            RGB 모드의 카드 이미지 (사진 파일이 없으면 None)
+        """
+        log = print if verbose else (lambda *args: None)
+        fast_decode = scale < 1.0
+        stage = current_span()   # 단계별 시간 측정 (render_trace)
+        
+        # 1. 포토샵 템플릿 로드 (없으면 흰색 배경 생성)
+        if not os.path.exists(template_path):
+            log(f"⚠️ 템플릿 파일이 없습니다: {template_path}")
+            log("📄 흰색 배경으로 학생증을 생성합니다")
             
-            if success:
-                success_count += 1
+            # 기본 카드 크기로 흰색 배경 생성 (실제 카드 크기)
+            card_width = int(1016 * scale)  # 86mm x 300DPI
+            card_height = int(637 * scale)  # 54mm x 300DPI
+            template = Image.new('RGB', (card_width, card_height), (255, 255, 255))
+            log(f"✅ 흰색 배경 생성: {template.size}")
+        elif fast_decode:
+            width, height = self.template_size(template_path)
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            template = load_template_image(template_path, size=size, mode='RGBA', fast_decode=True,
+                                           canvas_pool=self.canvas_pool)
+        else:
+            template = load_template_image(template_path, mode='RGBA', canvas_pool=self.canvas_pool)
+        stage.lap('template')
+        
+        # 2. 학생 사진 로드 및 크기 조정
+        if not os.path.exists(photo_path):
+            log(f"❌ 사진 파일이 없습니다: {photo_path}")
+            self.release_card(template)
+            return None
+        
+        # 사진 영역/텍스트 위치는 컴파일된 레이아웃 계획에서 가져옴
+        plan = load_layout_plan(self.config_path, scale)
+        photo_x, photo_y, photo_width, photo_height = plan.photo_box
+        
+        # 사진 크기 조정 (EXIF 방향/ICC 적용 후 RGBA, 정규화 캐시 사용)
+        photo = normalize_photo(photo_path, (photo_width, photo_height), MODE_RGBA, fast_decode)
+        stage.lap('photo', box=tuple(plan.photo_box))
+        
+        # 3. 사진을 템플릿에 합성
+        # 알파 채널을 고려한 합성
+        template.paste(photo, (photo_x, photo_y), photo)
+        photo.close()
+        stage.lap('paste')
+        
+        # 4. 텍스트 정보 추가 (학교명, 학년/반, 이름 - 반복되는 글자는 캐시된 타일 사용)
+        
+        # 학년/반 (둘 다 있을 때만, 없으면 기본값)
+        grade = student_data.get('grade', '')
+        class_num = student_data.get('class', '')
+        if grade and class_num:
+            grade_class_text = f"{grade}학년 {class_num}반"
+        else:
+            grade_class_text = "3학년 2반"  # 기본값
+        
+        texts = {
+            "school_name_area": student_data.get('school_name', '은하여자고등학교'),
+            "grade_class_area": grade_class_text,
+            "name_area": student_data.get('name', ''),
+        }
+        
+        # 계획된 영역 순서대로 그리기 (폰트/색상/정렬은 계획에 미리 계산됨)
+        for slot in plan.text_slots:
+            text = texts[slot.key]
+            x, y = plan.text_origin(slot, text)
+            draw_text(template, (x, y), text, slot.font, slot.color)
+        stage.lap('text')
+        
+        # RGBA를 RGB로 변환 (PNG 호환성)
+        if template.mode == 'RGBA':
+            # 흰색 배경과 합성 (일괄 생성 시 재사용 캔버스를 흰색으로 채워 사용)
+            if self.canvas_pool is not None:
+                background = self.canvas_pool.acquire(template.size, 'RGB')
+                background.paste((255, 255, 255), (0, 0) + template.size)
+            else:
+                background = Image.new('RGB', template.size, (255, 255, 255))
+            alpha = template.getchannel('A')
+            background.paste(template, mask=alpha)  # 알파 채널을 마스크로 사용
+            alpha.close()
+            self.release_card(template)
+            template = background
+        stage.lap('flatten')
+        
+        return template
+    
+    def release_card(self, card):
+        """다 쓴 카드 이미지 정리 (캔버스 풀이 있으면 반납, 없으면 바로 해제)"""
+        if self.canvas_pool is not None:
+            self.canvas_pool.release(card)
+        else:
+            card.close()
+    
+    @staticmethod
+    def template_size(template_path):
+        """템플릿 원본 크기 (없으면 기본 카드 크기, 헤더만 읽음)"""
+        if not os.path.exists(template_path):
+            return (1016, 637)
+        with Image.open(template_path) as template:
+            return template.size
+    
+    def render_preview(self, template_path, photo_path, student_data, max_size=(800, 500)):
+        """
+        미리보기 해상도로 바로 렌더링 (300 DPI 카드를 만든 뒤 축소하지 않음)
+        
+        Returns:
+            max_size 안에 들어가는 RGB 이미지 (사진 파일이 없으면 None)
+        """
+        width, height = self.template_size(template_path)
+        scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+        return self.render_card(template_path, photo_path, student_data, scale=scale, verbose=False)
+    
+    @staticmethod
+    def batch_output_path(output_folder, student):
+        """일괄 생성 시 학생별 출력 파일 경로 (동명이인이 덮어쓰지 않도록 학번이 있으면 앞에 붙임)"""
+        safe_name = "".join(c for c in student['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        student_id = student.get('student_id')
+        if student_id:
+            return os.path.join(output_folder, f"{student_id}_{safe_name}_학생증.png")
+        return os.path.join(output_folder, f"{safe_name}_학생증.png")
+    
+    def batch_create_cards(self, template_path, students_data, output_folder, workers=1,
+                           memory_limit_mb=None, memory_log_every=0):
+        """
+        여러 학생증 일괄 생성
+        
+        Args:
+            workers: 2 이상이면 프로세스 풀로 병렬 생성 (None이면 CPU 코어 수)
+            memory_limit_mb: 메모리 상한 (MB) - 넘으면 캐시를 비우고, 병렬 생성에서는 새 카드 투입을 늦춤
+            memory_log_every: N장마다 최대 메모리 로그 (0이면 기록하지 않음)
+        """
+        if workers != 1:
+            from batch_renderer import run_batch
+            success_count, _ = run_batch('template', template_path, students_data, output_folder, workers=workers,
+                                         memory_limit_mb=memory_limit_mb, memory_log_every=memory_log_every)
+            return success_count
+        
+        # 카드 캔버스를 재사용하며 한 장씩 생성 (메모리 상한을 넘으면 캐시 정리)
+        canvas_pool = CanvasPool()
+        governor = MemoryGovernor(memory_limit_mb, memory_log_every, canvas_pool)
+        previous_pool, self.canvas_pool = self.canvas_pool, canvas_pool
+        success_count = 0
+        
+        try:
+            for i, student in enumerate(students_data, 1):
+                if not governor.admit() and self.canvas_pool is not None:
+                    # 캐시를 비워도 상한 초과: 한 장씩 생성하므로 투입을 더 늦출 수 없어 캔버스 보관을 멈춤
+                    print("⚠️ 캐시 정리 후에도 메모리 상한 초과 - 남은 카드는 캔버스를 재사용하지 않고 생성")
+                    self.canvas_pool = None
+                print(f"\n[{i}/{len(students_data)}] {student['name']} 학생증 생성 중...")
+                
+                output_path = self.batch_output_path(output_folder, student)
+                
+                success = self.create_card_with_template(
+                    template_path=template_path,
+                    photo_path=student['photo_path'],
+                    student_data=student,
+                    output_path=output_path
+                )
+                
+                if success:
+                    success_count += 1
+                governor.card_done(i, len(students_data))
+        finally:
+            self.canvas_pool = previous_pool
+            canvas_pool.clear()
             
         print(f"\n📊 완료: {success_count}/{len(students_data)} 개 성공")
         return success_count
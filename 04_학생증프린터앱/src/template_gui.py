@@ -9,6 +9,9 @@ from PIL import Image, ImageTk
 import os
 import glob
 import json
+from thumbnail_cache import ThumbnailCache
+from render_executor import RenderExecutor, queue_status_text
+from print_spooler import get_spooler, STATUS_DONE
 
 class TemplateCardGUI:
     def __init__(self, root):
@@ -28,12 +31,20 @@ class TemplateCardGUI:
         self.photo_files = []
         self.current_photo_index = 0
         self.current_photo_path = ""
+        self.thumbnails = ThumbnailCache()  # 디스크/메모리 썸네일 캐시 + 앞뒤 사진 미리 로드
+        
+        # 제작기는 한 번만 생성 (template_config.json은 수정 시각이 바뀔 때만 다시 읽음)
+        self.card_maker = None
         
         # 템플릿 관련
         self.template_files = []
         self.current_template_index = 0
         
         self.setup_ui()
+        
+        # 렌더링은 백그라운드에서 실행 (생성 중에도 다음 학생 입력 가능)
+        self.executor = RenderExecutor(self.root, on_queue_change=self.update_queue_status)
+        
         self.load_templates()
         self.load_photos()
         
@@ -147,6 +158,13 @@ class TemplateCardGUI:
         self.status_label = ttk.Label(main_frame, text="준비됨", font=('Arial', 10))
         self.status_label.pack(pady=10)
         
+        # 대기열 표시 + 취소
+        queue_frame = ttk.Frame(main_frame)
+        queue_frame.pack()
+        self.queue_label = ttk.Label(queue_frame, text="", font=('Arial', 9), foreground='gray')
+        self.queue_label.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(queue_frame, text="⏹ 대기 작업 취소", command=self.cancel_jobs).pack(side=tk.LEFT)
+        
     def load_templates(self):
         """템플릿 폴더에서 템플릿들 로드"""
         template_extensions = ['*.png', '*.jpg', '*.jpeg']
@@ -275,9 +293,9 @@ class TemplateCardGUI:
         try:
             self.current_photo_path = self.photo_files[self.current_photo_index]
             
-            # 이미지 로드 및 리사이즈
-            image = Image.open(self.current_photo_path)
-            image = image.resize((400, 480), Image.Resampling.LANCZOS)
+            # 썸네일 로드 (캐시)
+            image = self.thumbnails.get(self.current_photo_path, (400, 480))
+            self.thumbnails.prefetch_neighbors(self.photo_files, self.current_photo_index, (400, 480))
             
             # tkinter용 이미지로 변환
             self.photo_image = ImageTk.PhotoImage(image)
@@ -333,8 +351,13 @@ class TemplateCardGUI:
                 self.load_photos()
                 messagebox.showinfo("성공", f"{added_count}개의 사진이 추가되었습니다")
                 
-    def create_card(self):
-        """학생증 생성"""
+    def create_card(self, on_created=None):
+        """
+        학생증 생성 (렌더링/저장은 백그라운드에서 실행)
+        
+        Args:
+            on_created: on_created(출력 경로) - 생성 성공 후 메인 스레드에서 호출
+        """
         # 입력 검증
         if not self.student_name.get().strip():
             messagebox.showerror("오류", "이름을 입력해주세요")
@@ -365,7 +388,8 @@ class TemplateCardGUI:
         try:
             from template_card_maker import TemplateCardMaker
             
-            maker = TemplateCardMaker()
+            if self.card_maker is None:
+                self.card_maker = TemplateCardMaker()
             
             # 출력 경로 설정
             if not os.path.exists('output'):
@@ -376,7 +400,7 @@ class TemplateCardGUI:
             
             self.update_status("학생증 생성 중...")
             
-            # 학생 데이터 준비
+            # 학생 데이터 준비 (제출 시점 값으로 고정)
             student_data = {
                 'name': self.student_name.get().strip(),
                 'school_name': self.school_name.get().strip(),
@@ -384,53 +408,54 @@ class TemplateCardGUI:
                 'class': self.class_num.get().strip()
             }
             
-            # 학생증 생성
-            success = maker.create_card_with_template(
-                template_path=self.template_path.get(),
-                photo_path=self.current_photo_path,
-                student_data=student_data,
-                output_path=output_path
+            self.executor.submit(
+                self._render_card, self.card_maker, self.template_path.get(), self.current_photo_path,
+                student_data, output_path,
+                on_done=lambda preview: self._on_card_created(preview, output_path, on_created),
+                on_error=self._on_create_error,
+                description=f"{student_data['name']} 학생증 생성"
             )
-            
-            if success:
-                # 미리보기 표시
-                self.show_preview(output_path)
-                self.update_status("✅ 학생증 생성 완료!")
-                messagebox.showinfo("성공", f"템플릿 학생증이 생성되었습니다!\\n\\n파일: {output_path}")
-            else:
-                self.update_status("❌ 생성 실패")
-                messagebox.showerror("오류", "학생증 생성에 실패했습니다")
                 
         except Exception as e:
-            self.update_status("❌ 오류 발생")
-            messagebox.showerror("오류", f"학생증 생성 중 오류:\\n{str(e)}")
-            
-    def show_preview(self, image_path):
-        """생성된 학생증 미리보기 표시"""
+            self._on_create_error(e)
+    
+    def _render_card(self, maker, template_path, photo_path, student_data, output_path):
+        """작업 스레드: 학생증 생성 + 미리보기 렌더링 → 미리보기 이미지 (실패 시 None)"""
+        success = maker.create_card_with_template(
+            template_path=template_path,
+            photo_path=photo_path,
+            student_data=student_data,
+            output_path=output_path
+        )
+        if not success:
+            return None
+        
+        # 미리보기 해상도로 바로 렌더링 (저장된 파일을 다시 읽지 않음)
+        return maker.render_preview(template_path, photo_path, student_data, max_size=(800, 500))
+    
+    def _on_card_created(self, preview, output_path, on_created=None):
+        """메인 스레드: 생성 결과 표시"""
+        if preview is None:
+            self.update_status("❌ 생성 실패")
+            messagebox.showerror("오류", "학생증 생성에 실패했습니다")
+            return
+        
+        # 미리보기 표시
+        self.show_preview(preview)
+        self.update_status("✅ 학생증 생성 완료!")
+        messagebox.showinfo("성공", f"템플릿 학생증이 생성되었습니다!\\n\\n파일: {output_path}")
+        
+        if on_created:
+            on_created(output_path)
+    
+    def _on_create_error(self, e):
+        """메인 스레드: 생성 오류 표시"""
+        self.update_status("❌ 오류 발생")
+        messagebox.showerror("오류", f"학생증 생성 중 오류:\\n{str(e)}")
+            
+    def show_preview(self, image):
+        """학생증 미리보기 표시 (미리보기 해상도로 렌더링된 이미지)"""
         try:
-            # 이미지 로드
-            image = Image.open(image_path)
-            
-            # 실제 카드 비율 유지 (86mm x 54mm = 약 1.59:1)
-            card_ratio = 86 / 54  # 실제 카드 비율
-            
-            # 미리보기 영역 크기 (실제 카드 크기에 가깝게!)
-            preview_width = 800
-            preview_height = 500
-            
-            # 카드 비율에 맞춰 미리보기 크기 계산
-            if image.width / image.height > card_ratio:
-                # 이미지가 카드보다 더 가로로 긴 경우
-                new_width = preview_width
-                new_height = int(preview_width / card_ratio)
-            else:
-                # 이미지가 카드보다 더 세로로 긴 경우
-                new_height = preview_height
-                new_width = int(preview_height * card_ratio)
-            
-            # 이미지 리사이즈
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
             # tkinter용 이미지로 변환
             self.preview_image = ImageTk.PhotoImage(image)
             self.preview_label.config(image=self.preview_image, text="")
@@ -440,29 +465,29 @@ class TemplateCardGUI:
             
     def print_card(self):
         """학생증 인쇄"""
-        # 먼저 생성
-        self.create_card()
-        
-        # 생성된 파일 인쇄
-        safe_name = "".join(c for c in self.student_name.get() if c.isalnum() or c in (' ', '-', '_')).strip()
-        output_path = f"output/{safe_name}_템플릿학생증.png"
+        # 먼저 생성 (생성이 끝나면 인쇄)
+        self.create_card(on_created=self.print_file)
         
+    def print_file(self, output_path):
+        """생성된 파일을 인쇄 대기열에 추가 (인쇄는 스풀러 스레드에서 진행)"""
         if os.path.exists(output_path):
             try:
-                import win32api
-                abs_path = os.path.abspath(output_path)
-                result = win32api.ShellExecute(0, "print", abs_path, None, ".", 0)
-                
-                if result > 32:
-                    self.update_status("✅ 인쇄 명령 전송!")
-                    messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!")
-                else:
-                    self.update_status("❌ 인쇄 실패")
-                    messagebox.showerror("실패", f"인쇄 실패 (코드: {result})")
+                get_spooler().submit(output_path, description=os.path.basename(output_path),
+                                     on_done=lambda job: self.executor.post(self._on_print_done, job))
+                self.update_status("🖨️ 인쇄 대기열에 추가됨")
                     
             except Exception as e:
                 messagebox.showerror("오류", f"인쇄 중 오류:\\n{str(e)}")
         
+    def _on_print_done(self, job):
+        """메인 스레드: 인쇄 결과 표시"""
+        if job.status == STATUS_DONE:
+            self.update_status("✅ 인쇄 명령 전송!")
+            messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!")
+        else:
+            self.update_status("❌ 인쇄 실패")
+            messagebox.showerror("실패", f"인쇄 실패:\\n{job.error}")
+        
     def open_settings(self):
         """설정 창 열기"""
         settings_window = tk.Toplevel(self.root)
@@ -532,12 +557,22 @@ class TemplateCardGUI:
     def update_status(self, message):
         """상태 메시지 업데이트"""
         self.status_label.config(text=message)
-        self.root.update()
+        
+    def update_queue_status(self, count):
+        """대기열 길이 표시"""
+        self.queue_label.config(text=queue_status_text(count))
+        
+    def cancel_jobs(self):
+        """아직 시작하지 않은 작업 취소"""
+        cancelled = self.executor.cancel_all()
+        self.update_status(f"⏹ 대기 작업 {cancelled}개 취소됨")
 
 def main():
     root = tk.Tk()
     app = TemplateCardGUI(root)
     root.mainloop()
+    app.thumbnails.shutdown()
+    app.executor.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+"""
+텍스트 타일 캐시 (반복되는 글자 래스터화 생략)
+- 학교명, "3학년 2반", 학과명처럼 카드마다 반복되는 문자열을 알파 마스크 타일로 한 번만 그림
+- (문자열, 폰트, 크기, 색상) 단위 LRU 캐시, 전체 타일 메모리가 상한을 넘으면 오래된 타일부터 버림
+- 카드에는 draw.text 대신 캐시된 타일을 붙여넣기만 함 (결과는 draw.text와 같음)
+"""
+
+import threading
+from collections import namedtuple, OrderedDict
+from PIL import Image, ImageDraw
+
+# 기본 메모리 상한 (타일 마스크 바이트 합계)
+DEFAULT_TEXT_CACHE_BYTES = 8 * 1024 * 1024
+
+# offset: 그리기 좌표 기준 타일 왼쪽 위 위치, mask: 'L' 알파 마스크
+TextTile = namedtuple('TextTile', 'text color offset mask')
+
+
+def font_key(font):
+    """폰트 식별자 (파일 경로 + 크기, 파일이 없는 기본 폰트는 객체 단위)"""
+    path = getattr(font, 'path', None)
+    if isinstance(path, str):
+        return (path, getattr(font, 'size', None), getattr(font, 'index', 0))
+    return ('font', id(font))
+
+
+def rasterize_text(text, font, color):
+    """문자열 → TextTile (draw.text와 같은 글리프 마스크)"""
+    bbox = font.getbbox(text)
+    width = max(1, bbox[2] - bbox[0])
+    height = max(1, bbox[3] - bbox[1])
+    mask = Image.new('L', (width, height), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, fill=255, font=font)
+    return TextTile(text, color, (bbox[0], bbox[1]), mask)
+
+
+class TextTileCache:
+    """메모리 상한이 있는 텍스트 타일 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_bytes=DEFAULT_TEXT_CACHE_BYTES):
+        """
+        Args:
+            max_bytes: 캐시할 타일 마스크의 바이트 합계 상한 (0이면 캐시하지 않음)
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text, font, color):
+        """(문자열, 폰트, 크기, 색상)에 해당하는 타일 (없으면 그려서 캐시)"""
+        color = tuple(color) if isinstance(color, list) else color
+        key = (text, font_key(font), color)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+
+        tile = rasterize_text(text, font, color)
+        size = tile.mask.width * tile.mask.height
+        if size > self.max_bytes:
+            return tile
+
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = tile
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, old = self._tiles.popitem(last=False)
+                    self.bytes -= old.mask.width * old.mask.height
+                    self.evictions += 1
+        return tile
+
+    def draw(self, image, xy, text, font, fill):
+        """
+        draw.text(xy, text, font=font, fill=fill) 대신 캐시된 타일 붙여넣기
+
+        Returns:
+            그려진 영역 (left, top, right, bottom)
+        """
+        if not text:
+            return None
+        tile = self.get(text, font, fill)
+        left = int(xy[0]) + tile.offset[0]
+        top = int(xy[1]) + tile.offset[1]
+        image.paste(tile.color, (left, top), tile.mask)
+        return (left, top, left + tile.mask.width, top + tile.mask.height)
+
+    def set_max_bytes(self, max_bytes):
+        """메모리 상한 변경 (줄이면 바로 오래된 타일부터 버림)"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._tiles and self.bytes > self.max_bytes:
+                _, old = self._tiles.popitem(last=False)
+                self.bytes -= old.mask.width * old.mask.height
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def describe(self):
+        """캐시 상태 문구"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (f"텍스트 타일 {len(self)}개, {self.bytes / 1024:.0f}KB / {self.max_bytes / 1024:.0f}KB, "
+                f"적중률 {rate:.0f}% ({self.hits}/{total}), 제거 {self.evictions}개")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_text_tile_cache():
+    """프로세스 전역 텍스트 타일 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TextTileCache()
+        return _cache
+
+
+def draw_text(image, xy, text, font, fill):
+    """전역 캐시로 텍스트 그리기 (draw.text 대체)"""
+    return get_text_tile_cache().draw(image, xy, text, font, fill)
@@ -0,0 +1,177 @@
+"""
+사진 썸네일 캐시
+- 사진 내용 해시 + 썸네일 크기 단위로 디스크(cache/thumbnails)에 저장
+- 디스크 캐시가 상한을 넘으면 가장 오래 쓰지 않은 썸네일부터 삭제
+- 최근 본 썸네일은 메모리 LRU에 유지
+- 현재 사진 앞뒤 N장을 백그라운드 스레드에서 미리 만들어 이전/다음 이동을 즉시 처리
+"""
+
+from PIL import Image
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from content_hash import FileHashMemo
+from photo_normalizer import MODE_AUTO, normalize_image, open_image_scaled, read_orientation
+from render_cache import evict_lru
+
+THUMBNAIL_CACHE_DIR = os.path.join("cache", "thumbnails")
+DEFAULT_THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+THUMBNAIL_VERSION = 2  # 2: EXIF 방향/ICC 반영 (이전 썸네일은 다시 생성)
+
+
+class ThumbnailCache:
+    """디스크 + 메모리 LRU 썸네일 캐시 (GUI 사진 브라우저용)"""
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, memory_items=64, prefetch_count=3,
+                 max_bytes=DEFAULT_THUMBNAIL_CACHE_BYTES):
+        """
+        Args:
+            cache_dir: 썸네일 PNG를 저장할 폴더
+            max_bytes: 디스크 캐시 크기 상한 (넘으면 오래 쓰지 않은 썸네일부터 삭제)
+            memory_items: 메모리에 유지할 썸네일 수
+            prefetch_count: 현재 사진 앞뒤로 미리 만들 사진 수
+        """
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self.prefetch_count = prefetch_count
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+        self._memory = OrderedDict()   # (내용 해시, 크기) → 썸네일
+        self._file_hashes = FileHashMemo()
+        self._pending = set()          # 백그라운드에서 만드는 중인 (경로, 크기)
+        self._total = None             # 디스크 캐시 크기 추정값 (None: 아직 확인 전)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail")
+
+    def _remember(self, key, thumbnail):
+        with self._lock:
+            self._memory[key] = thumbnail
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, content_hash, size):
+        return os.path.join(self.cache_dir, f"{content_hash}_{size[0]}x{size[1]}_v{THUMBNAIL_VERSION}.png")
+
+    def _make_thumbnail(self, photo_path, size):
+        """사진을 축소 디코딩하여 썸네일 생성 (인쇄 경로와 같은 방향/색공간 정규화)"""
+        with Image.open(photo_path) as source:
+            orientation = read_orientation(source)
+            icc_profile = source.info.get('icc_profile')
+
+        # 90도 회전되는 사진은 디코딩 목표 크기도 돌려서 계산
+        target = (size[1], size[0]) if orientation in (5, 6, 7, 8) else size
+        image = open_image_scaled(photo_path, target)
+        thumbnail = normalize_image(image, size, MODE_AUTO, orientation, icc_profile)
+        if thumbnail is not image:
+            image.close()
+        return thumbnail
+
+    def get(self, photo_path, size):
+        """
+        썸네일 반환 (메모리 → 디스크 → 새로 생성 순서로 찾음)
+
+        Args:
+            photo_path: 원본 사진 파일
+            size: (폭, 높이) - 사진을 이 크기로 리사이즈
+
+        Returns:
+            PIL 이미지 (캐시 공유 객체이므로 수정하지 말 것)
+        """
+        size = tuple(size)
+        key = (self._file_hashes.get(photo_path), size)
+
+        with self._lock:
+            thumbnail = self._memory.get(key)
+            if thumbnail is not None:
+                self._memory.move_to_end(key)
+                return thumbnail
+
+        disk_path = self._disk_path(*key)
+        thumbnail = None
+        if os.path.exists(disk_path):
+            try:
+                with Image.open(disk_path) as cached:
+                    thumbnail = cached.copy()
+            except Exception:
+                thumbnail = None  # 깨진 캐시 파일은 다시 생성
+            else:
+                try:
+                    os.utime(disk_path)   # 최근 사용 표시 (삭제 순서 기준)
+                except OSError:
+                    pass
+
+        if thumbnail is None:
+            thumbnail = self._make_thumbnail(photo_path, size)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # 다른 스레드가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+                temp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+                thumbnail.save(temp_path, 'PNG')
+                os.replace(temp_path, disk_path)
+                self._account(os.path.getsize(disk_path))
+            except OSError as e:
+                print(f"⚠️ 썸네일 캐시 저장 실패: {e}")
+
+        self._remember(key, thumbnail)
+        return thumbnail
+
+    def _account(self, stored):
+        """새로 저장한 썸네일 크기를 더하고 상한을 넘으면 정리"""
+        with self._lock:
+            if self._total is not None:
+                self._total += stored
+            need_scan = self._total is None or self._total > self.max_bytes
+        if need_scan:
+            self.evict()
+
+    def evict(self):
+        """디스크 캐시가 상한을 넘으면 오래 쓰지 않은 썸네일부터 삭제"""
+        total, removed = evict_lru(self.cache_dir, self.max_bytes)
+        with self._lock:
+            self._total = total
+            self.evictions += removed
+
+    def _prefetch_one(self, photo_path, size):
+        try:
+            self.get(photo_path, size)
+        except Exception:
+            pass  # 미리 만들기 실패는 실제로 볼 때 다시 보고됨
+        finally:
+            with self._lock:
+                self._pending.discard((photo_path, size))
+
+    def prefetch(self, photo_paths, size):
+        """사진들의 썸네일을 백그라운드 스레드에서 미리 생성"""
+        size = tuple(size)
+        for photo_path in photo_paths:
+            with self._lock:
+                if (photo_path, size) in self._pending:
+                    continue
+                self._pending.add((photo_path, size))
+            self._executor.submit(self._prefetch_one, photo_path, size)
+
+    def prefetch_neighbors(self, photo_files, index, size):
+        """현재 사진 다음/이전 prefetch_count장 미리 생성 (가까운 순서, 목록 양 끝은 순환)"""
+        count = len(photo_files)
+        if count <= 1:
+            return
+
+        neighbors = []
+        for offset in range(1, self.prefetch_count + 1):
+            for neighbor in ((index + offset) % count, (index - offset) % count):
+                if neighbor != index and photo_files[neighbor] not in neighbors:
+                    neighbors.append(photo_files[neighbor])
+        self.prefetch(neighbors, size)
+
+    def clear_memory(self):
+        """메모리 캐시 비우기 (디스크 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+        self._file_hashes.clear()
+
+    def shutdown(self):
+        """백그라운드 스레드 정리"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -8,8 +8,10 @@ from PIL import Image, ImageTk
 import os
 import glob
 from pointman_card_printer import PointmanCardPrinter
-import win32print
-import win32api
+from thumbnail_cache import ThumbnailCache
+from render_executor import RenderExecutor, queue_status_text
+from print_spooler import get_spooler, STATUS_DONE
+from printer_monitor import get_printer_monitor
 
 class VerticalCardGUI:
     def __init__(self, root):
@@ -25,6 +27,7 @@ class VerticalCardGUI:
         self.photo_files = []
         self.current_photo_index = 0
         self.current_photo_path = ""
+        self.thumbnails = ThumbnailCache()  # 디스크/메모리 썸네일 캐시 + 앞뒤 사진 미리 로드
         
         # 학생 정보 변수
         self.student_name = tk.StringVar()
@@ -42,6 +45,17 @@ class VerticalCardGUI:
         self.orientation.set("portrait")  # 세로 기본값
         
         self.setup_ui()
+        
+        # 렌더링은 백그라운드에서 실행 (생성 중에도 다음 학생 입력 가능)
+        self.executor = RenderExecutor(self.root, on_queue_change=self.update_queue_status)
+        
+        # 프린터 상태는 모니터 스레드가 확인하고 바뀔 때만 알려줌
+        self.printer_monitor = get_printer_monitor()
+        self.unsubscribe_printer = self.printer_monitor.subscribe(
+            lambda state: self.executor.post(self.update_printer_status, state))
+        if self.printer_monitor.state is not None:
+            self.update_printer_status(self.printer_monitor.state)
+        
         self.load_photos()
         
     def setup_ui(self):
@@ -158,6 +172,11 @@ class VerticalCardGUI:
         self.printer_status_label = ttk.Label(status_frame, text="프린터: 확인 중...", font=('Arial', 10))
         self.printer_status_label.grid(row=0, column=1, sticky=tk.E)
         
+        # 대기열 표시 + 취소
+        self.queue_label = ttk.Label(status_frame, text="", font=('Arial', 9), foreground='gray')
+        self.queue_label.grid(row=1, column=0, sticky=tk.W)
+        ttk.Button(status_frame, text="⏹ 대기 작업 취소", command=self.cancel_jobs).grid(row=1, column=1, sticky=tk.E)
+        
         # 그리드 가중치 설정
         main_frame.columnconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
@@ -168,9 +187,6 @@ class VerticalCardGUI:
         btn_frame.columnconfigure(0, weight=1)
         btn_frame.columnconfigure(1, weight=1)
         
-        # 초기 프린터 상태 확인
-        self.root.after(1000, self.update_printer_status)
-        
     def load_photos(self):
         """photos 폴더에서 사진들 로드"""
         photo_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp']
@@ -197,9 +213,9 @@ class VerticalCardGUI:
             # 현재 사진 경로
             self.current_photo_path = self.photo_files[self.current_photo_index]
             
-            # 이미지 로드 및 리사이즈 (더 큰 크기로)
-            image = Image.open(self.current_photo_path)
-            image = image.resize((250, 300), Image.Resampling.LANCZOS)
+            # 썸네일 로드 (캐시, 더 큰 크기로)
+            image = self.thumbnails.get(self.current_photo_path, (250, 300))
+            self.thumbnails.prefetch_neighbors(self.photo_files, self.current_photo_index, (250, 300))
             
             # tkinter용 이미지로 변환
             self.photo_image = ImageTk.PhotoImage(image)
@@ -287,8 +303,13 @@ class VerticalCardGUI:
             except Exception as e:
                 messagebox.showerror("오류", f"사진 삭제 실패:\n{str(e)}")
                 
-    def create_student_card(self):
-        """학생증 생성"""
+    def create_student_card(self, on_created=None):
+        """
+        학생증 생성 (렌더링/저장은 백그라운드에서 실행)
+        
+        Args:
+            on_created: on_created(출력 경로) - 생성 성공 후 메인 스레드에서 호출
+        """
         # 입력 검증
         if not self.student_name.get().strip():
             messagebox.showerror("오류", "이름을 입력해주세요")
@@ -317,50 +338,54 @@ class VerticalCardGUI:
         orientation_text = "세로" if self.orientation.get() == "portrait" else "가로"
         output_path = f"output/{student_data['student_id']}_{safe_name}_{orientation_text}_학생증.png"
         
-        try:
-            self.update_status("학생증 생성 중...")
-            
-            # 학생증 생성
-            success = self.printer.create_student_card(
-                template_path='card_template.png',
-                student_data=student_data,
-                output_path=output_path,
-                orientation=self.orientation.get()
-            )
-            
-            if success:
-                # 미리보기 표시
-                self.show_preview(output_path)
-                self.update_status("학생증 생성 완료!")
-                messagebox.showinfo("성공", f"{orientation_text} 학생증이 생성되었습니다!\n\n파일: {output_path}")
-            else:
-                self.update_status("학생증 생성 실패")
-                messagebox.showerror("오류", "학생증 생성에 실패했습니다")
-                
-        except Exception as e:
-            self.update_status("오류 발생")
-            messagebox.showerror("오류", f"학생증 생성 중 오류:\n{str(e)}")
+        # 입력값은 제출 시점에 고정되므로 렌더링 중에도 다음 학생을 입력할 수 있음
+        orientation = self.orientation.get()
+        self.update_status("학생증 생성 중...")
+        self.executor.submit(
+            self._render_card, student_data, output_path, orientation,
+            on_done=lambda preview: self._on_card_created(preview, output_path, orientation_text, on_created),
+            on_error=self._on_create_error,
+            description=f"{student_data['name']} 학생증 생성"
+        )
+    
+    def _render_card(self, student_data, output_path, orientation):
+        """작업 스레드: 학생증 생성 + 미리보기 렌더링 → 미리보기 이미지 (실패 시 None)"""
+        success = self.printer.create_student_card(
+            template_path='card_template.png',
+            student_data=student_data,
+            output_path=output_path,
+            orientation=orientation
+        )
+        if not success:
+            return None
+        
+        # 미리보기 해상도로 바로 렌더링 (세로 카드는 높이, 가로 카드는 폭이 300px)
+        return self.printer.render_preview('card_template.png', student_data,
+                                           orientation=orientation, max_size=300)
+    
+    def _on_card_created(self, preview, output_path, orientation_text, on_created=None):
+        """메인 스레드: 생성 결과 표시"""
+        if preview is None:
+            self.update_status("학생증 생성 실패")
+            messagebox.showerror("오류", "학생증 생성에 실패했습니다")
+            return
+        
+        # 미리보기 표시
+        self.show_preview(preview)
+        self.update_status("학생증 생성 완료!")
+        messagebox.showinfo("성공", f"{orientation_text} 학생증이 생성되었습니다!\n\n파일: {output_path}")
+        
+        if on_created:
+            on_created(output_path)
+    
+    def _on_create_error(self, e):
+        """메인 스레드: 생성 오류 표시"""
+        self.update_status("오류 발생")
+        messagebox.showerror("오류", f"학생증 생성 중 오류:\n{str(e)}")
             
-    def show_preview(self, image_path):
-        """생성된 학생증 미리보기 표시"""
+    def show_preview(self, image):
+        """학생증 미리보기 표시 (미리보기 해상도로 렌더링된 이미지)"""
         try:
-            # 이미지 로드 및 리사이즈
-            image = Image.open(image_path)
-            
-            # 미리보기 크기 계산 (세로/가로에 따라 다르게)
-            if self.orientation.get() == "portrait":
-                # 세로 카드: 높이 300px 기준으로 조정
-                preview_height = 300
-                aspect_ratio = image.width / image.height
-                preview_width = int(preview_height * aspect_ratio)
-            else:
-                # 가로 카드: 폭 300px 기준으로 조정
-                preview_width = 300
-                aspect_ratio = image.height / image.width
-                preview_height = int(preview_width * aspect_ratio)
-                
-            image = image.resize((preview_width, preview_height), Image.Resampling.LANCZOS)
-            
             # tkinter용 이미지로 변환
             self.preview_image = ImageTk.PhotoImage(image)
             self.preview_label.config(image=self.preview_image, text="")
@@ -370,87 +395,72 @@ class VerticalCardGUI:
             
     def print_directly(self):
         """바로 인쇄"""
-        # 먼저 학생증 생성
-        self.create_student_card()
-        
-        # 생성된 파일이 있다면 인쇄
-        safe_name = "".join(c for c in self.student_name.get() if c.isalnum() or c in (' ', '-', '_')).strip()
-        orientation_text = "세로" if self.orientation.get() == "portrait" else "가로"
-        output_path = f"output/{self.student_id.get()}_{safe_name}_{orientation_text}_학생증.png"
+        # 먼저 학생증 생성 (생성이 끝나면 인쇄)
+        self.create_student_card(on_created=self.print_file)
         
+    def print_file(self, output_path):
+        """생성된 파일 인쇄"""
         if os.path.exists(output_path):
             try:
-                self.update_status("인쇄 중...")
-                
-                # Windows API로 인쇄
-                abs_path = os.path.abspath(output_path)
-                result = win32api.ShellExecute(0, "print", abs_path, None, ".", 0)
-                
-                if result > 32:
-                    self.update_status("인쇄 명령 전송 완료")
-                    messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!\n프린터를 확인해주세요.")
-                else:
-                    self.update_status("인쇄 실패")
-                    messagebox.showerror("실패", f"인쇄 실패 (코드: {result})")
+                # 인쇄 대기열에 추가 (인쇄는 스풀러 스레드에서 진행)
+                get_spooler().submit(output_path, description=os.path.basename(output_path),
+                                     on_done=lambda job: self.executor.post(self._on_print_done, job))
+                self.update_status("인쇄 대기 중...")
                     
             except Exception as e:
                 self.update_status("인쇄 오류")
                 messagebox.showerror("오류", f"인쇄 중 오류:\n{str(e)}")
         
+    def _on_print_done(self, job):
+        """메인 스레드: 인쇄 결과 표시"""
+        if job.status == STATUS_DONE:
+            self.update_status("인쇄 명령 전송 완료")
+            messagebox.showinfo("성공", "인쇄 명령이 전송되었습니다!\n프린터를 확인해주세요.")
+        else:
+            self.update_status("인쇄 실패")
+            messagebox.showerror("실패", f"인쇄 실패:\n{job.error}")
+        
     def connect_printer(self):
-        """프린터 연결"""
-        try:
-            printers = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS)
-            pointman_printers = [p[2] for p in printers if "POINTMAN" in p[2].upper()]
-            
-            if not pointman_printers:
-                messagebox.showwarning("알림", "POINTMAN 프린터를 찾을 수 없습니다.\n프린터를 연결하고 드라이버를 설치해주세요.")
-                return
-                
-            printer_name = pointman_printers[0]
-            
-            # 프린터 상태 확인
-            hprinter = win32print.OpenPrinter(printer_name)
-            info = win32print.GetPrinter(hprinter, 2)
-            status = info['Status']
-            win32print.ClosePrinter(hprinter)
-            
-            if status == 0:
-                messagebox.showinfo("성공", f"프린터 연결 성공!\n프린터: {printer_name}\n상태: Ready")
-                self.update_printer_status()
-            else:
-                messagebox.showwarning("경고", f"프린터가 연결되었지만 상태가 Ready가 아닙니다.\n상태 코드: {status}")
-                
-        except Exception as e:
-            messagebox.showerror("오류", f"프린터 연결 확인 실패:\n{str(e)}")
-            
-    def update_printer_status(self):
-        """프린터 상태 업데이트"""
-        try:
-            printers = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS)
-            pointman_printers = [p[2] for p in printers if "POINTMAN" in p[2].upper()]
+        """프린터 연결 확인 (상태 모니터에 즉시 재검색 요청 - 결과는 메인 스레드에서 표시)"""
+        self.printer_status_label.config(text="프린터: 확인 중...", foreground='gray')
+        self.printer_monitor.refresh(on_done=lambda state: self.executor.post(self._on_connect_checked, state),
+                                     rescan=True)
+        
+    def _on_connect_checked(self, state):
+        """메인 스레드: 연결 확인 결과 표시"""
+        self.update_printer_status(state)
+        if state.error:
+            messagebox.showerror("오류", f"프린터 연결 확인 실패:\n{state.error}")
+        elif not state.found:
+            messagebox.showwarning("알림", "POINTMAN 프린터를 찾을 수 없습니다.\n프린터를 연결하고 드라이버를 설치해주세요.")
+        elif state.ready:
+            messagebox.showinfo("성공", f"프린터 연결 성공!\n프린터: {state.name}\n상태: Ready")
+        else:
+            messagebox.showwarning("경고", f"프린터가 연결되었지만 상태가 Ready가 아닙니다.\n상태: {state.describe()} ({state.status})")
             
-            if pointman_printers:
-                printer_name = pointman_printers[0]
-                hprinter = win32print.OpenPrinter(printer_name)
-                info = win32print.GetPrinter(hprinter, 2)
-                status = info['Status']
-                win32print.ClosePrinter(hprinter)
-                
-                if status == 0:
-                    self.printer_status_label.config(text="프린터: ✅ Ready", foreground='green')
-                else:
-                    self.printer_status_label.config(text=f"프린터: ⚠️ 상태 {status}", foreground='orange')
-            else:
-                self.printer_status_label.config(text="프린터: ❌ 없음", foreground='red')
-                
-        except:
+    def update_printer_status(self, state):
+        """프린터 상태 표시 업데이트 (상태 모니터가 변경을 알릴 때 메인 스레드에서 호출)"""
+        if state.error:
             self.printer_status_label.config(text="프린터: ❓ 확인 불가", foreground='gray')
+        elif not state.found:
+            self.printer_status_label.config(text="프린터: ❌ 없음", foreground='red')
+        elif state.ready:
+            self.printer_status_label.config(text="프린터: ✅ Ready", foreground='green')
+        else:
+            self.printer_status_label.config(text=f"프린터: ⚠️ {state.describe()}", foreground='orange')
             
     def update_status(self, message):
         """상태 메시지 업데이트"""
         self.status_label.config(text=message)
-        self.root.update()
+        
+    def update_queue_status(self, count):
+        """대기열 길이 표시"""
+        self.queue_label.config(text=queue_status_text(count))
+        
+    def cancel_jobs(self):
+        """아직 시작하지 않은 작업 취소"""
+        cancelled = self.executor.cancel_all()
+        self.update_status(f"⏹ 대기 작업 {cancelled}개 취소됨")
         
     def save_as(self):
         """다른 이름으로 저장"""
@@ -514,6 +524,9 @@ def main():
         
     root.protocol("WM_DELETE_WINDOW", on_closing)
     root.mainloop()
+    app.unsubscribe_printer()
+    app.thumbnails.shutdown()
+    app.executor.shutdown()
 
 if __name__ == "__main__":
     main()